@@ -0,0 +1,72 @@
+"""
+Measures decoding of large synthetic list_licenses pages and encoding of
+payloads, comparing the stdlib json path used by `requests` with
+`hyper.utils.codec` (orjson when installed).
+
+    python -m benchmarks.bench_codec --page-size 1000 --rounds 50
+"""
+
+import argparse
+import json
+import time
+from hyper.utils import codec
+
+
+def _page(size: int) -> bytes:
+
+    data = [
+        {
+            "id": f"lic_{i:016x}",
+            "key": f"KEY-{i:08d}",
+            "email": f"user{i}@example.com",
+            "status": "active",
+            "unlocked": False,
+            "plan": {"id": "plan_1", "name": "Lifetime", "amount": 2500, "currency": "usd"},
+            "metadata": {"hwid": f"00:00:00:{i % 256:02x}:00:01", "discord": str(10 ** 17 + i)},
+            "created": 1683577538000 + i,
+        }
+        for i in range(size)
+    ]
+
+    return json.dumps({"data": data, "page": 1, "limit": size, "total_count": size * 100}).encode()
+
+
+def _time(rounds: int, fn, arg) -> float:
+
+    started = time.perf_counter()
+
+    for _ in range(rounds):
+
+        fn(arg)
+
+    return (time.perf_counter() - started) / rounds
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    raw = _page(args.page_size)
+
+    obj = json.loads(raw)
+
+    backend = "orjson" if codec.orjson is not None else "json"
+
+    # requests' Response.json() decodes the body to text before parsing it.
+    stdlib_loads = _time(args.rounds, lambda body: json.loads(body.decode("utf-8")), raw)
+    codec_loads = _time(args.rounds, codec._loads, raw)
+
+    stdlib_dumps = _time(args.rounds, lambda value: json.dumps(value).encode(), obj)
+    codec_dumps = _time(args.rounds, codec._dumps, obj)
+
+    print(f"page of {args.page_size} licenses, {len(raw) / 1024:.0f} KiB, codec backend: {backend}")
+    print(f"decode  stdlib {stdlib_loads * 1e3:7.2f}ms  codec {codec_loads * 1e3:7.2f}ms  x{stdlib_loads / codec_loads:.1f}")
+    print(f"encode  stdlib {stdlib_dumps * 1e3:7.2f}ms  codec {codec_dumps * 1e3:7.2f}ms  x{stdlib_dumps / codec_dumps:.1f}")
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,141 @@
+"""
+Measures the import time of `from hyper.client import Client` in fresh
+interpreters and exits with status 1 when its median exceeds the budget, or
+when it loads a module that must only load on first use (the HTTP transport,
+asyncio, the params modules and the optional features).
+
+    python -m benchmarks.bench_import --runs 20 --budget 50
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+_STATEMENT = "from hyper.client import Client"
+
+_DEFERRED = (
+    "requests",
+    "urllib3",
+    "aiohttp",
+    "asyncio",
+    "concurrent.futures",
+    "sqlite3",
+    "email.utils",
+    "hyper.licenses",
+    "hyper.products",
+    "hyper.links",
+    "hyper.raffles",
+    "hyper.coupons",
+    "hyper.client.async_client",
+    "hyper.client.cache",
+    "hyper.client.verdicts",
+    "hyper.client.retry",
+    "hyper.client.breaker",
+)
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - started
+print(json.dumps([elapsed, [name for name in {deferred!r} if name in sys.modules]]))
+"""
+
+
+def _run(statement: str) -> tuple:
+
+    code = _PROBE.format(statement=statement, deferred=_DEFERRED)
+
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+
+    return tuple(json.loads(out))
+
+
+def _imports(statement: str) -> list:
+
+    # `-X importtime` reports every import on stderr as "self | cumulative | name",
+    # the name indented by its nesting depth.
+    err = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], capture_output=True, text=True, check=True).stderr
+
+    imports = []
+
+    for line in err.splitlines():
+
+        if line.startswith("import time:") and "cumulative" not in line:
+
+            _, cumulative, name = line.split("|")
+
+            imports.append((name, int(cumulative)))
+
+    return imports
+
+
+def _breakdown(statement: str, top: int) -> list:
+
+    startup = {name for name, _ in _imports("pass")}
+
+    modules = [
+        (cumulative, name.strip())
+        for name, cumulative in _imports(statement)
+        if not name.startswith("  ") and name not in startup
+    ]
+
+    return sorted(modules, reverse=True)[:top]
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--budget", type=float, default=50.0, help="median budget in milliseconds")
+    parser.add_argument("--statement", default=_STATEMENT)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    samples = []
+
+    loaded = set()
+
+    for _ in range(args.runs):
+
+        elapsed, modules = _run(args.statement)
+
+        samples.append(elapsed * 1e3)
+
+        loaded.update(modules)
+
+    median = statistics.median(samples)
+
+    print(
+        f"{args.statement!r}: median={median:.1f}ms min={min(samples):.1f}ms "
+        f"max={max(samples):.1f}ms runs={args.runs} budget={args.budget:.1f}ms"
+    )
+
+    print("heaviest imports:")
+
+    for cumulative, name in _breakdown(args.statement, args.top):
+
+        print(f"  {cumulative / 1e3:7.1f}ms  {name}")
+
+    failures = []
+
+    if median > args.budget:
+
+        failures.append(f"median import time {median:.1f}ms exceeds the {args.budget:.1f}ms budget")
+
+    if loaded:
+
+        failures.append("loaded on import instead of first use: " + ", ".join(sorted(loaded)))
+
+    for failure in failures:
+
+        print("FAIL " + failure)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,75 @@
+"""
+Compares the memory held by a large synthetic licenses export as raw dicts,
+as slotted `hyper.models.License` objects and as columns.
+
+    python -m benchmarks.bench_models --licenses 50000
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from hyper.models import License, columns
+
+
+def _pages(count: int, limit: int = 100):
+
+    for start in range(0, count, limit):
+
+        page = [
+            {
+                "id": f"lic_{i:016x}",
+                "key": f"KEY-{i:08d}",
+                "email": f"user{i}@example.com",
+                "status": "active",
+                "unlocked": False,
+                "plan": {"id": "plan_1", "name": "Lifetime"},
+                "user": None,
+                "customer": None,
+                "metadata": {"hwid": f"00:00:00:{i % 256:02x}:00:01"} if i % 2 else {},
+                "subscription": None,
+                "created": 1683577538000 + i,
+            }
+            for i in range(start, min(start + limit, count))
+        ]
+
+        # Decode from bytes so every page owns its objects, as with real responses.
+        yield json.loads(json.dumps({"data": page}))["data"]
+
+
+def _measure(name: str, build) -> None:
+
+    gc.collect()
+
+    tracemalloc.start()
+
+    started = time.perf_counter()
+
+    result = build()
+
+    elapsed = time.perf_counter() - started
+
+    current, _ = tracemalloc.get_traced_memory()
+
+    tracemalloc.stop()
+
+    print(f"{name:<8} {current / 2 ** 20:8.1f} MiB  built in {elapsed:.2f}s")
+
+    del result
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--licenses", type=int, default=50_000)
+    args = parser.parse_args()
+
+    _measure("dicts", lambda: [item for page in _pages(args.licenses) for item in page])
+    _measure("models", lambda: [License(item) for page in _pages(args.licenses) for item in page])
+    _measure("columns", lambda: columns(License(item) for page in _pages(args.licenses) for item in page))
+
+
+if __name__ == "__main__":
+
+    main()
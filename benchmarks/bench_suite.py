@@ -0,0 +1,374 @@
+"""
+Client-side performance suite run against the local stub server: throughput,
+p50/p99 latency and allocation peak of single calls, paginated walks, bulk
+operations and `authorize`, sync and async.
+
+    python -m benchmarks.bench_suite --json results.json
+    python -m benchmarks.bench_suite --compare baseline.json --tolerance 0.25
+
+With `--compare`, the run exits with status 1 when a scenario's throughput
+drops, or its p99 or memory peak grows, by more than the tolerance.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable
+from hyper.__version__ import __version__
+from hyper.client import Client, RetryPolicy, VerdictCache
+from hyper.testing.stub import StubServer
+from hyper.utils import codec
+
+
+def _percentile(samples: list, pct: float) -> float:
+
+    ordered = sorted(samples)
+
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def _result(name: str, samples: list, ops: int, elapsed: float, peak: int) -> dict:
+
+    return {
+        "name": name,
+        "samples": len(samples),
+        "ops": ops,
+        "ops_per_sec": ops / elapsed if elapsed else 0.0,
+        "p50_ms": _percentile(samples, 0.50) * 1e3,
+        "p99_ms": _percentile(samples, 0.99) * 1e3,
+        "mean_ms": statistics.fmean(samples) * 1e3,
+        "peak_kib": peak / 1024,
+    }
+
+
+def _peak(fn: Callable, rounds: int) -> int:
+
+    # Traced separately: tracemalloc slows allocation-heavy code several fold.
+    tracemalloc.start()
+
+    try:
+
+        for i in range(rounds):
+
+            fn(i)
+
+        return tracemalloc.get_traced_memory()[1]
+
+    finally:
+
+        tracemalloc.stop()
+
+
+def _measure(name: str, fn: Callable, rounds: int, ops_per_round: int = 1, warmup: int = 5) -> dict:
+
+    for i in range(warmup):
+
+        fn(i)
+
+    samples = []
+
+    started = time.perf_counter()
+
+    for i in range(rounds):
+
+        call_started = time.perf_counter()
+
+        fn(i)
+
+        samples.append(time.perf_counter() - call_started)
+
+    elapsed = time.perf_counter() - started
+
+    return _result(name, samples, rounds * ops_per_round, elapsed, _peak(fn, max(1, rounds // 10)))
+
+
+def _ameasure(name: str, fn: Callable, rounds: int, concurrency: int, close: Callable, warmup: int = 5) -> dict:
+
+    async def run() -> tuple:
+
+        try:
+
+            return await measure()
+
+        finally:
+
+            await close()
+
+    async def measure() -> tuple:
+
+        for i in range(warmup):
+
+            await fn(i)
+
+        samples = []
+
+        queue = iter(range(rounds))
+
+        async def worker() -> None:
+
+            for i in queue:
+
+                call_started = time.perf_counter()
+
+                await fn(i)
+
+                samples.append(time.perf_counter() - call_started)
+
+        started = time.perf_counter()
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+        elapsed = time.perf_counter() - started
+
+        tracemalloc.start()
+
+        try:
+
+            for i in range(max(1, rounds // 10)):
+
+                await fn(i)
+
+            peak = tracemalloc.get_traced_memory()[1]
+
+        finally:
+
+            tracemalloc.stop()
+
+        return samples, elapsed, peak
+
+    samples, elapsed, peak = asyncio.run(run())
+
+    return _result(name, samples, rounds, elapsed, peak)
+
+
+def _client_options(args: argparse.Namespace, stub: StubServer) -> dict:
+
+    options = {"base_url": stub.url}
+
+    if args.error_rate:
+
+        options["retry"] = RetryPolicy(max_attempts=5, backoff=0.001, max_backoff=0.01)
+
+    return options
+
+
+def bench_single(args: argparse.Namespace, stub: StubServer) -> list:
+
+    with Client("bench", **_client_options(args, stub)) as client:
+
+        return [
+            _measure(
+                "retrieve_license",
+                lambda i: client.retrieve_license(license_key=f"KEY-{i % args.licenses:08d}"),
+                args.calls,
+            ),
+            _measure(
+                "update_license_metadata",
+                lambda i: client.update_license_metadata(license_key=f"KEY-{i % args.licenses:08d}", metadata={"n": i}),
+                args.calls,
+            ),
+        ]
+
+
+def bench_paginated(args: argparse.Namespace, stub: StubServer) -> list:
+
+    rounds = max(1, args.calls // 50)
+
+    results = []
+
+    with Client("bench", **_client_options(args, stub)) as client:
+
+        for prefetch in (0, 4):
+
+            results.append(
+                _measure(
+                    f"iter_licenses[prefetch={prefetch}]",
+                    lambda i: sum(1 for _ in client.iter_licenses(limit=args.page_size, prefetch=prefetch)),
+                    rounds,
+                    ops_per_round=args.licenses,
+                    warmup=1,
+                )
+            )
+
+    return results
+
+
+def bench_bulk(args: argparse.Namespace, stub: StubServer) -> list:
+
+    rounds = max(1, args.calls // 100)
+
+    keys = [f"KEY-{i:08d}" for i in range(min(args.licenses, 100))]
+
+    def run(i: int) -> None:
+
+        for result in client.bulk_update_licenses_metadata(((key, {"round": i}) for key in keys), concurrency=args.concurrency):
+
+            if not result.ok:
+
+                raise result.error
+
+    with Client("bench", pool_maxsize=max(16, args.concurrency), **_client_options(args, stub)) as client:
+
+        return [_measure(f"bulk_update_metadata[{len(keys)}]", run, rounds, ops_per_round=len(keys), warmup=1)]
+
+
+def bench_authorize(args: argparse.Namespace, stub: StubServer) -> list:
+
+    results = []
+
+    with Client("bench", **_client_options(args, stub)) as client:
+
+        results.append(
+            _measure("authorize", lambda i: client.authorize(f"KEY-{i % args.licenses:08d}"), args.calls)
+        )
+
+    with tempfile.TemporaryDirectory() as directory:
+
+        verdicts = VerdictCache(os.path.join(directory, "verdicts.json"))
+
+        with Client("bench", verdict_cache=verdicts, **_client_options(args, stub)) as client:
+
+            results.append(
+                _measure("authorize[verdict_cache]", lambda i: client.authorize(f"KEY-{i % args.licenses:08d}"), args.calls)
+            )
+
+    return results
+
+
+def bench_async(args: argparse.Namespace, stub: StubServer) -> list:
+
+    try:
+
+        from hyper.client import AsyncClient
+
+        client = AsyncClient("bench", pool_maxsize=max(16, args.concurrency), **_client_options(args, stub))
+
+    except ImportError:
+
+        return []
+
+    async def retrieve(i: int) -> None:
+
+        await client.retrieve_license(license_key=f"KEY-{i % args.licenses:08d}")
+
+    name = f"async_retrieve_license[concurrency={args.concurrency}]"
+
+    return [_ameasure(name, retrieve, args.calls, args.concurrency, client.close)]
+
+
+_SCENARIOS = {
+    "single": bench_single,
+    "paginated": bench_paginated,
+    "bulk": bench_bulk,
+    "authorize": bench_authorize,
+    "async": bench_async,
+}
+
+
+def _compare(results: list, baseline: dict, tolerance: float) -> list:
+
+    previous = {result["name"]: result for result in baseline["results"]}
+
+    regressions = []
+
+    for result in results:
+
+        before = previous.get(result["name"])
+
+        if before is None:
+
+            continue
+
+        checks = (
+            ("ops_per_sec", before["ops_per_sec"] * (1 - tolerance), result["ops_per_sec"] < before["ops_per_sec"] * (1 - tolerance)),
+            ("p99_ms", before["p99_ms"] * (1 + tolerance), result["p99_ms"] > before["p99_ms"] * (1 + tolerance)),
+            ("peak_kib", before["peak_kib"] * (1 + tolerance), result["peak_kib"] > before["peak_kib"] * (1 + tolerance)),
+        )
+
+        for metric, limit, failed in checks:
+
+            if failed:
+
+                regressions.append(f"{result['name']}: {metric} {result[metric]:.2f} (limit {limit:.2f})")
+
+    return regressions
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=1000, help="calls per single-call scenario")
+    parser.add_argument("--licenses", type=int, default=500, help="licenses seeded in the stub")
+    parser.add_argument("--page-size", type=int, default=100, help="page size of paginated walks")
+    parser.add_argument("--concurrency", type=int, default=8, help="workers of bulk and async scenarios")
+    parser.add_argument("--latency", type=float, default=0.0, help="stub latency per request in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of stub requests failing with a 503")
+    parser.add_argument("--only", nargs="*", choices=sorted(_SCENARIOS), help="scenarios to run, defaults to all")
+    parser.add_argument("--json", metavar="FILE", help="write results as JSON, '-' for stdout")
+    parser.add_argument("--compare", metavar="FILE", help="baseline JSON of a previous run")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed regression against the baseline")
+    args = parser.parse_args()
+
+    results = []
+
+    with StubServer(licenses=args.licenses, latency=args.latency, error_rate=args.error_rate, max_page_size=max(100, args.page_size), seed=0) as stub:
+
+        for name in args.only or _SCENARIOS:
+
+            results.extend(_SCENARIOS[name](args, stub))
+
+    report = {
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "codec": "orjson" if codec.orjson is not None else "json",
+        "config": {key: value for key, value in vars(args).items() if key not in ("json", "compare")},
+        "results": results,
+    }
+
+    if args.json == "-":
+
+        json.dump(report, sys.stdout, indent=2)
+
+        print()
+
+    else:
+
+        for result in results:
+
+            print(
+                f"{result['name']:<42} {result['ops_per_sec']:>10.1f} ops/s "
+                f"p50={result['p50_ms']:.3f}ms p99={result['p99_ms']:.3f}ms peak={result['peak_kib']:.1f}KiB"
+            )
+
+        if args.json:
+
+            with open(args.json, "w", encoding="utf-8") as f:
+
+                json.dump(report, f, indent=2)
+
+    if args.compare:
+
+        with open(args.compare, "r", encoding="utf-8") as f:
+
+            regressions = _compare(results, json.load(f), args.tolerance)
+
+        for regression in regressions:
+
+            print("REGRESSION", regression, file=sys.stderr)
+
+        if regressions:
+
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+
+    main()
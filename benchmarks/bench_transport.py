@@ -0,0 +1,88 @@
+"""
+Compares the pooled keep-alive transport of `Core` against a fresh connection
+per call (the previous module-level `requests.request` behaviour), using the
+local stub server.
+
+    python -m benchmarks.bench_transport --calls 2000
+"""
+
+import argparse
+import statistics
+import time
+import requests
+from hyper.client import Client
+from hyper.testing.stub import StubServer
+
+
+def _percentile(samples: list, pct: float) -> float:
+
+    ordered = sorted(samples)
+
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def _report(name: str, samples: list, connections: int) -> None:
+
+    print(
+        f"{name:<10} calls={len(samples):<6} connections={connections:<6} "
+        f"p50={_percentile(samples, 0.50) * 1e3:.3f}ms "
+        f"p99={_percentile(samples, 0.99) * 1e3:.3f}ms "
+        f"mean={statistics.fmean(samples) * 1e3:.3f}ms"
+    )
+
+
+def bench_unpooled(stub: StubServer, calls: int) -> None:
+
+    headers = {"Authorization": "Bearer bench", "accept": "application/json"}
+
+    start_connections = stub.connections
+
+    samples = []
+
+    for i in range(calls):
+
+        started = time.perf_counter()
+
+        res = requests.request(method="get", url=f"{stub.url}/licenses/KEY-{i % 100:08d}", headers=headers)
+        res.json()
+
+        samples.append(time.perf_counter() - started)
+
+    _report("unpooled", samples, stub.connections - start_connections)
+
+
+def bench_pooled(stub: StubServer, calls: int) -> None:
+
+    start_connections = stub.connections
+
+    samples = []
+
+    with Client("bench", base_url=stub.url) as client:
+
+        for i in range(calls):
+
+            started = time.perf_counter()
+
+            client.retrieve_license(license_key=f"KEY-{i % 100:08d}")
+
+            samples.append(time.perf_counter() - started)
+
+    _report("pooled", samples, stub.connections - start_connections)
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with StubServer(latency=args.latency) as stub:
+
+        bench_unpooled(stub, args.calls)
+        bench_pooled(stub, args.calls)
+
+
+if __name__ == "__main__":
+
+    main()
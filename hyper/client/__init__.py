@@ -1,3 +1,81 @@
 """Hyper.co client initializer"""
 
-from .client import Client
\ No newline at end of file
+import importlib
+from typing import TYPE_CHECKING
+
+# Every name is imported from its module on first access, so that e.g.
+# `from hyper.client import Client` loads neither the async client nor the
+# optional features. See benchmarks/bench_import.py for the import time budget.
+_EXPORTS = {
+    "Client": ".client",
+    "AsyncClient": ".async_client",
+    "AsyncClientPool": ".pool",
+    "ClientPool": ".pool",
+    "LicenseValidator": ".validator",
+    "ValidatorStats": ".validator",
+    "DiskCache": ".cache",
+    "MemoryCache": ".cache",
+    "ResponseCache": ".cache",
+    "VerdictCache": ".verdicts",
+    "Batch": ".batch",
+    "AsyncBatch": ".batch",
+    "BatchCall": ".batch",
+    "BulkResult": ".bulk",
+    "BulkStats": ".bulk",
+    "RateLimiter": ".ratelimit",
+    "RetryPolicy": ".retry",
+    "RetryStats": ".retry",
+    "Timeout": ".timeouts",
+    "timeout": ".timeouts",
+    "CircuitBreaker": ".breaker",
+    "CircuitState": ".breaker",
+    "Poll": ".conditional",
+    "ChangeEvent": ".watch",
+    "Hooks": ".instrumentation",
+    "Instrument": ".instrumentation",
+    "Metrics": ".instrumentation",
+    "OpenTelemetrySpans": ".instrumentation",
+    "RequestInfo": ".instrumentation",
+    "ResponseInfo": ".instrumentation",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+
+    module = _EXPORTS.get(name)
+
+    if module is None:
+
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module, __name__), name)
+
+    globals()[name] = value
+
+    return value
+
+
+def __dir__() -> list:
+
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+
+    from .client import Client
+    from .async_client import AsyncClient
+    from .pool import AsyncClientPool, ClientPool
+    from .validator import LicenseValidator, ValidatorStats
+    from .cache import DiskCache, MemoryCache, ResponseCache
+    from .verdicts import VerdictCache
+    from .batch import AsyncBatch, Batch, BatchCall
+    from .bulk import BulkResult, BulkStats
+    from .ratelimit import RateLimiter
+    from .retry import RetryPolicy, RetryStats
+    from .timeouts import Timeout, timeout
+    from .breaker import CircuitBreaker, CircuitState
+    from .conditional import Poll
+    from .watch import ChangeEvent
+    from .instrumentation import Hooks, Instrument, Metrics, OpenTelemetrySpans, RequestInfo, ResponseInfo
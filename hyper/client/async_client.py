@@ -0,0 +1,119 @@
+import asyncio
+from ..exceptions import HyperAPIException
+from ..utils.helpers import _hardware_id
+from ..utils.pagination import _aiter_items
+from .async_core import AsyncCore
+from .batch import AsyncBatch
+from .bulk import AsyncBulkRun
+from .client import Client
+from .watch import _awatch
+
+
+class AsyncClient(AsyncCore, Client):
+
+    _iter_items = staticmethod(_aiter_items)
+
+    _bulk = AsyncBulkRun
+
+    _watch = staticmethod(_awatch)
+
+    _batch = AsyncBatch
+
+    def __init__(self, api_key: str, **options) -> None:
+        """
+        Asyncio Hyper.co dashboard client, backed by a pooled aiohttp session.
+        * https://docs.hyper.co/reference/getting-started
+
+        Exposes the same methods as `Client`, each returning an awaitable that
+        resolves to the same value, while the `iter_*`, `bulk_*` and `watch`
+        methods return async iterables. Requires the `async` extra (aiohttp).
+
+        Args:
+            api_key: the business API key.
+            options: options forwarded to `Client` and `Core`.
+        """
+
+        super().__init__(api_key, **options)
+
+        self._background = set()
+
+    # ---- AUTH CLIENT ----------------------------------------------------------------------------------- #
+
+    def _revalidate(self, license_key: str) -> None:
+
+        if license_key in self._revalidating:
+
+            return
+
+        self._revalidating.add(license_key)
+
+        task = asyncio.get_running_loop().create_task(self._revalidate_worker(license_key))
+
+        self._background.add(task)
+
+        task.add_done_callback(self._background.discard)
+
+    async def _revalidate_worker(self, license_key: str) -> None:
+
+        try:
+
+            await self._authorize_online(license_key)
+
+        except HyperAPIException as e:
+
+            # Only a missing license is a verdict on it. Outages, throttling and an
+            # open circuit keep the verdict until its grace period runs out.
+            if e.status_code == 404:
+
+                self._verdicts.discard(license_key)
+
+        except Exception:
+
+            # Network failures keep the verdict until its grace period runs out.
+            pass
+
+        finally:
+
+            self._revalidating.discard(license_key)
+
+    async def _authorize_online(self, license_key: str) -> bool:
+
+        license = await self.retrieve_license(license_key=license_key)
+
+        hardware_id = _hardware_id()
+
+        if not license["metadata"]:
+
+            await self._update_license_request(license_key=license_key, payload={"metadata": {"hwid": hardware_id}})
+
+            authorized = True
+
+        else:
+
+            authorized = license["metadata"].get("hwid") == hardware_id
+
+        self._record_verdict(license_key, authorized)
+
+        return authorized
+
+    async def authorize(self, license_key: str) -> bool:
+        """
+        Authorizes a license using basic hardware id auth.
+        * https://docs.hyper.co/recipes/python-cli-auth
+
+        When the client has a verdict cache, a license authorized on this machine
+        within the grace period is accepted without waiting on the API, and is
+        revalidated in a background task.
+
+        Args:
+            license_key: the license key to auth.
+
+        Returns:
+            A boolean to indicate weather or not the license was authorized successfuly.
+        """
+
+        if self._cached_verdict(license_key):
+
+            return True
+
+        return await self._authorize_online(license_key)
@@ -0,0 +1,319 @@
+import asyncio
+import time
+from typing import Callable
+from ..exceptions import CircuitOpenException, HyperAPIException
+from ..utils.codec import _encode
+from .conditional import Poll, _ValidatorStore
+from .core import Core
+from .timeouts import Timeout, _deadline, _resolve
+
+
+class AsyncCore(Core):
+
+    _timeout_error = asyncio.TimeoutError
+
+    def _build_session(self, pool_connections: int, pool_maxsize: int, pool_block: bool) -> None:
+
+        # aiohttp sessions must be created inside a running loop, so only the
+        # connector limits are kept here and the session is opened on first use.
+        self._connector_limits = {
+            "limit": pool_connections * pool_maxsize,
+            "limit_per_host": pool_maxsize,
+        }
+
+        return None
+
+    def _aiohttp(self):
+
+        try:
+
+            import aiohttp
+
+        except ImportError as e:
+
+            raise ImportError("AsyncClient requires aiohttp: pip install hyperco-client[async]") from e
+
+        self._transport_errors = (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError)
+
+        return aiohttp
+
+    def _adopt_session(self, session):
+
+        self._aiohttp()
+
+        return session
+
+    def _get_session(self):
+
+        if self._owns_session and (self._session is None or self._session.closed):
+
+            aiohttp = self._aiohttp()
+
+            self._session = aiohttp.ClientSession(
+                headers=self._headers,
+                connector=aiohttp.TCPConnector(**self._connector_limits)
+            )
+
+        return self._session
+
+    async def close(self) -> None:
+        """
+        Closes the underlying session and every pooled connection, unless the
+        session is shared.
+        """
+
+        if self._owns_session and self._session is not None:
+
+            await self._session.close()
+
+            self._session = None
+
+    async def __aenter__(self):
+
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+
+        await self.close()
+
+    def _request_timeout(self, timeout: Timeout, deadline: float):
+
+        import aiohttp
+
+        connect, read = super()._request_timeout(timeout, deadline)
+
+        remaining = None if deadline is None else deadline - time.monotonic()
+
+        return aiohttp.ClientTimeout(total=remaining, sock_connect=connect, sock_read=read)
+
+    async def _send(self, method: str, path: str, params: dict, json: dict, headers: dict, timeout: Timeout, deadline: float) -> tuple:
+
+        if self._breaker is None:
+
+            return await self._attempt(method, path, params, json, headers, timeout, deadline)
+
+        circuit, trial = self._breaker._enter(path)
+
+        try:
+
+            res = await self._attempt(method, path, params, json, headers, timeout, deadline)
+
+        except Exception as e:
+
+            self._breaker._exit(circuit, trial, e, self._transport_errors)
+
+            raise
+
+        self._breaker._exit(circuit, trial, None, self._transport_errors)
+
+        return res
+
+    async def _attempt(self, method: str, path: str, params: dict, json: dict, headers: dict, timeout: Timeout, deadline: float) -> tuple:
+
+        url = self._base_url + path
+
+        data = _encode(json)
+
+        info = self._before_request(method, path, params) if self._instruments else None
+
+        if self._limiter is not None:
+
+            await self._limiter.aacquire()
+
+        session = self._get_session()
+
+        request_timeout = self._request_timeout(timeout, deadline)
+
+        if self._auth is not None:
+
+            headers = {**self._auth, **headers} if headers else self._auth
+
+        started = time.perf_counter()
+
+        try:
+
+            async with session.request(method=method, url=url, params=params, data=data, headers=headers, timeout=request_timeout) as res:
+
+                headers_time = time.perf_counter() - started
+
+                body = await res.read()
+
+        except Exception as e:
+
+            if info is not None:
+
+                self._on_transport_error(info, e, started)
+
+            raise
+
+        finally:
+
+            self._cache_invalidate(method, path)
+
+        if self._limiter is not None:
+
+            self._limiter.update(res.status, res.headers)
+
+        if info is None:
+
+            self._raise_for_error(res.status, body, res.headers)
+
+            return res, body
+
+        received = time.perf_counter()
+
+        error = None
+
+        try:
+
+            self._raise_for_error(res.status, body, res.headers)
+
+        except HyperAPIException as e:
+
+            error = e
+
+            raise
+
+        finally:
+
+            self._after_response(info, res.status, len(body), len(data or b""), started, headers_time, received, error)
+
+        return res, body
+
+    async def _call(self, method: str, path: str, params: dict = None, json: dict = None, headers: dict = None) -> tuple:
+
+        timeout = _resolve(self._timeout)
+
+        deadline = _deadline(timeout)
+
+        if self._retry is None:
+
+            return await self._send(method, path, params, json, headers, timeout, deadline)
+
+        self._retry._started()
+
+        started = time.monotonic()
+
+        attempt = 1
+
+        while True:
+
+            try:
+
+                return await self._send(method, path, params, json, headers, timeout, deadline)
+
+            except Exception as e:
+
+                delay = self._retry._next_delay(method, headers, e, attempt, started, self._transport_errors)
+
+                if delay is None or (deadline is not None and time.monotonic() + delay >= deadline):
+
+                    raise
+
+                if self._instruments:
+
+                    self._on_retry(method, path, params, attempt, delay, e)
+
+            await asyncio.sleep(delay)
+
+            attempt += 1
+
+    async def _call_json(
+        self,
+        method: str,
+        path: str,
+        params: dict = None,
+        json: dict = None,
+        headers: dict = None,
+        cached: bool = False
+    ) -> dict:
+
+        cached = cached and self._cache is not None
+
+        coalesced = self._inflight is not None and method == "get"
+
+        if not cached and not coalesced:
+
+            return await self._fetch_json(method, path, params, json, headers)
+
+        key = self._cache_key(path, params)
+
+        if cached:
+
+            data = self._cache.get(key)
+
+            if data is not None:
+
+                return data
+
+        if coalesced:
+
+            return await self._inflight.ado(key, self._load_json, method, path, params, json, headers, cached)
+
+        return await self._load_json(method, path, params, json, headers, cached)
+
+    async def _load_json(self, method: str, path: str, params: dict, json: dict, headers: dict, cached: bool) -> dict:
+
+        try:
+
+            data = await self._fetch_json(method, path, params, json, headers)
+
+        except CircuitOpenException:
+
+            data = self._stale(path, params, cached)
+
+            if data is None:
+
+                raise
+
+            return data
+
+        if cached:
+
+            self._cache_store(self._cache_key(path, params), path, data)
+
+        return data
+
+    async def _fetch_json(self, method: str, path: str, params: dict, json: dict, headers: dict) -> dict:
+
+        if self._conditional and method == "get":
+
+            return (await self._poll_json(path, params, headers)).data
+
+        _, body = await self._call(method=method, path=path, params=params, json=json, headers=headers)
+
+        return self._decode(method, path, body)
+
+    async def _poll_json(
+        self,
+        path: str,
+        params: dict = None,
+        headers: dict = None,
+        validators: _ValidatorStore = None,
+        transform: Callable = None
+    ) -> Poll:
+
+        # `validators` and `transform` let a poller keep its own validators and store
+        # a reduced form of each decoded body, e.g. `watch` keeping fingerprints.
+        validators = self._validators if validators is None else validators
+
+        key = self._cache_key(path, params)
+
+        entry = validators.get(key)
+
+        res, body = await self._call(method="get", path=path, params=params, headers=validators.headers(entry, headers))
+
+        def decode(body: bytes):
+
+            data = self._decode("get", path, body)
+
+            return data if transform is None else transform(data)
+
+        return validators.resolve(key, entry, res.status, res.headers, body, decode)
+
+    async def _call_text(self, method: str, path: str, params: dict = None, json: dict = None, headers: dict = None) -> str:
+
+        _, body = await self._call(method=method, path=path, params=params, json=json, headers=headers)
+
+        return body.decode()
+
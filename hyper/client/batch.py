@@ -0,0 +1,210 @@
+from typing import Any
+from .bulk import AsyncBulkRun, BulkRun
+
+# Client methods a batch records: single calls returning their data, as opposed
+# to iterators, bulk runs and watches which already run on their own.
+_BATCHABLE = ("create_", "retrieve_", "update_", "delete_", "list_", "refund_", "poll", "authorize")
+
+_PENDING = object()
+
+
+class BatchCall:
+
+    """
+    A call recorded by `Client.batch`, resolved once the batch has run.
+    """
+
+    __slots__ = ("method", "args", "kwargs", "_value", "_error")
+
+    def __init__(self, method: str, args: tuple, kwargs: dict) -> None:
+
+        self.method = method
+
+        self.args = args
+
+        self.kwargs = kwargs
+
+        self._value = _PENDING
+
+        self._error = None
+
+    @property
+    def done(self) -> bool:
+
+        return self._value is not _PENDING or self._error is not None
+
+    @property
+    def ok(self) -> bool:
+
+        return self._value is not _PENDING
+
+    @property
+    def error(self) -> Exception:
+
+        return self._error
+
+    def result(self) -> Any:
+        """
+        The value the client method returned.
+
+        Raises:
+            The exception the client method raised, or RuntimeError when the
+            batch has not run.
+        """
+
+        if self._error is not None:
+
+            raise self._error
+
+        if self._value is _PENDING:
+
+            raise RuntimeError(f"Batched {self.method}() has not run, results are available once the batch exits")
+
+        return self._value
+
+    def __repr__(self) -> str:
+
+        state = "pending" if not self.done else "ok" if self.ok else f"error={self._error!r}"
+
+        return f"<BatchCall {self.method}() {state}>"
+
+
+class Batch:
+
+    _bulk = BulkRun
+
+    def __init__(self, client, concurrency: int = 8) -> None:
+        """
+        Records client calls and runs them concurrently when the block exits,
+        so that independent calls cost the latency of the slowest one rather
+        than the sum, e.g.
+
+            with client.batch() as batch:
+                products = batch.list_products()
+                license = batch.retrieve_license("KEY")
+
+            products.result()
+
+        A failing call does not affect the others: its exception is kept on its
+        `BatchCall` and raised by its `result()`. Calls are not run if the block
+        raises.
+
+        Args:
+            client: the client the calls are made with.
+            concurrency: maximum number of requests in flight. Defaults to 8.
+        """
+
+        self._client = client
+
+        self.concurrency = concurrency
+
+        self.calls = []
+
+        self.stats = None
+
+    def __getattr__(self, name: str):
+
+        if not name.startswith(_BATCHABLE) or not callable(getattr(self._client, name, None)):
+
+            raise AttributeError(f"{type(self).__name__} cannot record {name!r}")
+
+        def record(*args, **kwargs) -> BatchCall:
+
+            call = BatchCall(name, args, kwargs)
+
+            self.calls.append(call)
+
+            return call
+
+        return record
+
+    @property
+    def errors(self) -> list:
+        """
+        The calls that failed.
+        """
+
+        return [call for call in self.calls if call.error is not None]
+
+    def _pending(self) -> list:
+
+        return [call for call in self.calls if not call.done]
+
+    def _invoke(self, call: BatchCall):
+
+        return getattr(self._client, call.method)(*call.args, **call.kwargs)
+
+    @staticmethod
+    def _resolve(result) -> None:
+
+        call = result.item
+
+        if result.error is not None:
+
+            call._error = result.error
+
+        else:
+
+            call._value = result.result
+
+    def run(self) -> list:
+        """
+        Runs the calls recorded since the last run.
+
+        Returns:
+            Every recorded call.
+        """
+
+        run = self._bulk(self._invoke, self._pending(), self.concurrency)
+
+        for result in run:
+
+            self._resolve(result)
+
+        self.stats = run.stats
+
+        return self.calls
+
+    def __enter__(self) -> "Batch":
+
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+
+        if exc_type is None:
+
+            self.run()
+
+
+class AsyncBatch(Batch):
+
+    """
+    `Batch` of an `AsyncClient`, used with `async with` and resolved when the
+    block exits.
+    """
+
+    _bulk = AsyncBulkRun
+
+    __enter__ = None
+
+    async def run(self) -> list:
+
+        run = self._bulk(self._invoke, self._pending(), self.concurrency)
+
+        async for result in run:
+
+            self._resolve(result)
+
+        self.stats = run.stats
+
+        return self.calls
+
+    async def __aenter__(self) -> "AsyncBatch":
+
+        return self
+
+    async def __aexit__(self, exc_type, *exc_info) -> None:
+
+        if exc_type is None:
+
+            await self.run()
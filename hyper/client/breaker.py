@@ -0,0 +1,250 @@
+import threading
+import time
+from enum import StrEnum
+from typing import Callable
+from ..exceptions import CircuitOpenException, HyperAPIException
+
+
+class CircuitState(StrEnum):
+
+    Closed = "closed"
+    Open = "open"
+    HalfOpen = "half_open"
+
+
+class _Circuit:
+
+    __slots__ = ("group", "state", "failures", "opened_at", "trials")
+
+    def __init__(self, group: str) -> None:
+
+        self.group = group
+
+        self.state = CircuitState.Closed
+
+        self.failures = 0
+
+        self.opened_at = 0.0
+
+        self.trials = 0
+
+
+class CircuitBreaker:
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_calls: int = 1,
+        statuses: tuple = (500, 502, 503, 504),
+        fallback: bool = True
+    ) -> None:
+        """
+        Circuit breaker of the Hyper API, with one circuit per endpoint group:
+        `licenses`, `products`, `links`, `raffles`, `waitlist`, `payments` and
+        `coupons`.
+
+        A circuit opens after `failure_threshold` consecutive failed attempts,
+        i.e. connection errors, timeouts and the given statuses. While open, calls
+        to the group fail at once with `CircuitOpenException`. After
+        `reset_timeout` seconds the circuit turns half-open and lets
+        `half_open_calls` trial calls through: a success closes it again, a
+        failure opens it for another `reset_timeout`.
+
+        A breaker can be shared by several clients, which then trip together.
+
+        Args:
+            failure_threshold: consecutive failures opening a circuit. Defaults to 5.
+            reset_timeout: seconds a circuit stays open before a trial call. Defaults to 30.
+            half_open_calls: concurrent trial calls of a half-open circuit. Defaults to 1.
+            statuses: response statuses counted as failures. Defaults to 5xx gateway errors.
+            fallback: whether or not cached retrieve calls of an open circuit return
+                their last cached response, even expired, instead of failing.
+                Defaults to True.
+        """
+
+        self.failure_threshold = failure_threshold
+
+        self.reset_timeout = reset_timeout
+
+        self.half_open_calls = half_open_calls
+
+        self.statuses = frozenset(statuses)
+
+        self.fallback = fallback
+
+        self._circuits = {}
+
+        self._listeners = []
+
+        self._lock = threading.Lock()
+
+    def on_change(self, callback: Callable[[str, CircuitState, CircuitState], None]) -> Callable:
+        """
+        Registers a callback receiving `(group, old_state, new_state)` on every
+        state transition. Callbacks run on the calling thread and must not block.
+
+        Args:
+            callback: the transition callback.
+
+        Returns:
+            The callback, so this method can be used as a decorator.
+        """
+
+        self._listeners.append(callback)
+
+        return callback
+
+    def state(self, group: str) -> CircuitState:
+        """
+        The current state of a group's circuit.
+
+        Args:
+            group: the endpoint group, e.g. "licenses".
+
+        Returns:
+            The circuit state.
+        """
+
+        with self._lock:
+
+            circuit = self._circuits.get(group)
+
+            return circuit.state if circuit is not None else CircuitState.Closed
+
+    def states(self) -> dict:
+        """
+        The state of every circuit that has seen a call.
+        """
+
+        with self._lock:
+
+            return {group: circuit.state for group, circuit in self._circuits.items()}
+
+    def reset(self) -> None:
+        """
+        Closes every circuit.
+        """
+
+        with self._lock:
+
+            transitions = [
+                (circuit.group, circuit.state)
+                for circuit in self._circuits.values()
+                if circuit.state != CircuitState.Closed
+            ]
+
+            self._circuits.clear()
+
+        for group, old in transitions:
+
+            self._notify(group, old, CircuitState.Closed)
+
+    @staticmethod
+    def _group(path: str) -> str:
+
+        return path.split("/", 2)[1]
+
+    def _notify(self, group: str, old: CircuitState, new: CircuitState) -> None:
+
+        for listener in self._listeners:
+
+            listener(group, old, new)
+
+    def _enter(self, path: str) -> tuple:
+
+        # Admits an attempt, returning its circuit and whether it is a half-open
+        # trial, or raises CircuitOpenException.
+        group = self._group(path)
+
+        transition = None
+
+        trial = False
+
+        with self._lock:
+
+            circuit = self._circuits.get(group)
+
+            if circuit is None:
+
+                circuit = self._circuits[group] = _Circuit(group)
+
+            if circuit.state == CircuitState.Open:
+
+                wait = circuit.opened_at + self.reset_timeout - time.monotonic()
+
+                if wait > 0:
+
+                    raise CircuitOpenException(f"Circuit of {group} is open", group, wait)
+
+                circuit.state = CircuitState.HalfOpen
+
+                circuit.trials = 0
+
+                transition = (CircuitState.Open, CircuitState.HalfOpen)
+
+            if circuit.state == CircuitState.HalfOpen:
+
+                if circuit.trials >= self.half_open_calls:
+
+                    raise CircuitOpenException(f"Circuit of {group} is half-open", group, None)
+
+                circuit.trials += 1
+
+                trial = True
+
+        if transition is not None:
+
+            self._notify(group, *transition)
+
+        return circuit, trial
+
+    def _failed(self, error: Exception, transport_errors: tuple) -> bool:
+
+        if isinstance(error, HyperAPIException):
+
+            return error.status_code in self.statuses
+
+        return isinstance(error, transport_errors)
+
+    def _exit(self, circuit: _Circuit, trial: bool, error: Exception, transport_errors: tuple) -> None:
+
+        failed = error is not None and self._failed(error, transport_errors)
+
+        transition = None
+
+        with self._lock:
+
+            old = circuit.state
+
+            if trial:
+
+                circuit.trials -= 1
+
+            if not failed:
+
+                circuit.failures = 0
+
+                if trial and old == CircuitState.HalfOpen:
+
+                    circuit.state = CircuitState.Closed
+
+            else:
+
+                circuit.failures += 1
+
+                tripped = old == CircuitState.HalfOpen or circuit.failures >= self.failure_threshold
+
+                if tripped and old != CircuitState.Open:
+
+                    circuit.state = CircuitState.Open
+
+                    circuit.opened_at = time.monotonic()
+
+            if circuit.state != old:
+
+                transition = (old, circuit.state)
+
+        if transition is not None:
+
+            self._notify(circuit.group, *transition)
@@ -0,0 +1,193 @@
+import contextlib
+import time
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Iterable, Iterator, NamedTuple
+
+if TYPE_CHECKING:
+
+    from concurrent.futures import ThreadPoolExecutor
+
+
+class BulkResult(NamedTuple):
+
+    index: int
+    item: Any
+    result: Any = None
+    error: BaseException = None
+
+    @property
+    def ok(self) -> bool:
+
+        return self.error is None
+
+
+class BulkStats(NamedTuple):
+
+    total: int
+    succeeded: int
+    failed: int
+    elapsed: float
+
+    @property
+    def throughput(self) -> float:
+
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+
+class BulkRun:
+
+    def __init__(self, fn: Callable, items: Iterable, concurrency: int = 8, executor: "ThreadPoolExecutor" = None) -> None:
+        """
+        Runs `fn` over `items` with at most `concurrency` calls in flight,
+        yielding a `BulkResult` per item as it completes. Items are pulled
+        lazily, so generators of any size are fine, and a failing item is
+        reported in its result instead of aborting the run. `stats` holds the
+        totals and throughput once the run is exhausted. Calls run on a
+        dedicated thread pool unless an `executor` to share is given.
+        """
+
+        self._fn = fn
+
+        self._items = items
+
+        self.concurrency = max(1, concurrency)
+
+        self._executor = executor
+
+        self.stats = None
+
+    def _call(self, index: int, item) -> BulkResult:
+
+        try:
+
+            return BulkResult(index, item, self._fn(item))
+
+        except Exception as e:
+
+            return BulkResult(index, item, error=e)
+
+    def __iter__(self) -> Iterator[BulkResult]:
+
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+        started = time.perf_counter()
+
+        succeeded = failed = 0
+
+        items = enumerate(self._items)
+
+        pending = set()
+
+        shared = self._executor
+
+        with contextlib.nullcontext(shared) if shared is not None else ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+
+            try:
+
+                while True:
+
+                    for index, item in items:
+
+                        pending.add(executor.submit(self._call, index, item))
+
+                        if len(pending) >= self.concurrency:
+
+                            break
+
+                    if not pending:
+
+                        break
+
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+                    for future in done:
+
+                        result = future.result()
+
+                        if result.ok:
+
+                            succeeded += 1
+
+                        else:
+
+                            failed += 1
+
+                        yield result
+
+            finally:
+
+                for future in pending:
+
+                    future.cancel()
+
+                self.stats = BulkStats(succeeded + failed, succeeded, failed, time.perf_counter() - started)
+
+
+class AsyncBulkRun(BulkRun):
+
+    """
+    `BulkRun` for coroutine functions, iterated with `async for`.
+    """
+
+    __iter__ = None
+
+    async def _acall(self, index: int, item) -> BulkResult:
+
+        try:
+
+            return BulkResult(index, item, await self._fn(item))
+
+        except Exception as e:
+
+            return BulkResult(index, item, error=e)
+
+    async def __aiter__(self) -> AsyncIterator[BulkResult]:
+
+        import asyncio
+
+        started = time.perf_counter()
+
+        succeeded = failed = 0
+
+        items = enumerate(self._items)
+
+        pending = set()
+
+        try:
+
+            while True:
+
+                for index, item in items:
+
+                    pending.add(asyncio.ensure_future(self._acall(index, item)))
+
+                    if len(pending) >= self.concurrency:
+
+                        break
+
+                if not pending:
+
+                    break
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+
+                    result = task.result()
+
+                    if result.ok:
+
+                        succeeded += 1
+
+                    else:
+
+                        failed += 1
+
+                    yield result
+
+        finally:
+
+            for task in pending:
+
+                task.cancel()
+
+            self.stats = BulkStats(succeeded + failed, succeeded, failed, time.perf_counter() - started)
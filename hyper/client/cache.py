@@ -0,0 +1,281 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+
+class CacheStats(NamedTuple):
+
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    size: int
+
+
+class ResponseCache:
+
+    """
+    Base class for the `Core` response cache backends.
+
+    Entries are stored under a request key together with the resource path they
+    belong to, so every entry of a resource can be dropped when the client
+    updates or deletes it. A miss is reported as None.
+    """
+
+    def get(self, key: str):
+
+        raise NotImplementedError
+
+    def get_stale(self, key: str):
+        """
+        Returns an entry even past its TTL, e.g. as a fallback while the API is
+        unreachable, or None. Backends that drop expired entries return None.
+        """
+
+        return None
+
+    def set(self, key: str, path: str, value, ttl: float) -> None:
+
+        raise NotImplementedError
+
+    def invalidate(self, path: str) -> None:
+
+        raise NotImplementedError
+
+    def clear(self) -> None:
+
+        raise NotImplementedError
+
+    def stats(self) -> CacheStats:
+
+        raise NotImplementedError
+
+
+class MemoryCache(ResponseCache):
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        """
+        In-process TTL + LRU response cache. Cached responses are shared
+        between callers and must not be mutated.
+
+        Args:
+            maxsize: maximum number of entries before the least recently used
+                one is evicted. Defaults to 1024.
+        """
+
+        self.maxsize = maxsize
+
+        self._entries = OrderedDict()
+
+        self._paths = {}
+
+        self._lock = threading.Lock()
+
+        self._hits = self._misses = self._evictions = self._expirations = 0
+
+    def _drop(self, key: str) -> None:
+
+        _, path, _ = self._entries.pop(key)
+
+        keys = self._paths.get(path)
+
+        if keys is not None:
+
+            keys.discard(key)
+
+            if not keys:
+
+                del self._paths[path]
+
+    def get(self, key: str):
+
+        with self._lock:
+
+            entry = self._entries.get(key)
+
+            if entry is None:
+
+                self._misses += 1
+
+                return None
+
+            expires, _, value = entry
+
+            if expires < time.monotonic():
+
+                # Expired entries stay until replaced or evicted, for get_stale.
+                self._expirations += 1
+                self._misses += 1
+
+                return None
+
+            self._entries.move_to_end(key)
+
+            self._hits += 1
+
+            return value
+
+    def get_stale(self, key: str):
+
+        with self._lock:
+
+            entry = self._entries.get(key)
+
+            return entry[2] if entry is not None else None
+
+    def set(self, key: str, path: str, value, ttl: float) -> None:
+
+        with self._lock:
+
+            if key in self._entries:
+
+                self._drop(key)
+
+            self._entries[key] = (time.monotonic() + ttl, path, value)
+
+            self._paths.setdefault(path, set()).add(key)
+
+            while len(self._entries) > self.maxsize:
+
+                self._drop(next(iter(self._entries)))
+
+                self._evictions += 1
+
+    def invalidate(self, path: str) -> None:
+
+        with self._lock:
+
+            for key in list(self._paths.get(path, ())):
+
+                self._drop(key)
+
+    def clear(self) -> None:
+
+        with self._lock:
+
+            self._entries.clear()
+            self._paths.clear()
+
+    def stats(self) -> CacheStats:
+
+        with self._lock:
+
+            return CacheStats(self._hits, self._misses, self._evictions, self._expirations, len(self._entries))
+
+
+class DiskCache(ResponseCache):
+
+    def __init__(self, filename: str, maxsize: int = 100_000) -> None:
+        """
+        On-disk TTL + LRU response cache backed by a local SQLite file, shared
+        by every process that opens the same file.
+
+        Args:
+            filename: the SQLite database file.
+            maxsize: maximum number of entries before the least recently used
+                ones are evicted. Defaults to 100000.
+        """
+
+        self.maxsize = maxsize
+
+        self._lock = threading.Lock()
+
+        self._db = sqlite3.connect(filename, check_same_thread=False, isolation_level=None)
+
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, path TEXT NOT NULL, expires REAL NOT NULL, "
+            "accessed REAL NOT NULL, value TEXT NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_path ON entries (path)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+
+        self._hits = self._misses = self._evictions = self._expirations = 0
+
+    def get(self, key: str):
+
+        now = time.time()
+
+        with self._lock:
+
+            row = self._db.execute("SELECT expires, value FROM entries WHERE key = ?", (key,)).fetchone()
+
+            if row is None:
+
+                self._misses += 1
+
+                return None
+
+            if row[0] < now:
+
+                # Expired entries stay until replaced or evicted, for get_stale.
+                self._expirations += 1
+                self._misses += 1
+
+                return None
+
+            self._db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+
+            self._hits += 1
+
+        return json.loads(row[1])
+
+    def get_stale(self, key: str):
+
+        with self._lock:
+
+            row = self._db.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+
+        return json.loads(row[0]) if row is not None else None
+
+    def set(self, key: str, path: str, value, ttl: float) -> None:
+
+        now = time.time()
+
+        raw = json.dumps(value)
+
+        with self._lock:
+
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, path, expires, accessed, value) VALUES (?, ?, ?, ?, ?)",
+                (key, path, now + ttl, now, raw)
+            )
+
+            overflow = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0] - self.maxsize
+
+            if overflow > 0:
+
+                self._db.execute(
+                    "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY accessed LIMIT ?)",
+                    (overflow,)
+                )
+
+                self._evictions += overflow
+
+    def invalidate(self, path: str) -> None:
+
+        with self._lock:
+
+            self._db.execute("DELETE FROM entries WHERE path = ?", (path,))
+
+    def clear(self) -> None:
+
+        with self._lock:
+
+            self._db.execute("DELETE FROM entries")
+
+    def stats(self) -> CacheStats:
+
+        with self._lock:
+
+            size = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+            return CacheStats(self._hits, self._misses, self._evictions, self._expirations, size)
+
+    def close(self) -> None:
+
+        self._db.close()
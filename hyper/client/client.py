@@ -1,42 +1,119 @@
-import re
-import uuid
-from ..coupons import CreateCouponParams
-from ..links import CreateLinkParams, UpdateLinkParams
-from ..products import CreateProductParams, UpdateProductParams
-from ..raffles import CreateRaffleParams
-from ..licenses import CreateLicenseParams, UpdateLicenseParams
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING, Iterable, Iterator
+from ..exceptions import HyperAPIException
+from ..utils.helpers import _hardware_id
+from ..utils.pagination import _iter_items
+from .batch import Batch
+from .bulk import BulkRun
+from .conditional import Poll
 from .core import Core
+from .watch import ChangeEvent, _watch
+
+if TYPE_CHECKING:
+
+    # Only annotations refer to these: params encode themselves, so a client that
+    # never builds one never imports the params modules.
+    from ..coupons import CreateCouponParams
+    from ..licenses import CreateLicenseParams, UpdateLicenseParams
+    from ..links import CreateLinkParams, UpdateLinkParams
+    from ..products import CreateProductParams, UpdateProductParams
+    from ..raffles import CreateRaffleParams
+    from .verdicts import VerdictCache
+
+
+_LIST_PATHS = {
+    "licenses": "/licenses",
+    "products": "/products",
+    "links": "/links",
+    "raffles": "/raffles",
+    "waitlist": "/waitlist/entries",
+    "payments": "/payments",
+    "coupons": "/coupons",
+}
+
+
+def _paging(params: dict, page: int, limit: int) -> dict:
+
+    # Only explicit paging is sent, leaving the API its own defaults otherwise.
+    if page is not None:
+
+        params["page"] = page
+
+    if limit is not None:
+
+        params["limit"] = limit
+
+    return params
 
 
 class Client(Core):
 
-    def __init__(self, api_key: str) -> None:
+    _iter_items = staticmethod(_iter_items)
+
+    _bulk = BulkRun
+
+    _watch = staticmethod(_watch)
+
+    _batch = Batch
+
+    def __init__(
+        self,
+        api_key: str,
+        verdict_cache: VerdictCache = None,
+        verdict_grace: float = 7 * 24 * 3600,
+        verdict_refresh: float = 300,
+        **options
+    ) -> None:
         """
         Hyper.co dashboard client that interacts with the Hyper API.
         * https://docs.hyper.co/reference/getting-started
 
+        The client keeps its connections alive between calls, so prefer a single
+        long-lived instance and close it when done, or use it as a context manager.
+
         Args:
             api_key: the business API key.
+            verdict_cache: persistent cache of successful `authorize` verdicts. Defaults
+                to always authorizing against the API.
+            verdict_grace: seconds a cached verdict is trusted without reaching the API.
+                Defaults to 7 days.
+            verdict_refresh: age in seconds after which a cached verdict is revalidated
+                in the background. Defaults to 5 minutes.
+            options: transport options forwarded to `Core`.
         """
 
-        super().__init__(api_key)
+        super().__init__(api_key, **options)
+
+        self._verdicts = verdict_cache
+
+        self._verdict_grace = verdict_grace
+
+        self._verdict_refresh = verdict_refresh
+
+        self._revalidating = set()
+
+        self._revalidating_lock = threading.Lock()
 
     # ---- LICENSES CLIENT ------------------------------------------------------------------------------ #
 
-    def create_license(self, params: CreateLicenseParams) -> dict:
+    def create_license(self, params: CreateLicenseParams, idempotency_key: str = None) -> dict:
         """
         Creates a license.
         * https://docs.hyper.co/reference/create-license
 
         Args:
             params: the create license params.
+            idempotency_key: optional key making the call safe to retry.
 
         Returns:
             The created license data.
         """
-        payload = params._build_payload()
+        payload = params._encode_payload()
 
-        return self._create_license_request(payload=payload)
+        return self._create_license_request(payload=payload, idempotency_key=idempotency_key)
 
     def retrieve_license(self, license_key: str) -> dict:
         """
@@ -65,7 +142,7 @@ class Client(Core):
             The updated license.
         """
 
-        payload = params._build_payload()
+        payload = params._encode_payload()
 
         return self._update_license_request(license_key=license_key, payload=payload)
 
@@ -115,25 +192,103 @@ class Client(Core):
 
         return self._list_licenses_request(params=params)
 
+    def iter_licenses(self, limit: int = 100, page: int = 1, prefetch: int = 0) -> Iterator[dict]:
+        """
+        Lazily walks every page of licenses, yielding them one at a time.
+        Memory is bounded to one page, or to a window of in-flight pages when prefetching.
+
+        Args:
+            limit: page size of each underlying request. Defaults to 100.
+            page: the page to start from. Defaults to 1.
+            prefetch: number of pages fetched concurrently ahead of the consumer,
+                0 to walk the pages one by one. Defaults to 0.
+
+        Returns:
+            An iterator over the licenses.
+        """
+
+        return self._iter_items(self._list_licenses_request, page=page, limit=limit, prefetch=prefetch)
+
+    def bulk_create_licenses(self, params_iter: Iterable[CreateLicenseParams], concurrency: int = 8) -> BulkRun:
+        """
+        Creates many licenses concurrently.
+
+        Args:
+            params_iter: the create license params, any iterable including generators.
+            concurrency: maximum number of requests in flight. Defaults to 8.
+
+        Returns:
+            An iterable of per-license `BulkResult`s in completion order. Its `stats`
+            hold the totals and throughput once it is exhausted.
+        """
+
+        return self._bulk(self.create_license, params_iter, concurrency)
+
+    def bulk_update_licenses(self, updates: Iterable[tuple[str, UpdateLicenseParams]], concurrency: int = 8) -> BulkRun:
+        """
+        Updates many licenses concurrently.
+
+        Args:
+            updates: (license key, update license params) pairs, any iterable including generators.
+            concurrency: maximum number of requests in flight. Defaults to 8.
+
+        Returns:
+            An iterable of per-license `BulkResult`s in completion order. Its `stats`
+            hold the totals and throughput once it is exhausted.
+        """
+
+        return self._bulk(lambda update: self.update_license(*update), updates, concurrency)
+
+    def bulk_update_licenses_metadata(self, updates: Iterable[tuple[str, dict]], concurrency: int = 8) -> BulkRun:
+        """
+        Updates the metadata of many licenses concurrently.
+
+        Args:
+            updates: (license key, metadata) pairs, any iterable including generators.
+            concurrency: maximum number of requests in flight. Defaults to 8.
+
+        Returns:
+            An iterable of per-license `BulkResult`s in completion order. Its `stats`
+            hold the totals and throughput once it is exhausted.
+        """
+
+        return self._bulk(lambda update: self.update_license_metadata(*update), updates, concurrency)
+
+    def bulk_delete_licenses(self, license_keys: Iterable[str], concurrency: int = 8) -> BulkRun:
+        """
+        Deletes many licenses concurrently.
+
+        Args:
+            license_keys: the license keys, any iterable including generators.
+            concurrency: maximum number of requests in flight. Defaults to 8.
+
+        Returns:
+            An iterable of per-license `BulkResult`s in completion order. Its `stats`
+            hold the totals and throughput once it is exhausted.
+        """
+
+        return self._bulk(self.delete_license, license_keys, concurrency)
+
     # ---- PRODUCTS CLIENT ------------------------------------------------------------------------------ #
 
-    def create_product(self, params: CreateProductParams) -> dict:
+    def create_product(self, params: CreateProductParams, idempotency_key: str = None) -> dict:
         """
         Creates a product.
         * https://docs.hyper.co/reference/create-product
 
         Args:
             params: the create product params.
+            idempotency_key: optional key making the call safe to retry.
 
         Returns:
             The created product data.
         """
 
-        payload = params._build_payload()
+        payload = params._encode_payload()
 
-        return self._create_product_request(payload=payload)
+        return self._create_product_request(payload=payload, idempotency_key=idempotency_key)
 
-    def retreive_product(self, product_id: str) -> dict:
+    def retrieve_product(self, product_id: str) -> dict:
         """
         Retrieves a product data.
         * https://docs.hyper.co/reference/retrieve-product
@@ -147,6 +302,9 @@ class Client(Core):
 
         return self._retrieve_product_request(product_id=product_id)
 
+    # Misspelled name kept for backwards compatibility.
+    retreive_product = retrieve_product
+
     def update_product(self, product_id: str, params: UpdateProductParams) -> dict:
         """
         Updates a product data.
@@ -160,38 +318,62 @@ class Client(Core):
             The updated product.
         """
 
-        payload = params._build_payload()
+        payload = params._encode_payload()
 
         return self._update_product_request(product_id=product_id, payload=payload)
 
-    def list_products(self) -> dict:
+    def list_products(self, page: int = None, limit: int = None) -> dict:
         """
         Retrieves all the products.
         * https://docs.hyper.co/reference/list-products
 
+        Args:
+            page: the page number. Defaults to the API default.
+            limit: limit of products to retrieve. Defaults to the API default.
+
         Returns:
             The products list and the pagination data.
         """
 
-        return self._list_products_request()
+        params = _paging({}, page, limit)
+
+        return self._list_products_request(params=params)
+
+    def iter_products(self, limit: int = 100, page: int = 1, prefetch: int = 0) -> Iterator[dict]:
+        """
+        Lazily walks every page of products, yielding them one at a time.
+        Memory is bounded to one page, or to a window of in-flight pages when prefetching.
+
+        Args:
+            limit: page size of each underlying request. Defaults to 100.
+            page: the page to start from. Defaults to 1.
+            prefetch: number of pages fetched concurrently ahead of the consumer,
+                0 to walk the pages one by one. Defaults to 0.
+
+        Returns:
+            An iterator over the products.
+        """
+
+        return self._iter_items(self._list_products_request, page=page, limit=limit, prefetch=prefetch)
 
     # ---- LINKS CLIENT ------------------------------------------------------------------------------ #
 
-    def create_link(self, params: CreateLinkParams) -> dict:
+    def create_link(self, params: CreateLinkParams, idempotency_key: str = None) -> dict:
         """
         Creates a link for a product.
         * https://docs.hyper.co/reference/create-link
 
         Args:
             params: the create link params.
+            idempotency_key: optional key making the call safe to retry.
 
         Returns:
             The created link data.
         """
 
-        payload = params._build_payload()
+        payload = params._encode_payload()
 
-        return self._create_link_request(payload=payload)
+        return self._create_link_request(payload=payload, idempotency_key=idempotency_key)
 
     def retrieve_link(self, link: str) -> dict:
         """
@@ -220,38 +402,62 @@ class Client(Core):
             The updated link.
         """
 
-        payload = params._build_payload()
+        payload = params._encode_payload()
 
         return self._update_link_request(link=link, payload=payload)
 
-    def list_links(self) -> dict:
+    def list_links(self, page: int = None, limit: int = None) -> dict:
         """
         Retrieves all the links.
         * https://docs.hyper.co/reference/list-links
 
+        Args:
+            page: the page number. Defaults to the API default.
+            limit: limit of links to retrieve. Defaults to the API default.
+
         Returns:
             The links list and the pagination data.
         """
 
-        return self._list_links_request()
+        params = _paging({}, page, limit)
+
+        return self._list_links_request(params=params)
+
+    def iter_links(self, limit: int = 100, page: int = 1, prefetch: int = 0) -> Iterator[dict]:
+        """
+        Lazily walks every page of links, yielding them one at a time.
+        Memory is bounded to one page, or to a window of in-flight pages when prefetching.
+
+        Args:
+            limit: page size of each underlying request. Defaults to 100.
+            page: the page to start from. Defaults to 1.
+            prefetch: number of pages fetched concurrently ahead of the consumer,
+                0 to walk the pages one by one. Defaults to 0.
+
+        Returns:
+            An iterator over the links.
+        """
+
+        return self._iter_items(self._list_links_request, page=page, limit=limit, prefetch=prefetch)
 
     # ---- RAFFLES CLIENT ------------------------------------------------------------------------------ #
 
-    def create_raffle(self, params: CreateRaffleParams) -> dict:
+    def create_raffle(self, params: CreateRaffleParams, idempotency_key: str = None) -> dict:
         """
         Creates a raffle.
         * https://docs.hyper.co/reference/create-a-raffle
 
         Args:
             params: the create raffle params.
+            idempotency_key: optional key making the call safe to retry.
 
         Returns:
             The created raffle data.
         """
 
-        payload = params._build_payload()
+        payload = params._encode_payload()
 
-        return self._create_raffle_request(payload=payload)
+        return self._create_raffle_request(payload=payload, idempotency_key=idempotency_key)
 
     def retrieve_raffle(self, raffle_id: str) -> dict:
         """
@@ -267,19 +473,44 @@ class Client(Core):
 
         return self._retrieve_raffle_request(raffle_id=raffle_id)
 
-    def list_raffles(self, active: bool = True) -> dict:
+    def list_raffles(self, active: bool = True, page: int = None, limit: int = None) -> dict:
         """
         Retrieves all the raffles.
         * https://docs.hyper.co/reference/list-raffles
 
+        Args:
+            active: weather or not the retrieved raffles have to be active.
+            page: the page number. Defaults to the API default.
+            limit: limit of raffles to retrieve. Defaults to the API default.
+
         Returns:
             The raffles list and the pagination data.
         """
 
-        params = {"active": "true" if active else "false"}
+        params = _paging({"active": "true" if active else "false"}, page, limit)
 
         return self._list_raffles_request(params=params)
 
+    def iter_raffles(self, active: bool = True, limit: int = 100, page: int = 1, prefetch: int = 0) -> Iterator[dict]:
+        """
+        Lazily walks every page of raffles, yielding them one at a time.
+        Memory is bounded to one page, or to a window of in-flight pages when prefetching.
+
+        Args:
+            active: weather or not the retrieved raffles have to be active.
+            limit: page size of each underlying request. Defaults to 100.
+            page: the page to start from. Defaults to 1.
+            prefetch: number of pages fetched concurrently ahead of the consumer,
+                0 to walk the pages one by one. Defaults to 0.
+
+        Returns:
+            An iterator over the raffles.
+        """
+
+        params = {"active": "true" if active else "false"}
+
+        return self._iter_items(self._list_raffles_request, params=params, page=page, limit=limit, prefetch=prefetch)
+
     # ---- WAITLIST CLIENT ------------------------------------------------------------------------------ #
 
     def retrieve_waitlist_entry(self, entry_id: str) -> dict:
@@ -296,16 +527,39 @@ class Client(Core):
 
         return self._retrieve_waitlist_entry_request(entry_id=entry_id)
 
-    def list_waitlist_entries(self) -> dict:
+    def list_waitlist_entries(self, page: int = None, limit: int = None) -> dict:
         """
         Retrieves all the waitlist entries.
         * https://docs.hyper.co/reference/list-waitlist-entries
 
+        Args:
+            page: the page number. Defaults to the API default.
+            limit: limit of waitlist entries to retrieve. Defaults to the API default.
+
         Returns:
             The waitlist entries list and the pagination data.
         """
 
-        return self._list_waitlist_entries_request()
+        params = _paging({}, page, limit)
+
+        return self._list_waitlist_entries_request(params=params)
+
+    def iter_waitlist_entries(self, limit: int = 100, page: int = 1, prefetch: int = 0) -> Iterator[dict]:
+        """
+        Lazily walks every page of waitlist entries, yielding them one at a time.
+        Memory is bounded to one page, or to a window of in-flight pages when prefetching.
+
+        Args:
+            limit: page size of each underlying request. Defaults to 100.
+            page: the page to start from. Defaults to 1.
+            prefetch: number of pages fetched concurrently ahead of the consumer,
+                0 to walk the pages one by one. Defaults to 0.
+
+        Returns:
+            An iterator over the waitlist entries.
+        """
+
+        return self._iter_items(self._list_waitlist_entries_request, page=page, limit=limit, prefetch=prefetch)
 
     # ---- PAYMENTS CLIENT ------------------------------------------------------------------------------ #
 
@@ -323,48 +577,73 @@ class Client(Core):
 
         return self._retrieve_payment_request(payment_id=payment_id)
 
-    def refund_payment(self, payment: str) -> dict:
+    def refund_payment(self, payment: str, idempotency_key: str = None) -> dict:
         """
         Refunds a payment.
         * https://docs.hyper.co/reference/refund-payment
 
         Args:
             payment: the payment id.
+            idempotency_key: optional key making the call safe to retry.
 
         Returns:
             "Accepted" if the payment was refunded successfuly.
         """
 
-        return self._refund_payment_request(payment=payment)
+        return self._refund_payment_request(payment=payment, idempotency_key=idempotency_key)
 
-    def list_payments(self) -> dict:
+    def list_payments(self, page: int = None, limit: int = None) -> dict:
         """
         Retrieves all the payments.
         * https://docs.hyper.co/reference/list-payments
 
+        Args:
+            page: the page number. Defaults to the API default.
+            limit: limit of payments to retrieve. Defaults to the API default.
+
         Returns:
             The payments list and the pagination data.
         """
 
-        return self._list_payments_request()
+        params = _paging({}, page, limit)
+
+        return self._list_payments_request(params=params)
+
+    def iter_payments(self, limit: int = 100, page: int = 1, prefetch: int = 0) -> Iterator[dict]:
+        """
+        Lazily walks every page of payments, yielding them one at a time.
+        Memory is bounded to one page, or to a window of in-flight pages when prefetching.
+
+        Args:
+            limit: page size of each underlying request. Defaults to 100.
+            page: the page to start from. Defaults to 1.
+            prefetch: number of pages fetched concurrently ahead of the consumer,
+                0 to walk the pages one by one. Defaults to 0.
+
+        Returns:
+            An iterator over the payments.
+        """
+
+        return self._iter_items(self._list_payments_request, page=page, limit=limit, prefetch=prefetch)
 
     # ---- COUPONS CLIENT ------------------------------------------------------------------------------ #
 
-    def create_coupon(self, params: CreateCouponParams) -> dict:
+    def create_coupon(self, params: CreateCouponParams, idempotency_key: str = None) -> dict:
         """
         Creates a coupon.
         * https://docs.hyper.co/reference/create-coupon
 
         Args:
             params: the create coupon params.
+            idempotency_key: optional key making the call safe to retry.
 
         Returns:
             The created coupon data.
         """
 
-        payload = params._build_payload()
+        payload = params._encode_payload()
 
-        return self._create_coupon_request(payload=payload)
+        return self._create_coupon_request(payload=payload, idempotency_key=idempotency_key)
 
     def retrieve_coupon(self, coupon_id: str) -> dict:
         """
@@ -380,60 +659,266 @@ class Client(Core):
 
         return self._retrieve_coupon_request(coupon_id=coupon_id)
 
-    def list_coupons(self, active: bool = True) -> dict:
+    def list_coupons(self, active: bool = True, page: int = None, limit: int = None) -> dict:
         """
         Retrieves all the coupons.
         * https://docs.hyper.co/reference/list-coupons
 
         Args:
             active: weather or not the retrieved coupons have to be active.
+            page: the page number. Defaults to the API default.
+            limit: limit of coupons to retrieve. Defaults to the API default.
 
         Returns:
             The coupons list and the pagination data.
         """
 
-        params = {"active": "true" if active else "false"}
+        params = _paging({"active": "true" if active else "false"}, page, limit)
 
         return self._list_coupons_request(params=params)
 
+    def iter_coupons(self, active: bool = True, limit: int = 100, page: int = 1, prefetch: int = 0) -> Iterator[dict]:
+        """
+        Lazily walks every page of coupons, yielding them one at a time.
+        Memory is bounded to one page, or to a window of in-flight pages when prefetching.
+
+        Args:
+            active: weather or not the retrieved coupons have to be active.
+            limit: page size of each underlying request. Defaults to 100.
+            page: the page to start from. Defaults to 1.
+            prefetch: number of pages fetched concurrently ahead of the consumer,
+                0 to walk the pages one by one. Defaults to 0.
+
+        Returns:
+            An iterator over the coupons.
+        """
+
+        params = {"active": "true" if active else "false"}
+
+        return self._iter_items(self._list_coupons_request, params=params, page=page, limit=limit, prefetch=prefetch)
+
+    # ---- BATCH CLIENT ------------------------------------------------------------------------------ #
+
+    def batch(self, concurrency: int = 8) -> Batch:
+        """
+        Records calls and runs them concurrently when the block exits, e.g. to
+        load the independent data of a page in the time of its slowest call:
+
+            with client.batch() as batch:
+                products = batch.list_products()
+                links = batch.list_links()
+                license = batch.retrieve_license("KEY")
+
+            products.result()
+
+        Any single-call method (`create_*`, `retrieve_*`, `update_*`, `delete_*`,
+        `list_*`, `refund_*`, `poll` and `authorize`) can be recorded. With an
+        `AsyncClient`, use `async with client.batch() as batch`.
+
+        Args:
+            concurrency: maximum number of requests in flight. Defaults to 8.
+
+        Returns:
+            The batch, whose calls return `BatchCall`s resolving to what the client
+            methods return, each failing call keeping its own exception.
+        """
+
+        return self._batch(self, concurrency)
+
+    # ---- POLLING CLIENT ------------------------------------------------------------------------------ #
+
+    def poll(self, resource: str, page: int = 1, limit: int = 20, **filters) -> Poll:
+        """
+        Fetches a list page through a conditional request, telling whether it
+        changed since the previous poll of the same page. An unchanged page costs
+        a 304 or, when the API sends no validators, a body digest instead of a
+        JSON decode, and returns the previous data, which must not be mutated.
+
+        Args:
+            resource: one of "licenses", "products", "links", "raffles", "waitlist",
+                "payments" or "coupons".
+            page: the page number. Defaults to 1.
+            limit: limit of items to retrieve. Defaults to 20.
+            filters: list filters such as `active=True` for raffles and coupons.
+
+        Returns:
+            The page data and whether or not it changed.
+        """
+
+        path, params = self._list_target(resource, page, limit, filters)
+
+        return self._poll_json(path=path, params=params)
+
+    @staticmethod
+    def _list_target(resource: str, page: int, limit: int, filters: dict) -> tuple:
+
+        if resource not in _LIST_PATHS:
+
+            raise ValueError(f"Unknown resource {resource!r}")
+
+        params = {
+            **{key: ("true" if value else "false") if isinstance(value, bool) else value for key, value in filters.items()},
+            "page": page,
+            "limit": limit,
+        }
+
+        return _LIST_PATHS[resource], params
+
+    def watch(
+        self,
+        resource: str,
+        interval: float = 5.0,
+        min_interval: float = 1.0,
+        max_interval: float = 60.0,
+        limit: int = 100,
+        initial: bool = False,
+        **filters
+    ) -> Iterator[ChangeEvent]:
+        """
+        Turns polling of a resource list into a stream of created, updated and
+        deleted events.
+
+        Every cycle walks the list with `poll` and diffs it against the previous
+        cycle by per-item fingerprints, so unchanged pages are neither decoded nor
+        fingerprinted again. The wait between cycles halves while changes keep
+        coming and grows by half while idle, within `min_interval` and
+        `max_interval`. Rate limits, server errors, network failures and open
+        circuits pause the watch instead of ending it.
+
+        Args:
+            resource: one of "licenses", "products", "links", "raffles", "waitlist",
+                "payments" or "coupons".
+            interval: initial seconds between cycles. Defaults to 5.
+            min_interval: shortest seconds between cycles. Defaults to 1.
+            max_interval: longest seconds between cycles. Defaults to 60.
+            limit: page size of each request. Defaults to 100.
+            initial: whether or not to report the items of the first cycle as created.
+                Defaults to False.
+            filters: list filters such as `active=True` for raffles and coupons.
+
+        Returns:
+            An endless iterator of `ChangeEvent`s.
+        """
+
+        return self._watch(self, resource, interval, min_interval, max_interval, limit, initial, filters)
+
     # ---- AUTH CLIENT ----------------------------------------------------------------------------------- #
 
+    def _cached_verdict(self, license_key: str) -> bool:
+
+        if self._verdicts is None:
+
+            return False
+
+        verdict = self._verdicts.get(license_key, _hardware_id())
+
+        if verdict is None:
+
+            return False
+
+        # The file's own expiry is not enough: this client's grace period bounds
+        # how long ago the API was reached, whatever the file says.
+        age = time.time() - verdict.verified_at
+
+        if not 0 <= age <= self._verdict_grace:
+
+            return False
+
+        if age > self._verdict_refresh:
+
+            self._revalidate(license_key)
+
+        return True
+
+    def _record_verdict(self, license_key: str, authorized: bool) -> None:
+
+        if self._verdicts is None:
+
+            return
+
+        if authorized:
+
+            self._verdicts.put(license_key, _hardware_id(), self._verdict_grace)
+
+        else:
+
+            self._verdicts.discard(license_key)
+
+    def _revalidate(self, license_key: str) -> None:
+
+        with self._revalidating_lock:
+
+            if license_key in self._revalidating:
+
+                return
+
+            self._revalidating.add(license_key)
+
+        threading.Thread(target=self._revalidate_worker, args=(license_key,), daemon=True).start()
+
+    def _revalidate_worker(self, license_key: str) -> None:
+
+        try:
+
+            self._authorize_online(license_key)
+
+        except HyperAPIException as e:
+
+            # Only a missing license is a verdict on it. Outages, throttling and an
+            # open circuit keep the verdict until its grace period runs out.
+            if e.status_code == 404:
+
+                self._verdicts.discard(license_key)
+
+        except Exception:
+
+            # Network failures keep the verdict until its grace period runs out.
+            pass
+
+        finally:
+
+            with self._revalidating_lock:
+
+                self._revalidating.discard(license_key)
+
+    def _authorize_online(self, license_key: str) -> bool:
+
+        license = self.retrieve_license(license_key=license_key)
+
+        hardware_id = _hardware_id()
+
+        if not license["metadata"]:
+
+            self._update_license_request(license_key=license_key, payload={"metadata": {"hwid": hardware_id}})
+
+            authorized = True
+
+        else:
+
+            authorized = license["metadata"].get("hwid") == hardware_id
+
+        self._record_verdict(license_key, authorized)
+
+        return authorized
+
     def authorize(self, license_key: str) -> bool:
         """
         Authorizes a license using basic hardware id auth.
         * https://docs.hyper.co/recipes/python-cli-auth
 
+        When the client has a verdict cache, a license authorized on this machine
+        within the grace period is accepted without waiting on the API, and is
+        revalidated in the background.
+
         Args:
             license_key: the license key to auth.
 
         Returns:
             A boolean to indicate weather or not the license was authorized successfuly.
-        """        
-        
-        license = self.retrieve_license(license_key=license_key)
+        """
 
-        hardware_id = ':'.join(re.findall('..', '%012x' % uuid.getnode()))
+        if self._cached_verdict(license_key):
 
-        if not license["metadata"]:
-            
-            params = UpdateLicenseParams(
-                metadata={
-                    "metadata": {
-                        "hwid": hardware_id
-                    }
-                }
-            )
-            
-            self.update_license(license_key=license_key, params=params)
-            
             return True
-        
-        else:
-            
-            current_hwid = license["metadata"].get('hwid')
-            
-            if current_hwid == hardware_id:
-                
-                return True
-            
-            return False
\ No newline at end of file
+
+        return self._authorize_online(license_key)
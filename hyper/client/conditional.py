@@ -0,0 +1,107 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Mapping, NamedTuple
+
+
+class Poll(NamedTuple):
+
+    """
+    Result of `Client.poll`: the response data and whether it differs from the
+    previous poll of the same page.
+    """
+
+    data: dict
+    changed: bool
+
+
+class _Validated(NamedTuple):
+
+    etag: str
+    last_modified: str
+    digest: bytes
+    data: dict
+
+
+class _ValidatorStore:
+
+    def __init__(self, maxsize: int = 1024) -> None:
+
+        # Validators and decoded body of the last response of each GET url, kept
+        # LRU so pollers of many pages stay bounded.
+        self.maxsize = maxsize
+
+        self._entries = OrderedDict()
+
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> _Validated:
+
+        with self._lock:
+
+            entry = self._entries.get(key)
+
+            if entry is not None:
+
+                self._entries.move_to_end(key)
+
+            return entry
+
+    def _put(self, key: str, entry: _Validated) -> None:
+
+        with self._lock:
+
+            self._entries[key] = entry
+
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+
+                self._entries.popitem(last=False)
+
+    @staticmethod
+    def headers(entry: _Validated, headers: dict = None) -> dict:
+
+        if entry is None or (entry.etag is None and entry.last_modified is None):
+
+            return headers
+
+        headers = dict(headers or {})
+
+        if entry.etag is not None:
+
+            headers["If-None-Match"] = entry.etag
+
+        if entry.last_modified is not None:
+
+            headers["If-Modified-Since"] = entry.last_modified
+
+        return headers
+
+    def resolve(self, key: str, entry: _Validated, status: int, headers: Mapping, body: bytes, decode: Callable) -> Poll:
+
+        # Returns the data of a response and whether it changed, decoding the
+        # body only when neither a 304 nor an identical digest says otherwise.
+        if status == 304 and entry is not None:
+
+            return Poll(entry.data, False)
+
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+
+        etag = headers.get("ETag")
+
+        last_modified = headers.get("Last-Modified")
+
+        if entry is not None and entry.digest == digest:
+
+            if (etag, last_modified) != (entry.etag, entry.last_modified):
+
+                self._put(key, entry._replace(etag=etag, last_modified=last_modified))
+
+            return Poll(entry.data, False)
+
+        data = decode(body)
+
+        self._put(key, _Validated(etag, last_modified, digest, data))
+
+        return Poll(data, True)
@@ -1,155 +1,742 @@
-from requests import Response
-import requests
-from ..exceptions import HyperAPIException
+import hashlib
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Mapping
+from urllib.parse import urlencode
+from ..exceptions import CircuitOpenException, HyperAPIException, HyperRateLimitException
+from ..utils.codec import _encode, _loads
+from .conditional import Poll, _ValidatorStore
+from .instrumentation import RequestInfo, ResponseInfo, _endpoint
+from .ratelimit import RateLimiter, _retry_after
+from .timeouts import Timeout, _bound, _deadline, _remaining, _resolve
+
+if TYPE_CHECKING:
+
+    import requests
+    from .breaker import CircuitBreaker
+    from .cache import ResponseCache
+    from .retry import RetryPolicy
+
+
+_ACTION_SEGMENTS = frozenset(("metadata", "refund"))
+
+
+def _pooled_session(pool_connections: int, pool_maxsize: int, pool_block: bool, headers: dict) -> "requests.Session":
+
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block
+    )
+
+    session = requests.Session()
+
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    session.headers.update(headers)
+
+    return session
 
 
 class Core:
 
     _base_url = "https://api.hyper.co/v6"
 
-    def __init__(self, api_key: str) -> None:
+    # Replaced by the exceptions of the transport once it is loaded, see `_requests`.
+    _transport_errors = ()
+
+    _timeout_error = TimeoutError
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = None,
+        pool_connections: int = 4,
+        pool_maxsize: int = 16,
+        pool_block: bool = False,
+        cache: "ResponseCache" = None,
+        cache_ttl: float | dict = 60,
+        coalesce: bool = False,
+        rate_limiter: RateLimiter = None,
+        retry: "RetryPolicy" = None,
+        instruments: list = None,
+        timeout: Timeout | float = Timeout(connect=5.0, read=30.0),
+        circuit_breaker: "CircuitBreaker" = None,
+        conditional: bool = False,
+        session=None
+    ) -> None:
+        """
+        Hyper API core. Owns a long-lived HTTP session whose connections are
+        kept alive and reused across calls, opened on the first call so that
+        clients which never reach the API never load the transport.
+
+        Args:
+            api_key: the business API key.
+            base_url: overrides the Hyper API base url. Defaults to the v6 API.
+            pool_connections: number of per-host connection pools to keep. Defaults to 4.
+            pool_maxsize: maximum number of connections kept alive per host. Defaults to 16.
+            pool_block: whether or not to block when all the connections of a host are
+                in use instead of opening a throwaway one. Defaults to False.
+            cache: opt-in cache backend for the license, product, link and coupon
+                retrieve calls. Entries of a resource are dropped whenever this client
+                updates or deletes it. Defaults to no cache.
+            cache_ttl: seconds a cached response stays fresh, either for every resource or
+                as a mapping such as {"licenses": 30, "products": 600}. Defaults to 60.
+            coalesce: whether or not concurrent identical GETs share a single in-flight
+                request, every caller receiving the same result object or exception.
+                Defaults to False.
+            rate_limiter: client-side limiter every call waits on, which adapts to the
+                API rate limit headers. Use `RateLimiter.shared(key)` to share one budget
+                across clients, threads and tasks. Defaults to no limit.
+            retry: retry policy for transient failures. Defaults to no retries.
+            instruments: `Instrument`s notified of every request, response, error, retry
+                and JSON decode, e.g. `Hooks`, `Metrics` or `OpenTelemetrySpans`.
+                Defaults to none.
+            timeout: connect, read and total timeouts of every call, or a number of
+                seconds for both connect and read. Override them per call with
+                `hyper.client.timeout(...)`. Defaults to 5s to connect and 30s per read.
+            circuit_breaker: breaker failing calls fast while an endpoint group keeps
+                failing, with expired cache entries as fallback. Defaults to none.
+            conditional: whether or not GET calls remember the ETag and Last-Modified
+                validators of each url and revalidate with If-None-Match and
+                If-Modified-Since, a 304 or an unchanged body returning the previously
+                decoded data without parsing it again. Returned data is then shared
+                between calls and must not be mutated. Defaults to False.
+            session: an existing session to send the calls through, shared with other
+                clients, e.g. by `ClientPool`. The API key is then sent with each request,
+                the pool options are ignored and `close` leaves the session open.
+                Defaults to a session owned by this client.
+        """
 
         self._bearer = api_key
 
+        # Cache entries are namespaced per business, so clients of different API keys
+        # sharing a cache, e.g. one `DiskCache` file, never serve each other's data.
+        self._cache_namespace = hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+        if base_url is not None:
+
+            self._base_url = base_url.rstrip("/")
+
         self._headers = {
             "Authorization": "Bearer " + self._bearer,
             "accept": "application/json",
             "content-type": "application/json",
         }
 
+        self._cache = cache
+
+        self._cache_ttl = cache_ttl
+
+        self._inflight = None
+
+        if coalesce:
+
+            from .singleflight import SingleFlight
+
+            self._inflight = SingleFlight()
+
+        self._limiter = rate_limiter
+
+        self._retry = retry
+
+        self._instruments = tuple(instruments or ())
+
+        self._timeout = timeout if isinstance(timeout, Timeout) else Timeout(timeout, timeout)
+
+        self._breaker = circuit_breaker
+
+        self._conditional = conditional
+
+        self._validators = _ValidatorStore()
+
+        self._owns_session = session is None
+
+        if session is None:
+
+            self._auth = None
+
+            self._session = self._build_session(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                pool_block=pool_block
+            )
+
+        else:
+
+            self._auth = {"Authorization": self._headers["Authorization"]}
+
+            self._session = self._adopt_session(session)
+
+    def _build_session(self, pool_connections: int, pool_maxsize: int, pool_block: bool) -> None:
+
+        # Importing requests is the bulk of the import time of this package, so
+        # only the pool options are kept here and the session is opened on first use.
+        self._pool_options = (pool_connections, pool_maxsize, pool_block)
+
+        self._session_lock = threading.Lock()
+
+        return None
+
+    def _requests(self):
+
+        import requests
+
+        self._transport_errors = (requests.ConnectionError, requests.Timeout)
+
+        self._timeout_error = requests.Timeout
+
+        return requests
+
+    def _adopt_session(self, session):
+
+        self._requests()
+
+        return session
+
+    def _get_session(self) -> "requests.Session":
+
+        if self._session is None:
+
+            with self._session_lock:
+
+                if self._session is None:
+
+                    self._requests()
+
+                    self._session = _pooled_session(*self._pool_options, self._headers)
+
+        return self._session
+
+    def close(self) -> None:
+        """
+        Closes the underlying session and every pooled connection, unless the
+        session is shared.
+        """
+
+        if self._owns_session and self._session is not None:
+
+            self._session.close()
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+
+        self.close()
+
     @staticmethod
-    def _validate_response(res: Response):
+    def _resource_path(path: str) -> str:
+
+        head, _, tail = path.rpartition("/")
+
+        return head if tail in _ACTION_SEGMENTS else path
+
+    def _cache_path(self, path: str) -> str:
+
+        return self._cache_namespace + " " + self._resource_path(path)
+
+    def _cache_key(self, path: str, params: dict = None) -> str:
+
+        return self._cache_namespace + " get " + path + ("?" + urlencode(sorted(params.items())) if params else "")
+
+    def _cache_store(self, key: str, path: str, data) -> None:
+
+        ttl = self._cache_ttl
+
+        if isinstance(ttl, dict):
+
+            ttl = ttl.get(path.split("/")[1], ttl.get("default", 60))
+
+        if ttl > 0:
+
+            self._cache.set(key, self._cache_path(path), data, ttl)
+
+    def _cache_invalidate(self, method: str, path: str) -> None:
+
+        if self._cache is not None and method != "get":
+
+            self._cache.invalidate(self._cache_path(path))
+
+    @staticmethod
+    def _raise_for_error(status: int, body: bytes, headers: Mapping = None) -> None:
+
+        if status in (200, 202, 304):
+
+            return
+
+        if status == 404:
+
+            raise HyperAPIException("Not found", status)
+
+        try:
+
+            error = _loads(body)["error"]["message"]
+
+        except (ValueError, KeyError, TypeError):
+
+            error = f"Hyper API responded with status {status}"
+
+        if status == 429:
+
+            raise HyperRateLimitException(error, status, _retry_after(headers or {}))
+
+        raise HyperAPIException(error, status)
+
+    @staticmethod
+    def _validate_response(res: "requests.Response"):
+
+        Core._raise_for_error(res.status_code, res.content, res.headers)
+
+    def _before_request(self, method: str, path: str, params: dict) -> RequestInfo:
+
+        info = RequestInfo(method, _endpoint(method, path), path, params, time.time_ns())
+
+        for instrument in self._instruments:
+
+            instrument.before_request(info)
+
+        return info
+
+    def _after_response(
+        self,
+        info: RequestInfo,
+        status: int,
+        bytes_in: int,
+        bytes_out: int,
+        started: float,
+        headers_time: float,
+        received: float,
+        error: Exception = None
+    ) -> None:
+
+        done = time.perf_counter()
+
+        response = ResponseInfo(
+            status,
+            bytes_in,
+            bytes_out,
+            headers_time,
+            max(0.0, received - started - headers_time),
+            done - received,
+            done - started
+        )
+
+        for instrument in self._instruments:
+
+            instrument.after_response(info, response)
+
+            if error is not None:
+
+                instrument.on_error(info, error, response.total_time)
+
+    def _on_transport_error(self, info: RequestInfo, error: Exception, started: float) -> None:
+
+        for instrument in self._instruments:
+
+            instrument.on_error(info, error, time.perf_counter() - started)
+
+    def _on_retry(self, method: str, path: str, params: dict, attempt: int, delay: float, error: Exception) -> None:
+
+        info = RequestInfo(method, _endpoint(method, path), path, params, time.time_ns())
+
+        for instrument in self._instruments:
+
+            instrument.on_retry(info, attempt, delay, error)
+
+    def _decode(self, method: str, path: str, body: bytes):
+
+        if not self._instruments:
+
+            return _loads(body)
+
+        started = time.perf_counter()
 
-        if res.status_code == 404:
+        data = _loads(body)
 
-            raise HyperAPIException("Not found")
+        elapsed = time.perf_counter() - started
 
-        elif res.status_code not in (200, 202):
+        endpoint = _endpoint(method, path)
 
-            error = res.json()["error"]["message"]
+        for instrument in self._instruments:
 
-            raise HyperAPIException(error)
+            instrument.on_decode(endpoint, len(body), elapsed)
 
-    def _call(self, method: str, path: str, params: dict = None, json: dict = None) -> Response:
+        return data
 
-        url = Core._base_url + path
+    def _request_timeout(self, timeout: Timeout, deadline: float) -> tuple:
 
-        res = requests.request(method=method, url=url, headers=self._headers, params=params, json=json)
+        remaining = _remaining(deadline)
 
-        self._validate_response(res)
+        if remaining is not None and remaining <= 0:
+
+            raise self._timeout_error(f"Total timeout of {timeout.total}s exceeded")
+
+        return _bound(timeout.connect, remaining), _bound(timeout.read, remaining)
+
+    def _send(self, method: str, path: str, params: dict, json: dict, headers: dict, timeout: Timeout, deadline: float) -> "requests.Response":
+
+        if self._breaker is None:
+
+            return self._attempt(method, path, params, json, headers, timeout, deadline)
+
+        circuit, trial = self._breaker._enter(path)
+
+        try:
+
+            res = self._attempt(method, path, params, json, headers, timeout, deadline)
+
+        except Exception as e:
+
+            self._breaker._exit(circuit, trial, e, self._transport_errors)
+
+            raise
+
+        self._breaker._exit(circuit, trial, None, self._transport_errors)
 
         return res
 
+    def _attempt(self, method: str, path: str, params: dict, json: dict, headers: dict, timeout: Timeout, deadline: float) -> "requests.Response":
+
+        url = self._base_url + path
+
+        session = self._get_session()
+
+        data = _encode(json)
+
+        info = self._before_request(method, path, params) if self._instruments else None
+
+        if self._limiter is not None:
+
+            self._limiter.acquire()
+
+        request_timeout = self._request_timeout(timeout, deadline)
+
+        if self._auth is not None:
+
+            headers = {**self._auth, **headers} if headers else self._auth
+
+        started = time.perf_counter()
+
+        try:
+
+            res = session.request(method=method, url=url, params=params, data=data, headers=headers, timeout=request_timeout)
+
+        except Exception as e:
+
+            if info is not None:
+
+                self._on_transport_error(info, e, started)
+
+            raise
+
+        finally:
+
+            self._cache_invalidate(method, path)
+
+        if self._limiter is not None:
+
+            self._limiter.update(res.status_code, res.headers)
+
+        if info is None:
+
+            self._validate_response(res)
+
+            return res
+
+        received = time.perf_counter()
+
+        error = None
+
+        try:
+
+            self._validate_response(res)
+
+        except HyperAPIException as e:
+
+            error = e
+
+            raise
+
+        finally:
+
+            self._after_response(
+                info,
+                res.status_code,
+                len(res.content),
+                len(data or b""),
+                started,
+                res.elapsed.total_seconds(),
+                received,
+                error
+            )
+
+        return res
+
+    def _call(self, method: str, path: str, params: dict = None, json: dict = None, headers: dict = None) -> "requests.Response":
+
+        timeout = _resolve(self._timeout)
+
+        deadline = _deadline(timeout)
+
+        if self._retry is None:
+
+            return self._send(method, path, params, json, headers, timeout, deadline)
+
+        self._retry._started()
+
+        started = time.monotonic()
+
+        attempt = 1
+
+        while True:
+
+            try:
+
+                return self._send(method, path, params, json, headers, timeout, deadline)
+
+            except Exception as e:
+
+                delay = self._retry._next_delay(method, headers, e, attempt, started, self._transport_errors)
+
+                if delay is None or (deadline is not None and time.monotonic() + delay >= deadline):
+
+                    raise
+
+                if self._instruments:
+
+                    self._on_retry(method, path, params, attempt, delay, e)
+
+            time.sleep(delay)
+
+            attempt += 1
+
+    def _call_json(
+        self,
+        method: str,
+        path: str,
+        params: dict = None,
+        json: dict = None,
+        headers: dict = None,
+        cached: bool = False
+    ) -> dict:
+
+        cached = cached and self._cache is not None
+
+        coalesced = self._inflight is not None and method == "get"
+
+        if not cached and not coalesced:
+
+            return self._fetch_json(method, path, params, json, headers)
+
+        key = self._cache_key(path, params)
+
+        if cached:
+
+            data = self._cache.get(key)
+
+            if data is not None:
+
+                return data
+
+        if coalesced:
+
+            return self._inflight.do(key, self._load_json, method, path, params, json, headers, cached)
+
+        return self._load_json(method, path, params, json, headers, cached)
+
+    def _stale(self, path: str, params: dict, cached: bool):
+
+        # Last cached response of a call refused by an open circuit, or None.
+        if not cached or not self._breaker.fallback:
+
+            return None
+
+        return self._cache.get_stale(self._cache_key(path, params))
+
+    def _load_json(self, method: str, path: str, params: dict, json: dict, headers: dict, cached: bool) -> dict:
+
+        try:
+
+            data = self._fetch_json(method, path, params, json, headers)
+
+        except CircuitOpenException:
+
+            data = self._stale(path, params, cached)
+
+            if data is None:
+
+                raise
+
+            return data
+
+        if cached:
+
+            self._cache_store(self._cache_key(path, params), path, data)
+
+        return data
+
+    def _fetch_json(self, method: str, path: str, params: dict, json: dict, headers: dict) -> dict:
+
+        if self._conditional and method == "get":
+
+            return self._poll_json(path, params, headers).data
+
+        return self._decode(method, path, self._call(method=method, path=path, params=params, json=json, headers=headers).content)
+
+    def _poll_json(
+        self,
+        path: str,
+        params: dict = None,
+        headers: dict = None,
+        validators: _ValidatorStore = None,
+        transform: Callable = None
+    ) -> Poll:
+
+        # `validators` and `transform` let a poller keep its own validators and store
+        # a reduced form of each decoded body, e.g. `watch` keeping fingerprints.
+        validators = self._validators if validators is None else validators
+
+        key = self._cache_key(path, params)
+
+        entry = validators.get(key)
+
+        res = self._call(method="get", path=path, params=params, headers=validators.headers(entry, headers))
+
+        def decode(body: bytes):
+
+            data = self._decode("get", path, body)
+
+            return data if transform is None else transform(data)
+
+        return validators.resolve(key, entry, res.status_code, res.headers, res.content, decode)
+
+    def _call_text(self, method: str, path: str, params: dict = None, json: dict = None, headers: dict = None) -> str:
+
+        return self._call(method=method, path=path, params=params, json=json, headers=headers).text
 
     # ---- LICENSES CORE ------------------------------------------------------------------------------- #
     
-    def _create_license_request(self, payload: dict) -> dict:
+    def _create_license_request(self, payload: dict, idempotency_key: str = None) -> dict:
 
         path = "/licenses"
 
-        return self._call(method="post", path=path, json=payload).json()
+        headers = {"Idempotency-Key": idempotency_key} if idempotency_key else None
+
+        return self._call_json(method="post", path=path, json=payload, headers=headers)
 
     def _retrieve_license_request(self, license_key: str) -> dict:
 
         path = "/licenses/" + license_key
 
-        return self._call(method="get", path=path).json()
+        return self._call_json(method="get", path=path, cached=True)
     
     def _update_license_request(self, license_key: str, payload: dict) -> dict:
 
         path = "/licenses/" + license_key
 
-        return self._call(method="patch", path=path, json=payload).json()
+        return self._call_json(method="patch", path=path, json=payload)
 
     def _update_license_metadata_request(self, license_key: str, metadata: dict) -> dict:
 
         path = f"/licenses/{license_key}/metadata"
 
-        return self._call(method="patch", path=path, json=metadata).json()
+        return self._call_json(method="patch", path=path, json=metadata)
 
     def _delete_license_request(self, license_key: str) -> str:
 
         path = "/licenses/" + license_key
 
-        return self._call(method="delete", path=path).text
+        return self._call_text(method="delete", path=path)
 
     def _list_licenses_request(self, params: dict) -> dict:
 
         path = "/licenses"
 
-        return self._call(method="get", path=path, params=params).json()
+        return self._call_json(method="get", path=path, params=params)
 
     # ---- PRODUCTS CORE ------------------------------------------------------------------------------- #
     
-    def _create_product_request(self, payload: dict) -> dict:
+    def _create_product_request(self, payload: dict, idempotency_key: str = None) -> dict:
 
         path = "/products"
 
-        return self._call(method="post", path=path, json=payload).json()
+        headers = {"Idempotency-Key": idempotency_key} if idempotency_key else None
+
+        return self._call_json(method="post", path=path, json=payload, headers=headers)
 
     def _retrieve_product_request(self, product_id: str) -> dict:
         
         path = "/products/" + product_id
         
-        return self._call("get", path=path).json()
+        return self._call_json(method="get", path=path, cached=True)
     
     def _update_product_request(self, product_id: str, payload: dict) -> dict:
         
         path = "/products/" + product_id
         
-        return self._call(method="patch", path=path, json=payload).json()
+        return self._call_json(method="patch", path=path, json=payload)
     
-    def _list_products_request(self) -> dict:
+    def _list_products_request(self, params: dict = None) -> dict:
         
         path = "/products"
         
-        return self._call(method="get", path=path).json()
+        return self._call_json(method="get", path=path, params=params)
 
     # ---- LINKS CORE ---------------------------------------------------------------------------------- #
     
-    def _create_link_request(self, payload: dict) -> dict:
+    def _create_link_request(self, payload: dict, idempotency_key: str = None) -> dict:
         
         path = "/links"
         
-        return self._call(method="post", path=path, json=payload).json()
+        headers = {"Idempotency-Key": idempotency_key} if idempotency_key else None
+
+        return self._call_json(method="post", path=path, json=payload, headers=headers)
     
     def _retrieve_link_request(self, link: str) -> dict:
         
         path = "/links/" + link
         
-        return self._call(method="get", path=path).json() 
+        return self._call_json(method="get", path=path, cached=True) 
     
     def _update_link_request(self, link: str, payload: dict) -> dict:
         
         path = "/links/" + link
         
-        return self._call(method="patch", path=path, json=payload).json()
+        return self._call_json(method="patch", path=path, json=payload)
     
-    def _list_links_request(self) -> dict:
+    def _list_links_request(self, params: dict = None) -> dict:
         
         path = "/links"
         
-        return self._call(method="get", path=path).json()
+        return self._call_json(method="get", path=path, params=params)
 
     # ---- RAFFLES CORE -------------------------------------------------------------------------------- #
     
-    def _create_raffle_request(self, payload: dict) -> dict:
+    def _create_raffle_request(self, payload: dict, idempotency_key: str = None) -> dict:
         
         path = "/raffles"
         
-        return self._call(method="post", path=path, json=payload).json()
+        headers = {"Idempotency-Key": idempotency_key} if idempotency_key else None
+
+        return self._call_json(method="post", path=path, json=payload, headers=headers)
     
     def _retrieve_raffle_request(self, raffle_id: str) -> dict:
         
         path = "/raffles/" + raffle_id
         
-        return self._call(method="get", path=path).json()
+        return self._call_json(method="get", path=path)
     
     def _list_raffles_request(self, params: dict) -> dict:
         
         path = "/raffles"
         
-        return self._call(method="get", path=path, params=params).json()
+        return self._call_json(method="get", path=path, params=params)
 
     # ---- WAITLIST CORE ------------------------------------------------------------------------------- #
     
@@ -157,13 +744,13 @@ class Core:
         
         path = "/waitlist/entries/" + entry_id
         
-        return self._call(method="get", path=path).json()
+        return self._call_json(method="get", path=path)
     
-    def _list_waitlist_entries_request(self) -> dict:
+    def _list_waitlist_entries_request(self, params: dict = None) -> dict:
         
         path = "/waitlist/entries"
         
-        return self._call(method="get", path=path).json()
+        return self._call_json(method="get", path=path, params=params)
 
     # ---- PAYMENTS CORE ------------------------------------------------------------------------------- #
     
@@ -171,36 +758,40 @@ class Core:
         
         path = "/payments/" + payment_id
         
-        return self._call(method="get", path=path).json()
+        return self._call_json(method="get", path=path)
     
-    def _refund_payment_request(self, payment: str) -> dict:
+    def _refund_payment_request(self, payment: str, idempotency_key: str = None) -> dict:
         
         path = f"/payments/{payment}/refund"
+
+        headers = {"Idempotency-Key": idempotency_key} if idempotency_key else None
         
-        return self._call(method="post", path=path).text
+        return self._call_text(method="post", path=path, headers=headers)
     
-    def _list_payments_request(self) -> dict:
+    def _list_payments_request(self, params: dict = None) -> dict:
         
         path = "/payments"
         
-        return self._call(method="get", path=path).json()
+        return self._call_json(method="get", path=path, params=params)
     
     # ---- COUPONS CORE -------------------------------------------------------------------------------- #
     
-    def _create_coupon_request(self, payload: dict) -> dict:
+    def _create_coupon_request(self, payload: dict, idempotency_key: str = None) -> dict:
         
         path = "/coupons"
         
-        return self._call(method="post", path=path, json=payload).json()
+        headers = {"Idempotency-Key": idempotency_key} if idempotency_key else None
+
+        return self._call_json(method="post", path=path, json=payload, headers=headers)
     
     def _retrieve_coupon_request(self, coupon_id: str) -> dict:
         
         path = "/coupons/" + coupon_id
         
-        return self._call(method="get", path=path).json()
+        return self._call_json(method="get", path=path, cached=True)
     
     def _list_coupons_request(self, params: dict) -> dict:
         
         path = "/coupons"
         
-        return self._call(method="get", path=path, params=params).json()    
\ No newline at end of file
+        return self._call_json(method="get", path=path, params=params)    
\ No newline at end of file
@@ -0,0 +1,358 @@
+import math
+import threading
+import time
+from typing import Callable, NamedTuple
+
+
+class RequestInfo(NamedTuple):
+
+    method: str
+    endpoint: str
+    path: str
+    params: dict
+    started_ns: int
+
+
+class ResponseInfo(NamedTuple):
+
+    status: int
+    bytes_in: int
+    bytes_out: int
+    headers_time: float
+    body_time: float
+    validate_time: float
+    total_time: float
+
+
+def _endpoint(method: str, path: str) -> str:
+
+    # "/licenses/KEY/metadata" -> "PATCH /licenses/{id}/metadata"
+    parts = path.split("/")[1:]
+
+    size = 2 if parts[0] == "waitlist" else 1
+
+    if len(parts) > size:
+
+        parts[size] = "{id}"
+
+    return method.upper() + " /" + "/".join(parts)
+
+
+class Instrument:
+
+    """
+    Base class of the objects `Core` reports its requests to. Every method is a
+    no-op, so subclasses only implement the events they need.
+    """
+
+    def before_request(self, info: RequestInfo) -> None:
+
+        pass
+
+    def after_response(self, info: RequestInfo, response: ResponseInfo) -> None:
+
+        pass
+
+    def on_error(self, info: RequestInfo, error: Exception, elapsed: float) -> None:
+
+        pass
+
+    def on_retry(self, info: RequestInfo, attempt: int, delay: float, error: Exception) -> None:
+
+        pass
+
+    def on_decode(self, endpoint: str, size: int, elapsed: float) -> None:
+
+        pass
+
+
+class Hooks(Instrument):
+
+    _events = ("before_request", "after_response", "on_error", "on_retry", "on_decode")
+
+    def __init__(self) -> None:
+        """
+        Dispatches request events to registered callbacks, which receive the same
+        arguments as the matching `Instrument` method.
+        """
+
+        self._callbacks = {event: [] for event in self._events}
+
+    def on(self, event: str, callback: Callable) -> Callable:
+        """
+        Registers a callback for one of before_request, after_response, on_error,
+        on_retry or on_decode, and returns it.
+        """
+
+        if event not in self._callbacks:
+
+            raise ValueError(f"Unknown hook event {event!r}, expected one of {', '.join(self._events)}")
+
+        self._callbacks[event].append(callback)
+
+        return callback
+
+    def before_request(self, info: RequestInfo) -> None:
+
+        for callback in self._callbacks["before_request"]:
+
+            callback(info)
+
+    def after_response(self, info: RequestInfo, response: ResponseInfo) -> None:
+
+        for callback in self._callbacks["after_response"]:
+
+            callback(info, response)
+
+    def on_error(self, info: RequestInfo, error: Exception, elapsed: float) -> None:
+
+        for callback in self._callbacks["on_error"]:
+
+            callback(info, error, elapsed)
+
+    def on_retry(self, info: RequestInfo, attempt: int, delay: float, error: Exception) -> None:
+
+        for callback in self._callbacks["on_retry"]:
+
+            callback(info, attempt, delay, error)
+
+    def on_decode(self, endpoint: str, size: int, elapsed: float) -> None:
+
+        for callback in self._callbacks["on_decode"]:
+
+            callback(endpoint, size, elapsed)
+
+
+class _Histogram:
+
+    # Log-spaced buckets growing by 2^(1/4) (~19%) from 100us.
+    _base = 1e-4
+
+    _growth = math.log(2) / 4
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+
+        self.counts = {}
+
+        self.count = 0
+
+        self.total = 0.0
+
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+
+        bucket = max(0, math.ceil(math.log(max(value, self._base) / self._base) / self._growth))
+
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+
+        self.count += 1
+
+        self.total += value
+
+        self.max = max(self.max, value)
+
+    def percentile(self, pct: float) -> float:
+
+        if not self.count:
+
+            return 0.0
+
+        rank = pct * self.count
+
+        seen = 0
+
+        for bucket in sorted(self.counts):
+
+            seen += self.counts[bucket]
+
+            if seen >= rank:
+
+                return min(self.max, self._base * math.exp(bucket * self._growth))
+
+        return self.max
+
+
+class _EndpointMetrics:
+
+    __slots__ = ("latency", "decode", "statuses", "errors", "retries", "bytes_in", "bytes_out")
+
+    def __init__(self) -> None:
+
+        self.latency = _Histogram()
+
+        self.decode = _Histogram()
+
+        self.statuses = {}
+
+        self.errors = 0
+
+        self.retries = 0
+
+        self.bytes_in = 0
+
+        self.bytes_out = 0
+
+
+class Metrics(Instrument):
+
+    def __init__(self) -> None:
+        """
+        Built-in per-endpoint metrics: latency and JSON decode histograms,
+        status code, error and retry counters and bytes transferred.
+        """
+
+        self._lock = threading.Lock()
+
+        self._endpoints = {}
+
+    def _get(self, endpoint: str) -> _EndpointMetrics:
+
+        metrics = self._endpoints.get(endpoint)
+
+        if metrics is None:
+
+            metrics = self._endpoints[endpoint] = _EndpointMetrics()
+
+        return metrics
+
+    def after_response(self, info: RequestInfo, response: ResponseInfo) -> None:
+
+        with self._lock:
+
+            metrics = self._get(info.endpoint)
+
+            metrics.latency.add(response.total_time)
+
+            metrics.statuses[response.status] = metrics.statuses.get(response.status, 0) + 1
+
+            metrics.bytes_in += response.bytes_in
+
+            metrics.bytes_out += response.bytes_out
+
+    def on_error(self, info: RequestInfo, error: Exception, elapsed: float) -> None:
+
+        with self._lock:
+
+            self._get(info.endpoint).errors += 1
+
+    def on_retry(self, info: RequestInfo, attempt: int, delay: float, error: Exception) -> None:
+
+        with self._lock:
+
+            self._get(info.endpoint).retries += 1
+
+    def on_decode(self, endpoint: str, size: int, elapsed: float) -> None:
+
+        with self._lock:
+
+            self._get(endpoint).decode.add(elapsed)
+
+    def summary(self) -> list:
+        """
+        Returns one dict per endpoint, slowest p99 first.
+        """
+
+        with self._lock:
+
+            rows = [
+                {
+                    "endpoint": endpoint,
+                    "calls": metrics.latency.count,
+                    "errors": metrics.errors,
+                    "retries": metrics.retries,
+                    "p50": metrics.latency.percentile(0.50),
+                    "p99": metrics.latency.percentile(0.99),
+                    "max": metrics.latency.max,
+                    "mean": metrics.latency.total / metrics.latency.count if metrics.latency.count else 0.0,
+                    "decode_p50": metrics.decode.percentile(0.50),
+                    "statuses": dict(metrics.statuses),
+                    "bytes_in": metrics.bytes_in,
+                    "bytes_out": metrics.bytes_out,
+                }
+                for endpoint, metrics in self._endpoints.items()
+            ]
+
+        return sorted(rows, key=lambda row: row["p99"], reverse=True)
+
+    def report(self, top: int = 10) -> str:
+        """
+        Renders the `top` slowest endpoints as a text table.
+        """
+
+        lines = [f"{'endpoint':<34} {'calls':>7} {'errors':>6} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'decode ms':>9} {'KiB in':>9}"]
+
+        for row in self.summary()[:top]:
+
+            lines.append(
+                f"{row['endpoint']:<34} {row['calls']:>7} {row['errors']:>6} {row['p50'] * 1e3:>8.2f} "
+                f"{row['p99'] * 1e3:>8.2f} {row['max'] * 1e3:>8.2f} {row['decode_p50'] * 1e3:>9.3f} "
+                f"{row['bytes_in'] / 1024:>9.1f}"
+            )
+
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+
+        with self._lock:
+
+            self._endpoints.clear()
+
+
+class OpenTelemetrySpans(Instrument):
+
+    def __init__(self, tracer=None) -> None:
+        """
+        Emits one OpenTelemetry client span per request. Requires opentelemetry-api.
+
+        Args:
+            tracer: the tracer to use. Defaults to the global tracer provider's.
+        """
+
+        from opentelemetry import trace
+
+        self._trace = trace
+
+        self._tracer = tracer or trace.get_tracer("hyper.client")
+
+    def _span(self, info: RequestInfo, attributes: dict, error: Exception = None) -> None:
+
+        # Paths hold license keys, which are secrets: spans only carry the templated
+        # endpoint, and the path is redacted from exception messages, e.g. urls.
+        template = info.endpoint.partition(" ")[2]
+
+        span = self._tracer.start_span(
+            info.endpoint,
+            kind=self._trace.SpanKind.CLIENT,
+            start_time=info.started_ns,
+            attributes={"http.request.method": info.method.upper(), "url.template": template, **attributes}
+        )
+
+        if error is not None:
+
+            import traceback
+
+            message = str(error).replace(info.path, template)
+
+            span.record_exception(error, attributes={
+                "exception.message": message,
+                "exception.stacktrace": "".join(traceback.format_exception(error)).replace(info.path, template),
+            })
+
+            span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, message))
+
+        span.end(end_time=time.time_ns())
+
+    def after_response(self, info: RequestInfo, response: ResponseInfo) -> None:
+
+        if response.status < 400:
+
+            self._span(info, {"http.response.status_code": response.status, "http.response.body.size": response.bytes_in})
+
+    def on_error(self, info: RequestInfo, error: Exception, elapsed: float) -> None:
+
+        status = getattr(error, "status_code", None)
+
+        self._span(info, {"http.response.status_code": status} if status else {}, error)
@@ -0,0 +1,312 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, Mapping
+from .async_client import AsyncClient
+from .bulk import AsyncBulkRun, BulkRun
+from .client import Client
+from .core import _pooled_session
+from .ratelimit import RateLimiter
+
+# Options bound to a single business or owned by the pool, never shared between tenants.
+_UNSHARED = ("session", "rate_limiter", "verdict_cache")
+
+
+class ClientPool:
+
+    _client_class = Client
+
+    _bulk = BulkRun
+
+    def __init__(
+        self,
+        api_keys: Mapping[str, str] = None,
+        rate: float = None,
+        burst: int = None,
+        max_clients: int = 256,
+        workers: int = 16,
+        pool_connections: int = 4,
+        pool_maxsize: int = 64,
+        pool_block: bool = False,
+        **options
+    ) -> None:
+        """
+        Clients of many Hyper businesses sharing one connection pool and one
+        thread pool, e.g. for a dashboard managing dozens of API keys.
+
+        Every tenant's calls go through the same session, each one carrying its
+        own API key. A tenant's client is created on first use and kept in a
+        bounded LRU: an evicted client costs nothing and is rebuilt on demand,
+        while its rate limit budget survives in the process-wide limiter of its key.
+
+        Args:
+            api_keys: tenant names mapped to their API key. Defaults to none.
+            rate: requests per second allowed per API key. Defaults to no limit.
+            burst: requests a key may burst above `rate`. Defaults to `rate`.
+            max_clients: tenant clients kept alive at once. Defaults to 256.
+            workers: threads shared by the `map` fan-outs. Defaults to 16.
+            pool_connections: number of per-host connection pools to keep. Defaults to 4.
+            pool_maxsize: maximum number of connections kept alive per host, across
+                every tenant. Defaults to 64.
+            pool_block: whether or not to block when every connection is busy. Defaults to False.
+            options: options forwarded to each tenant's client, the same objects being
+                shared by every tenant. `cache` (entries are namespaced per API key),
+                `cache_ttl`, `coalesce`, `retry`, `instruments`, `timeout`,
+                `circuit_breaker` and `conditional` are safe to share. `session` and
+                `rate_limiter` are provided by the pool and `verdict_cache` is per
+                machine, so they are refused.
+
+        Raises:
+            ValueError: when given an option that cannot be shared between tenants.
+        """
+
+        unshared = [option for option in _UNSHARED if option in options]
+
+        if unshared:
+
+            raise ValueError(f"ClientPool cannot share {', '.join(unshared)} between tenants")
+
+        self._keys = dict(api_keys or {})
+
+        self.rate = rate
+
+        self.burst = burst
+
+        self.max_clients = max_clients
+
+        self.workers = workers
+
+        self._options = options
+
+        self._clients = OrderedDict()
+
+        self._lock = threading.Lock()
+
+        self._session = self._build_session(pool_connections, pool_maxsize, pool_block)
+
+        self._executor = None
+
+    def _build_session(self, pool_connections: int, pool_maxsize: int, pool_block: bool):
+
+        return _pooled_session(pool_connections, pool_maxsize, pool_block, {
+            "accept": "application/json",
+            "content-type": "application/json",
+        })
+
+    @property
+    def tenants(self) -> list:
+        """
+        The names of every registered tenant.
+        """
+
+        return list(self._keys)
+
+    def add(self, tenant: str, api_key: str) -> None:
+        """
+        Registers a tenant, replacing its previous API key if any.
+
+        Args:
+            tenant: the tenant name.
+            api_key: the business API key.
+        """
+
+        with self._lock:
+
+            self._keys[tenant] = api_key
+
+            self._clients.pop(tenant, None)
+
+    def remove(self, tenant: str) -> None:
+        """
+        Unregisters a tenant and drops its client.
+
+        Args:
+            tenant: the tenant name.
+        """
+
+        with self._lock:
+
+            self._keys.pop(tenant, None)
+
+            self._clients.pop(tenant, None)
+
+    def _limiter(self, api_key: str) -> RateLimiter:
+
+        if self.rate is None:
+
+            return None
+
+        # Registered under a digest so the raw key is not kept as a registry key.
+        digest = hashlib.sha256(api_key.encode()).hexdigest()[:32]
+
+        return RateLimiter.shared("hyper-pool:" + digest, rate=self.rate, burst=self.burst)
+
+    def client(self, tenant: str) -> Client:
+        """
+        The client of a tenant, sharing this pool's connections.
+
+        Args:
+            tenant: the tenant name.
+
+        Returns:
+            The tenant's client. It must not be closed.
+        """
+
+        with self._lock:
+
+            client = self._clients.get(tenant)
+
+            if client is not None:
+
+                self._clients.move_to_end(tenant)
+
+                return client
+
+            api_key = self._keys[tenant]
+
+            client = self._client_class(api_key, session=self._session, rate_limiter=self._limiter(api_key), **self._options)
+
+            self._clients[tenant] = client
+
+            while len(self._clients) > self.max_clients:
+
+                self._clients.popitem(last=False)
+
+            return client
+
+    def __getitem__(self, tenant: str) -> Client:
+
+        return self.client(tenant)
+
+    def __contains__(self, tenant: str) -> bool:
+
+        return tenant in self._keys
+
+    def __len__(self) -> int:
+
+        return len(self._keys)
+
+    def _shared_executor(self) -> ThreadPoolExecutor:
+
+        with self._lock:
+
+            if self._executor is None:
+
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="hyper-pool")
+
+            return self._executor
+
+    def map(self, fn: Callable[[Client], object], tenants: Iterable[str] = None, concurrency: int = None) -> Iterator:
+        """
+        Runs `fn(client)` for many tenants concurrently on the shared thread pool,
+        e.g. `pool.map(lambda client: client.list_payments(limit=100))`.
+
+        Args:
+            fn: the operation, called with each tenant's client.
+            tenants: the tenants to run it for. Defaults to every tenant.
+            concurrency: calls in flight at once. Defaults to the pool's `workers`.
+
+        Returns:
+            A `BulkRun` yielding a `BulkResult` per tenant as it completes, whose
+            `item` is the tenant name. A failing tenant is reported in its result.
+        """
+
+        tenants = list(self._keys) if tenants is None else list(tenants)
+
+        return self._bulk(lambda tenant: fn(self.client(tenant)), tenants, concurrency or self.workers, self._shared_executor())
+
+    def close(self) -> None:
+        """
+        Closes the shared session and thread pool.
+        """
+
+        with self._lock:
+
+            self._clients.clear()
+
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+
+            executor.shutdown(wait=False)
+
+        self._session.close()
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+
+        self.close()
+
+
+class AsyncClientPool(ClientPool):
+
+    _client_class = AsyncClient
+
+    _bulk = AsyncBulkRun
+
+    __enter__ = None
+
+    def __init__(self, api_keys: Mapping[str, str] = None, **options) -> None:
+        """
+        `ClientPool` of `AsyncClient`s sharing one aiohttp session on the running
+        event loop. `map` takes a coroutine function and returns an async
+        iterable, and `close` must be awaited. Clients must be requested from
+        within the event loop.
+
+        Args:
+            api_keys: tenant names mapped to their API key. Defaults to none.
+            options: the `ClientPool` options.
+        """
+
+        super().__init__(api_keys, **options)
+
+    def _build_session(self, pool_connections: int, pool_maxsize: int, pool_block: bool):
+
+        # aiohttp sessions must be created inside a running loop.
+        self._connector_limits = {
+            "limit": pool_connections * pool_maxsize,
+            "limit_per_host": pool_maxsize,
+        }
+
+        return None
+
+    def client(self, tenant: str) -> AsyncClient:
+
+        if self._session is None or self._session.closed:
+
+            import aiohttp
+
+            self._session = aiohttp.ClientSession(
+                headers={"accept": "application/json", "content-type": "application/json"},
+                connector=aiohttp.TCPConnector(**self._connector_limits)
+            )
+
+            self._clients.clear()
+
+        return super().client(tenant)
+
+    def _shared_executor(self) -> None:
+
+        return None
+
+    async def close(self) -> None:
+
+        self._clients.clear()
+
+        if self._session is not None:
+
+            await self._session.close()
+
+            self._session = None
+
+    async def __aenter__(self):
+
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+
+        await self.close()
@@ -0,0 +1,181 @@
+import threading
+import time
+from typing import Mapping
+
+
+def _header(headers: Mapping, *names: str) -> float:
+
+    for name in names:
+
+        value = headers.get(name)
+
+        if value is not None:
+
+            try:
+
+                return float(value)
+
+            except ValueError:
+
+                pass
+
+    return None
+
+
+def _retry_after(headers: Mapping) -> float:
+
+    value = headers.get("Retry-After")
+
+    if value is None:
+
+        return None
+
+    try:
+
+        return max(0.0, float(value))
+
+    except ValueError:
+
+        pass
+
+    from email.utils import parsedate_to_datetime
+
+    try:
+
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+
+    except (TypeError, ValueError):
+
+        return None
+
+
+class RateLimiter:
+
+    _shared = {}
+
+    _shared_lock = threading.Lock()
+
+    def __init__(self, rate: float = 10.0, burst: int = None) -> None:
+        """
+        Thread- and task-safe token bucket that adapts to the API rate limit.
+
+        The rate starts at `rate` requests per second and is lowered to spread the
+        remaining quota reported by `X-RateLimit-Remaining`/`X-RateLimit-Reset`
+        over the current window. Calls wait out `Retry-After` after a 429. Once
+        the API stops pushing back, the rate climbs back towards `rate`.
+
+        Args:
+            rate: ceiling in requests per second. Defaults to 10.
+            burst: bucket size, how many calls may go out back to back. Defaults to `rate`.
+        """
+
+        self.max_rate = rate
+
+        self.rate = rate
+
+        self.burst = burst or max(1, int(rate))
+
+        self._tokens = float(self.burst)
+
+        self._updated = time.monotonic()
+
+        self._blocked_until = 0.0
+
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, key: str, rate: float = 10.0, burst: int = None) -> "RateLimiter":
+        """
+        Returns the process-wide limiter registered under `key`, creating it on
+        first use, so every client built with the same key shares one budget.
+        """
+
+        with cls._shared_lock:
+
+            limiter = cls._shared.get(key)
+
+            if limiter is None:
+
+                limiter = cls._shared[key] = cls(rate=rate, burst=burst)
+
+            return limiter
+
+    def reserve(self) -> float:
+        """
+        Takes a token and returns how many seconds the caller must wait before
+        sending its request.
+        """
+
+        with self._lock:
+
+            now = time.monotonic()
+
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+
+            self._updated = now
+
+            self._tokens -= 1
+
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+            return max(wait, self._blocked_until - now)
+
+    def acquire(self) -> None:
+
+        wait = self.reserve()
+
+        if wait > 0:
+
+            time.sleep(wait)
+
+    async def aacquire(self) -> None:
+
+        import asyncio
+
+        wait = self.reserve()
+
+        if wait > 0:
+
+            await asyncio.sleep(wait)
+
+    def update(self, status: int, headers: Mapping) -> None:
+        """
+        Adapts the rate from a response's status and rate limit headers.
+        """
+
+        remaining = _header(headers, "X-RateLimit-Remaining", "RateLimit-Remaining")
+
+        reset = _header(headers, "X-RateLimit-Reset", "RateLimit-Reset")
+
+        with self._lock:
+
+            now = time.monotonic()
+
+            if status == 429:
+
+                retry_after = _retry_after(headers)
+
+                self._blocked_until = max(self._blocked_until, now + (retry_after if retry_after is not None else 1.0))
+
+                self.rate = max(self.max_rate / 64, self.rate / 2)
+
+                self._tokens = min(self._tokens, 0.0)
+
+                return
+
+            if remaining is not None and reset is not None:
+
+                # Reset is either an epoch timestamp or seconds until the window resets.
+                window = reset - time.time() if reset > 1e9 else reset
+
+                if remaining <= 0:
+
+                    self._blocked_until = max(self._blocked_until, now + max(window, 0.0))
+
+                else:
+
+                    self.rate = min(self.max_rate, max(self.max_rate / 64, remaining / max(window, 0.1)))
+
+                return
+
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
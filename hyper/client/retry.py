@@ -0,0 +1,126 @@
+import random
+import threading
+import time
+from typing import NamedTuple
+from ..exceptions import HyperAPIException, HyperRateLimitException
+
+
+class RetryStats(NamedTuple):
+
+    calls: int
+    retries: int
+    exhausted: int
+    backoff_time: float
+
+
+class RetryPolicy:
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        jitter: bool = True,
+        deadline: float = None,
+        statuses: tuple = (429, 500, 502, 503, 504),
+        methods: tuple = ("get", "patch", "delete")
+    ) -> None:
+        """
+        Retry policy for transient failures: connection errors, timeouts and the
+        given response statuses.
+
+        Calls using one of `methods` are retried freely. Any other call, such as a
+        POST, is only retried when it carries an `Idempotency-Key` header. Waits
+        grow exponentially from `backoff`, with full jitter, and a 429's
+        `Retry-After` is honoured.
+
+        Args:
+            max_attempts: total attempts per call, including the first one. Defaults to 3.
+            backoff: base wait in seconds before the first retry. Defaults to 0.5.
+            max_backoff: cap of a single wait in seconds. Defaults to 30.
+            jitter: whether or not to randomize each wait between 0 and its cap. Defaults to True.
+            deadline: overall seconds budget of a call across attempts and waits. Defaults to none.
+            statuses: response statuses worth retrying. Defaults to 429 and 5xx gateway errors.
+            methods: idempotent methods retried without an idempotency key.
+        """
+
+        self.max_attempts = max_attempts
+
+        self.backoff = backoff
+
+        self.max_backoff = max_backoff
+
+        self.jitter = jitter
+
+        self.deadline = deadline
+
+        self.statuses = frozenset(statuses)
+
+        self.methods = frozenset(methods)
+
+        self._lock = threading.Lock()
+
+        self._calls = self._retries = self._exhausted = 0
+
+        self._backoff_time = 0.0
+
+    @property
+    def stats(self) -> RetryStats:
+        """
+        Counters of every call made under this policy so far.
+        """
+
+        with self._lock:
+
+            return RetryStats(self._calls, self._retries, self._exhausted, self._backoff_time)
+
+    def _retryable(self, method: str, headers: dict, error: Exception, transport_errors: tuple) -> bool:
+
+        if method not in self.methods and not (headers and "Idempotency-Key" in headers):
+
+            return False
+
+        if isinstance(error, HyperAPIException):
+
+            return error.status_code in self.statuses
+
+        return isinstance(error, transport_errors)
+
+    def _started(self) -> None:
+
+        with self._lock:
+
+            self._calls += 1
+
+    def _next_delay(self, method: str, headers: dict, error: Exception, attempt: int, started: float, transport_errors: tuple) -> float:
+
+        # Returns the seconds to wait before the next attempt, or None to give up.
+        if not self._retryable(method, headers, error, transport_errors):
+
+            return None
+
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+
+        if self.jitter:
+
+            delay = random.uniform(0, delay)
+
+        if isinstance(error, HyperRateLimitException) and error.retry_after is not None:
+
+            delay = max(delay, error.retry_after)
+
+        out_of_time = self.deadline is not None and time.monotonic() - started + delay > self.deadline
+
+        with self._lock:
+
+            if attempt >= self.max_attempts or out_of_time:
+
+                self._exhausted += 1
+
+                return None
+
+            self._retries += 1
+
+            self._backoff_time += delay
+
+        return delay
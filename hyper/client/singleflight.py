@@ -0,0 +1,111 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Callable
+
+
+class SingleFlight:
+
+    """
+    Coalesces concurrent calls sharing a key into one execution.
+
+    The first caller of a key runs the function; callers arriving while it is
+    in flight wait for it and receive the same result object, or the same
+    exception. Works for threads (`do`) and for coroutines on any event loop
+    (`ado`).
+    """
+
+    def __init__(self) -> None:
+
+        self._lock = threading.Lock()
+
+        self._calls = {}
+
+    def do(self, key: str, fn: Callable, *args):
+
+        with self._lock:
+
+            future = self._calls.get(key)
+
+            leader = future is None
+
+            if leader:
+
+                future = self._calls[key] = Future()
+
+        if not leader:
+
+            return future.result()
+
+        try:
+
+            result = fn(*args)
+
+        except BaseException as e:
+
+            future.set_exception(e)
+
+            raise
+
+        else:
+
+            future.set_result(result)
+
+            return result
+
+        finally:
+
+            with self._lock:
+
+                del self._calls[key]
+
+    async def ado(self, key: str, fn: Callable, *args):
+
+        loop = asyncio.get_running_loop()
+
+        flight = (id(loop), key)
+
+        with self._lock:
+
+            future = self._calls.get(flight)
+
+            leader = future is None
+
+            if leader:
+
+                future = self._calls[flight] = loop.create_future()
+
+        if not leader:
+
+            return await asyncio.shield(future)
+
+        try:
+
+            result = await fn(*args)
+
+        except asyncio.CancelledError:
+
+            future.cancel()
+
+            raise
+
+        except BaseException as e:
+
+            future.set_exception(e)
+
+            # Mark the exception retrieved so lone leaders don't log warnings.
+            future.exception()
+
+            raise
+
+        else:
+
+            future.set_result(result)
+
+            return result
+
+        finally:
+
+            with self._lock:
+
+                del self._calls[flight]
@@ -0,0 +1,87 @@
+import contextlib
+import time
+from contextvars import ContextVar
+from typing import Iterator, NamedTuple
+
+
+class Timeout(NamedTuple):
+
+    """
+    Timeouts of a call, in seconds. `connect` bounds opening a connection and
+    `read` bounds every wait on the socket, per attempt. `total` bounds the whole
+    call, retries and backoff included. None leaves a phase unbounded.
+    """
+
+    connect: float = None
+    read: float = None
+    total: float = None
+
+    def _merge(self, other: "Timeout") -> "Timeout":
+
+        if other is None:
+
+            return self
+
+        return Timeout(
+            other.connect if other.connect is not None else self.connect,
+            other.read if other.read is not None else self.read,
+            other.total if other.total is not None else self.total
+        )
+
+
+_override: ContextVar = ContextVar("hyper_timeout", default=None)
+
+
+@contextlib.contextmanager
+def timeout(connect: float = None, read: float = None, total: float = None) -> Iterator[Timeout]:
+    """
+    Overrides the client timeouts of every call made inside the block, in this
+    thread or task only. Phases left as None keep the client's setting, and
+    nested blocks override their parent.
+
+    Args:
+        connect: seconds to open a connection.
+        read: seconds to wait on each socket read.
+        total: seconds for the whole call, retries included.
+
+    Returns:
+        The timeouts in effect inside the block.
+    """
+
+    current = _override.get()
+
+    effective = (current or Timeout())._merge(Timeout(connect, read, total))
+
+    token = _override.set(effective)
+
+    try:
+
+        yield effective
+
+    finally:
+
+        _override.reset(token)
+
+
+def _resolve(default: Timeout) -> Timeout:
+
+    return default._merge(_override.get())
+
+
+def _deadline(timeout: Timeout) -> float:
+
+    return time.monotonic() + timeout.total if timeout.total is not None else None
+
+
+def _remaining(deadline: float) -> float:
+
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def _bound(value: float, remaining: float) -> float:
+
+    if remaining is None:
+
+        return value
+
+    return remaining if value is None else min(value, remaining)
@@ -0,0 +1,400 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import NamedTuple
+from ..exceptions import HyperAPIException, LicenseBindException
+from .client import Client
+
+
+class ValidatorStats(NamedTuple):
+
+    requests: int
+    cache_hits: int
+    deduplicated: int
+    batches: int
+    fetches: int
+    binds: int
+    conflicts: int
+
+
+class _Hot(NamedTuple):
+
+    license: dict
+    expires: float
+
+
+def _bound_hwid(license: dict) -> str:
+
+    return (license.get("metadata") or {}).get("hwid")
+
+
+def _unbound(license: dict) -> bool:
+
+    return not license.get("metadata")
+
+
+class LicenseValidator:
+
+    def __init__(
+        self,
+        client: Client,
+        max_batch: int = 128,
+        max_delay: float = 0.005,
+        workers: int = 16,
+        cache_ttl: float = 30,
+        cache_size: int = 100_000
+    ) -> None:
+        """
+        Authorizes licenses for many machines at high rate, e.g. a launcher backend
+        checking every end-user start, with the hardware id auth of `Client.authorize`.
+
+        Checks are answered from a hot cache of recently read licenses when possible.
+        The others are queued and dispatched in micro-batches: a batch leaves once
+        `max_batch` distinct licenses are waiting or `max_delay` has passed since the
+        first one, and every check of the same license, queued or in flight, shares
+        one API read.
+
+        Binding the hardware id of a first launch is a compare-and-set: the update
+        is sent with `If-Match` on the ETag of the license read, and the license is
+        read again afterwards, so a check only succeeds when the bound hardware id
+        read back is its own. Parallel first launches in this process are bound
+        once; across processes the write is atomic when the API honours `If-Match`.
+        A license read without an ETag is never bound, as two processes could
+        each write and read back their own hardware id: its checks fail with
+        `LicenseBindException` until it is bound by other means.
+
+        Args:
+            client: the client used to read and bind licenses.
+            max_batch: distinct licenses dispatched at once. Defaults to 128.
+            max_delay: seconds a check may wait for its batch to fill. Defaults to 5ms.
+            workers: API calls in flight at once. Defaults to 16.
+            cache_ttl: seconds a read license is trusted. Defaults to 30.
+            cache_size: licenses kept in the hot cache. Defaults to 100,000.
+        """
+
+        self.client = client
+
+        self.max_batch = max_batch
+
+        self.max_delay = max_delay
+
+        self.cache_ttl = cache_ttl
+
+        self.cache_size = cache_size
+
+        self._workers = workers
+
+        self._hot = OrderedDict()
+
+        # Waiting checks by license key, from the moment a key is queued until its
+        # read resolves them, so later checks of a key join the pending read.
+        self._waiters = {}
+
+        self._queued = []
+
+        self._lock = threading.Lock()
+
+        self._ready = threading.Condition(self._lock)
+
+        self._executor = None
+
+        self._dispatcher = None
+
+        self._closed = False
+
+        self._requests = 0
+        self._cache_hits = 0
+        self._deduplicated = 0
+        self._batches = 0
+        self._fetches = 0
+        self._binds = 0
+        self._conflicts = 0
+
+    @property
+    def stats(self) -> ValidatorStats:
+        """
+        Counters of every check so far.
+        """
+
+        with self._lock:
+
+            return ValidatorStats(
+                self._requests,
+                self._cache_hits,
+                self._deduplicated,
+                self._batches,
+                self._fetches,
+                self._binds,
+                self._conflicts
+            )
+
+    def authorize(self, license_key: str, hardware_id: str, timeout: float = None) -> bool:
+        """
+        Authorizes a license for a machine, binding it on first use.
+
+        Args:
+            license_key: the license key to auth.
+            hardware_id: the hardware id of the machine.
+            timeout: seconds to wait for the verdict. Defaults to waiting until done.
+
+        Returns:
+            A boolean to indicate whether or not the license is bound to this machine.
+        """
+
+        return self.submit(license_key, hardware_id).result(timeout)
+
+    def submit(self, license_key: str, hardware_id: str) -> Future:
+        """
+        Queues a check without waiting for it.
+
+        Args:
+            license_key: the license key to auth.
+            hardware_id: the hardware id of the machine.
+
+        Returns:
+            A future of the `authorize` verdict, failing with the API error if the
+            license could not be read or bound.
+        """
+
+        future = Future()
+
+        with self._lock:
+
+            if self._closed:
+
+                raise RuntimeError("LicenseValidator is closed")
+
+            self._requests += 1
+
+            hot = self._hot_license(license_key)
+
+            if hot is not None:
+
+                self._cache_hits += 1
+
+                future.set_result(_bound_hwid(hot) == hardware_id)
+
+                return future
+
+            waiters = self._waiters.get(license_key)
+
+            if waiters is not None:
+
+                self._deduplicated += 1
+
+                waiters.append((hardware_id, future))
+
+                return future
+
+            self._waiters[license_key] = [(hardware_id, future)]
+
+            self._queued.append(license_key)
+
+            self._start()
+
+            self._ready.notify()
+
+        return future
+
+    def invalidate(self, license_key: str = None) -> None:
+        """
+        Drops a license from the hot cache, e.g. from a `license.updated` webhook.
+
+        Args:
+            license_key: the license key. Defaults to every license.
+        """
+
+        with self._lock:
+
+            if license_key is None:
+
+                self._hot.clear()
+
+            else:
+
+                self._hot.pop(license_key, None)
+
+    def _hot_license(self, license_key: str) -> dict:
+
+        # Unbound licenses are left to a batch, which binds them.
+        entry = self._hot.get(license_key)
+
+        if entry is None or entry.expires < time.monotonic() or _unbound(entry.license):
+
+            return None
+
+        self._hot.move_to_end(license_key)
+
+        return entry.license
+
+    def _remember(self, license_key: str, license: dict) -> None:
+
+        with self._lock:
+
+            self._hot[license_key] = _Hot(license, time.monotonic() + self.cache_ttl)
+
+            self._hot.move_to_end(license_key)
+
+            while len(self._hot) > self.cache_size:
+
+                self._hot.popitem(last=False)
+
+    def _start(self) -> None:
+
+        if self._dispatcher is None:
+
+            self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="hyper-validator")
+
+            self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+            self._dispatcher.start()
+
+    def _next_batch(self) -> list:
+
+        with self._lock:
+
+            while not self._queued and not self._closed:
+
+                self._ready.wait()
+
+            if not self._queued:
+
+                return None
+
+            # The first check waits at most `max_delay` for others to share its batch.
+            flush_at = time.monotonic() + self.max_delay
+
+            while len(self._queued) < self.max_batch and not self._closed:
+
+                remaining = flush_at - time.monotonic()
+
+                if remaining <= 0:
+
+                    break
+
+                self._ready.wait(remaining)
+
+            batch, self._queued = self._queued[:self.max_batch], self._queued[self.max_batch:]
+
+            self._batches += 1
+
+            return batch
+
+    def _dispatch(self) -> None:
+
+        while True:
+
+            batch = self._next_batch()
+
+            if batch is None:
+
+                return
+
+            for license_key in batch:
+
+                self._executor.submit(self._resolve, license_key)
+
+    def _fetch(self, license_key: str) -> tuple:
+
+        path = "/licenses/" + license_key
+
+        res = self.client._call(method="get", path=path)
+
+        with self._lock:
+
+            self._fetches += 1
+
+        return self.client._decode("get", path, res.content), res.headers.get("ETag")
+
+    def _bind(self, license_key: str, etag: str, hardware_id: str) -> tuple:
+
+        if not etag:
+
+            # Without a validator the write cannot be a compare-and-set, so it fails closed.
+            raise LicenseBindException("Cannot bind the license safely: the API sent no ETag to bind it with")
+
+        try:
+
+            self.client._call(method="patch", path="/licenses/" + license_key, json={"metadata": {"hwid": hardware_id}}, headers={"If-Match": etag})
+
+            with self._lock:
+
+                self._binds += 1
+
+        except HyperAPIException as e:
+
+            if e.status_code != 412:
+
+                raise
+
+            # Bound by someone else since the read: the re-read tells by whom.
+            with self._lock:
+
+                self._conflicts += 1
+
+        # Read back rather than trusting the write, as an API ignoring If-Match lets
+        # a concurrent first launch overwrite it.
+        return self._fetch(license_key)
+
+    def _resolve(self, license_key: str) -> None:
+
+        try:
+
+            license, etag = self._fetch(license_key)
+
+            if _unbound(license):
+
+                with self._lock:
+
+                    hardware_id = self._waiters[license_key][0][0]
+
+                license, etag = self._bind(license_key, etag, hardware_id)
+
+            self._remember(license_key, license)
+
+            error = None
+
+        except Exception as e:
+
+            error = e
+
+        with self._lock:
+
+            waiters = self._waiters.pop(license_key)
+
+        for hardware_id, future in waiters:
+
+            if error is not None:
+
+                future.set_exception(error)
+
+            else:
+
+                future.set_result(_bound_hwid(license) == hardware_id)
+
+    def close(self) -> None:
+        """
+        Resolves the queued checks, then stops the dispatcher.
+        """
+
+        with self._lock:
+
+            self._closed = True
+
+            self._ready.notify_all()
+
+            dispatcher, executor = self._dispatcher, self._executor
+
+        if dispatcher is not None:
+
+            dispatcher.join()
+
+            executor.shutdown(wait=True)
+
+    def __enter__(self) -> "LicenseValidator":
+
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+
+        self.close()
@@ -0,0 +1,233 @@
+import contextlib
+import hashlib
+import hmac
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import NamedTuple
+from ..utils.helpers import _hardware_id
+
+
+class Verdict(NamedTuple):
+
+    hwid: str
+    verified_at: float
+    expires_at: float
+
+
+@contextlib.contextmanager
+def _file_lock(filename: str):
+
+    # Serializes the read-modify-write of the verdicts file between processes.
+    try:
+
+        f = open(filename, "a+b")
+
+    except OSError:
+
+        # Nothing can be written next to a read-only file either.
+        yield
+
+        return
+
+    with f:
+
+        if os.name == "nt":
+
+            import msvcrt
+
+            f.seek(0)
+
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+            try:
+
+                yield
+
+            finally:
+
+                f.seek(0)
+
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+        else:
+
+            import fcntl
+
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+            try:
+
+                yield
+
+            finally:
+
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class VerdictCache:
+
+    def __init__(self, filename: str, secret: bytes = None) -> None:
+        """
+        Persistent store of successful `authorize` verdicts, kept in a small
+        HMAC-signed JSON file. License keys are only stored hashed, and a file
+        that fails its integrity check is ignored as if it were empty.
+
+        The file is read again whenever another process has replaced it, and
+        updates are merged into its latest contents under a lock file, so that
+        concurrent launches keep each other's verdicts. A file that cannot be
+        written leaves the verdicts of this process in memory only.
+
+        Args:
+            filename: the verdicts file.
+            secret: the signing key. Defaults to a key derived from this machine's
+                hardware id, so a verdicts file copied to another machine is rejected.
+        """
+
+        self.filename = filename
+
+        self._secret = secret or hashlib.sha256(b"hyper-verdict:" + _hardware_id().encode()).digest()
+
+        self._lock = threading.Lock()
+
+        self._verdicts = None
+
+        self._loaded = None
+
+    @staticmethod
+    def _slot(license_key: str) -> str:
+
+        return hashlib.sha256(license_key.encode()).hexdigest()[:32]
+
+    def _sign(self, body: bytes) -> str:
+
+        return hmac.new(self._secret, body, hashlib.sha256).hexdigest()
+
+    @staticmethod
+    def _version(stat: os.stat_result) -> tuple:
+
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def _load(self) -> dict:
+
+        try:
+
+            version = self._version(os.stat(self.filename))
+
+        except OSError:
+
+            version = None
+
+        if self._verdicts is not None and version == self._loaded:
+
+            return self._verdicts
+
+        self._verdicts = {}
+
+        self._loaded = version
+
+        try:
+
+            with open(self.filename, "rb") as f:
+
+                signature, _, body = f.read().partition(b"\n")
+
+        except OSError:
+
+            return self._verdicts
+
+        if hmac.compare_digest(signature.decode(errors="replace"), self._sign(body)):
+
+            try:
+
+                self._verdicts = {slot: Verdict(*value) for slot, value in json.loads(body).items()}
+
+            except (ValueError, TypeError):
+
+                pass
+
+        return self._verdicts
+
+    def _save(self) -> None:
+
+        body = json.dumps(self._verdicts, separators=(",", ":")).encode()
+
+        directory = os.path.dirname(os.path.abspath(self.filename))
+
+        try:
+
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix=".verdicts-")
+
+        except OSError:
+
+            return
+
+        try:
+
+            with os.fdopen(fd, "wb") as f:
+
+                f.write(self._sign(body).encode() + b"\n" + body)
+
+            os.replace(tmp, self.filename)
+
+        except BaseException as e:
+
+            os.unlink(tmp)
+
+            if not isinstance(e, OSError):
+
+                raise
+
+            return
+
+        self._loaded = self._version(os.stat(self.filename))
+
+    def _update(self, slot: str, verdict: Verdict) -> None:
+
+        with self._lock, _file_lock(self.filename + ".lock"):
+
+            verdicts = self._load()
+
+            if verdict is not None:
+
+                verdicts[slot] = verdict
+
+            elif verdicts.pop(slot, None) is None:
+
+                return
+
+            self._save()
+
+    def get(self, license_key: str, hwid: str) -> Verdict:
+        """
+        Returns the stored verdict of a license for the given hardware id, or
+        None if there is none or it has expired.
+        """
+
+        with self._lock:
+
+            verdict = self._load().get(self._slot(license_key))
+
+        if verdict is None or verdict.hwid != hwid or verdict.expires_at < time.time():
+
+            return None
+
+        return verdict
+
+    def put(self, license_key: str, hwid: str, ttl: float) -> None:
+        """
+        Records a successful verdict valid for `ttl` seconds.
+        """
+
+        now = time.time()
+
+        self._update(self._slot(license_key), Verdict(hwid, now, now + ttl))
+
+    def discard(self, license_key: str) -> None:
+        """
+        Drops the stored verdict of a license, if any.
+        """
+
+        self._update(self._slot(license_key), None)
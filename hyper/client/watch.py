@@ -0,0 +1,251 @@
+import hashlib
+import time
+from typing import AsyncIterator, Iterator, NamedTuple
+from ..exceptions import CircuitOpenException, HyperAPIException
+from ..utils.codec import _dumps
+from ..utils.pagination import _has_next_page, _page_items
+from .conditional import _ValidatorStore
+
+
+class ChangeEvent(NamedTuple):
+
+    """
+    A change seen by `Client.watch`. `item` is the current item, or None for a
+    deleted one, of which only the id is known.
+    """
+
+    type: str
+    id: str
+    item: dict
+
+
+def _item_id(item: dict) -> str:
+
+    return item.get("id") or item.get("key")
+
+
+def _fingerprint(item: dict) -> bytes:
+
+    return hashlib.blake2b(_dumps(item), digest_size=8).digest()
+
+
+class _Snapshot:
+
+    def __init__(self) -> None:
+
+        # Pages are polled through validators of this watch's own, so no other poller
+        # of the same pages can consume their changes, and each page is remembered
+        # as its (id, fingerprint) pairs instead of its items. Items are only held
+        # for the current cycle, from the pages that changed.
+        self.validators = _ValidatorStore()
+
+        self.fingerprints = None
+
+        self.items = {}
+
+    def compact(self, data: dict) -> dict:
+
+        items = _page_items(data)
+
+        self.items.update((_item_id(item), item) for item in items)
+
+        return {**data, "data": [(_item_id(item), _fingerprint(item)) for item in items]}
+
+    def diff(self, pages: list, initial: bool) -> list:
+
+        # Returns the events, or None when an item to report sits on a page polled
+        # as unchanged, whose items are not held: the pages are then polled in full.
+        current = {}
+
+        for entries in pages:
+
+            current.update(entries)
+
+        previous = self.fingerprints
+
+        if previous is None:
+
+            changed = [("created", id) for id in current] if initial else []
+
+        else:
+
+            changed = [
+                ("created" if id not in previous else "updated", id)
+                for id, fingerprint in current.items()
+                if previous.get(id) != fingerprint
+            ]
+
+        items, self.items = self.items, {}
+
+        if any(id not in items for _, id in changed):
+
+            self.validators = _ValidatorStore()
+
+            return None
+
+        events = [ChangeEvent(type, id, items[id]) for type, id in changed]
+
+        if previous is not None:
+
+            events.extend(ChangeEvent("deleted", id, None) for id in previous.keys() - current.keys())
+
+        self.fingerprints = current
+
+        return events
+
+
+class _Interval:
+
+    def __init__(self, interval: float, min_interval: float, max_interval: float) -> None:
+
+        self.min_interval = min_interval
+
+        self.max_interval = max_interval
+
+        self.current = min(max(interval, min_interval), max_interval)
+
+    def next(self, changed: bool) -> float:
+
+        # Polls faster while changes keep coming and backs off while idle.
+        factor = 0.5 if changed else 1.5
+
+        self.current = min(max(self.current * factor, self.min_interval), self.max_interval)
+
+        return self.current
+
+
+def _transient(client, error: Exception) -> bool:
+
+    if isinstance(error, CircuitOpenException):
+
+        return True
+
+    if isinstance(error, HyperAPIException):
+
+        return error.status_code == 429 or (error.status_code or 0) >= 500
+
+    return isinstance(error, client._transport_errors)
+
+
+def _watch(
+    client,
+    resource: str,
+    interval: float,
+    min_interval: float,
+    max_interval: float,
+    limit: int,
+    initial: bool,
+    filters: dict
+) -> Iterator[ChangeEvent]:
+
+    snapshot = _Snapshot()
+
+    pacing = _Interval(interval, min_interval, max_interval)
+
+    while True:
+
+        started = time.monotonic()
+
+        try:
+
+            pages = []
+
+            page = 1
+
+            while True:
+
+                path, params = client._list_target(resource, page, limit, filters)
+
+                res = client._poll_json(path, params, validators=snapshot.validators, transform=snapshot.compact)
+
+                pages.append(_page_items(res.data))
+
+                if not _page_items(res.data) or not _has_next_page(res.data, page, limit):
+
+                    break
+
+                page += 1
+
+        except Exception as e:
+
+            if not _transient(client, e):
+
+                raise
+
+            time.sleep(pacing.next(False))
+
+            continue
+
+        events = snapshot.diff(pages, initial)
+
+        if events is None:
+
+            continue
+
+        yield from events
+
+        time.sleep(max(0.0, pacing.next(bool(events)) - (time.monotonic() - started)))
+
+
+async def _awatch(
+    client,
+    resource: str,
+    interval: float,
+    min_interval: float,
+    max_interval: float,
+    limit: int,
+    initial: bool,
+    filters: dict
+) -> AsyncIterator[ChangeEvent]:
+
+    import asyncio
+
+    snapshot = _Snapshot()
+
+    pacing = _Interval(interval, min_interval, max_interval)
+
+    while True:
+
+        started = time.monotonic()
+
+        try:
+
+            pages = []
+
+            page = 1
+
+            while True:
+
+                path, params = client._list_target(resource, page, limit, filters)
+
+                res = await client._poll_json(path, params, validators=snapshot.validators, transform=snapshot.compact)
+
+                pages.append(_page_items(res.data))
+
+                if not _page_items(res.data) or not _has_next_page(res.data, page, limit):
+
+                    break
+
+                page += 1
+
+        except Exception as e:
+
+            if not _transient(client, e):
+
+                raise
+
+            await asyncio.sleep(pacing.next(False))
+
+            continue
+
+        events = snapshot.diff(pages, initial)
+
+        if events is None:
+
+            continue
+
+        for event in events:
+
+            yield event
+
+        await asyncio.sleep(max(0.0, pacing.next(bool(events)) - (time.monotonic() - started)))
@@ -1,6 +1,6 @@
-from .utils.helpers import _clear_payload
 from enum import StrEnum
 from typing import NamedTuple
+from .utils.schema import _encoder, _enum, _field, _schema
 
 
 class CouponDuration(StrEnum):
@@ -21,17 +21,15 @@ class CreateCouponParams(NamedTuple):
     duration: CouponDuration = None
     max_redemptions: int = None
 
-    def _build_payload(self) -> dict:
-
-        payload = {
-            "active": self.active,
-            "duration": self.duration.value,
-            "name": self.code,
-            "product": self.product_id,
-            "amount_off": self.amount_off,
-            "percent_off": self.percent_off,
-            "currency": self.currency,
-            "max_redemptions": self.max_redemptions
-        }
-
-        return _clear_payload(payload=payload)
+    _build_payload = _schema(
+        _field("active"),
+        _field("duration", convert=_enum),
+        _field("name", "code"),
+        _field("product", "product_id"),
+        _field("amount_off"),
+        _field("percent_off"),
+        _field("currency"),
+        _field("max_redemptions"),
+    )
+
+    _encode_payload = _encoder(_build_payload)
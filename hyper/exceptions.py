@@ -1,4 +1,44 @@
 
 class HyperAPIException(Exception):
     
-    """Base Exception for error messages returned by the Hyper API"""
\ No newline at end of file
+    """Base Exception for error messages returned by the Hyper API"""
+
+    def __init__(self, message: str, status_code: int = None) -> None:
+
+        super().__init__(message)
+
+        self.status_code = status_code
+
+
+class HyperRateLimitException(HyperAPIException):
+
+    """Exception raised when the Hyper API rejects a call for exceeding its rate limit"""
+
+    def __init__(self, message: str, status_code: int = 429, retry_after: float = None) -> None:
+
+        super().__init__(message, status_code)
+
+        self.retry_after = retry_after
+
+
+class CircuitOpenException(HyperAPIException):
+
+    """Exception raised without calling the Hyper API while the circuit of an endpoint group is open"""
+
+    def __init__(self, message: str, group: str = None, retry_after: float = None) -> None:
+
+        super().__init__(message)
+
+        self.group = group
+
+        self.retry_after = retry_after
+
+
+class LicenseBindException(HyperAPIException):
+
+    """Exception raised instead of binding a license when a concurrent bind could not be ruled out"""
+
+
+class WebhookSignatureException(Exception):
+
+    """Exception raised when a webhook delivery fails its signature verification"""
@@ -0,0 +1,442 @@
+import csv
+import io
+import json
+import os
+import time
+from typing import NamedTuple
+from .utils.codec import _dumps
+from .utils.pagination import _iter_pages, _page_items
+
+
+_RESOURCES = ("licenses", "products", "links", "raffles", "waitlist_entries", "payments", "coupons")
+
+_FORMATS = {".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv", ".parquet": "parquet"}
+
+
+class ExportStats(NamedTuple):
+
+    pages: int
+    rows: int
+    resumed_from: int
+    elapsed: float
+
+
+def _flat(value):
+
+    return _dumps(value).decode() if isinstance(value, (dict, list)) else value
+
+
+def _text(value):
+
+    return value if value is None or isinstance(value, str) else _dumps(value).decode()
+
+
+def _union(fields: list, items: list) -> list:
+
+    # Fields in order of first appearance, as optional ones only show up on some records.
+    fields = list(fields or ())
+
+    seen = set(fields)
+
+    for item in items:
+
+        for key in item:
+
+            if key not in seen:
+
+                seen.add(key)
+
+                fields.append(key)
+
+    return fields
+
+
+class _JSONLWriter:
+
+    def __init__(self, filename: str, offset: int, fields: list) -> None:
+
+        self.fields = fields
+
+        self._filename = filename
+
+        self._file = open(filename, "r+b" if offset else "wb")
+
+        self._file.truncate(offset)
+        self._file.seek(offset)
+
+    def write(self, items: list) -> None:
+
+        self._file.write(b"".join(_dumps(item) + b"\n" for item in items))
+
+    def commit(self) -> int:
+
+        self._file.flush()
+
+        os.fsync(self._file.fileno())
+
+        return self._file.tell()
+
+    def close(self) -> None:
+
+        self._file.close()
+
+
+class _CSVWriter(_JSONLWriter):
+
+    def write(self, items: list) -> None:
+
+        if not items:
+
+            return
+
+        fields = _union(self.fields, items)
+
+        buffer = io.StringIO()
+
+        writer = csv.writer(buffer)
+
+        if self.fields is None:
+
+            writer.writerow(fields)
+
+        elif len(fields) > len(self.fields):
+
+            self._widen(fields)
+
+        self.fields = fields
+
+        writer.writerows([_flat(item.get(field)) for field in self.fields] for item in items)
+
+        self._file.write(buffer.getvalue().encode())
+
+    def _widen(self, fields: list) -> None:
+
+        # The header is rewritten with the new columns, and the rows written so far
+        # are padded with empty cells for them.
+        self._file.close()
+
+        padding = [""] * (len(fields) - len(self.fields))
+
+        with open(self._filename, "r", encoding="utf-8", newline="") as src, \
+                open(self._filename + ".tmp", "w", encoding="utf-8", newline="") as dst:
+
+            rows = csv.reader(src)
+
+            writer = csv.writer(dst)
+
+            next(rows)
+
+            writer.writerow(fields)
+
+            writer.writerows(row + padding for row in rows)
+
+        os.replace(self._filename + ".tmp", self._filename)
+
+        self._file = open(self._filename, "r+b")
+
+        self._file.seek(0, os.SEEK_END)
+
+
+class _ParquetWriter:
+
+    def __init__(self, directory: str, offset: int, fields: list) -> None:
+
+        try:
+
+            import pyarrow
+            import pyarrow.parquet
+
+        except ImportError as e:
+
+            raise ImportError("Parquet export requires pyarrow: pip install pyarrow") from e
+
+        self._pa = pyarrow
+
+        self._pq = pyarrow.parquet
+
+        self._directory = directory
+
+        self._part = offset
+
+        self._schema = None
+
+        self.fields = fields
+
+        os.makedirs(directory, exist_ok=True)
+
+        # Parts past the checkpoint belong to a crashed run and are rewritten.
+        for name in os.listdir(directory):
+
+            if name.startswith("part-") and int(name[5:13]) >= offset:
+
+                os.unlink(os.path.join(directory, name))
+
+        if offset:
+
+            # A crash while widening may leave parts of both schemas.
+            for part in range(offset):
+
+                self._schema = self._merge(self._pq.read_schema(self._path(part)))
+
+            self._conform()
+
+    def _path(self, part: int) -> str:
+
+        return os.path.join(self._directory, f"part-{part:08d}.parquet")
+
+    def _widest(self, stored, type):
+
+        # Columns stay null typed until a value shows up, and a column whose values
+        # change type is widened, e.g. int64 to double, or to their text otherwise.
+        pa = self._pa
+
+        if pa.types.is_null(type) or stored.equals(type):
+
+            return stored
+
+        if pa.types.is_null(stored):
+
+            return type
+
+        try:
+
+            return pa.unify_schemas(
+                [pa.schema([("value", stored)]), pa.schema([("value", type)])],
+                promote_options="permissive"
+            ).field("value").type
+
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+
+            return pa.string()
+
+    def _type(self, schema, name: str):
+
+        return schema.field(name).type if schema is not None and name in schema.names else self._pa.null()
+
+    def _merge(self, schema):
+
+        return self._pa.schema([
+            (name, self._widest(self._type(self._schema, name), self._type(schema, name)))
+            for name in self.fields
+        ])
+
+    def _cast(self, table):
+
+        return self._pa.table({
+            field.name: (
+                table.column(field.name).cast(field.type)
+                if field.name in table.column_names
+                else self._pa.nulls(table.num_rows, field.type)
+            )
+            for field in self._schema
+        })
+
+    def _conform(self) -> None:
+
+        # Every part shares the schema, as readers of the directory take the schema
+        # of its first part, so the parts written so far follow when it widens.
+        for part in range(self._part):
+
+            path = self._path(part)
+
+            table = self._pq.read_table(path)
+
+            if not table.schema.equals(self._schema):
+
+                self._pq.write_table(self._cast(table), path + ".tmp")
+
+                os.replace(path + ".tmp", path)
+
+    def _table(self, items: list):
+
+        pa = self._pa
+
+        columns = {}
+
+        for field in self.fields:
+
+            values = [_flat(item.get(field)) for item in items]
+
+            try:
+
+                columns[field] = pa.array(values)
+
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+
+                # Values of mixed types in one chunk are kept as their JSON text.
+                columns[field] = pa.array([_text(value) for value in values], pa.string())
+
+        return pa.table(columns)
+
+    def write(self, items: list) -> None:
+
+        if not items:
+
+            return
+
+        self.fields = _union(self.fields, items)
+
+        table = self._table(items)
+
+        schema = self._merge(table.schema)
+
+        if self._schema is None or not schema.equals(self._schema):
+
+            self._schema = schema
+
+            self._conform()
+
+        path = self._path(self._part)
+
+        self._pq.write_table(self._cast(table), path + ".tmp")
+
+        os.replace(path + ".tmp", path)
+
+        self._part += 1
+
+    def commit(self) -> int:
+
+        return self._part
+
+    def close(self) -> None:
+
+        pass
+
+
+_WRITERS = {"jsonl": _JSONLWriter, "csv": _CSVWriter, "parquet": _ParquetWriter}
+
+
+def export(
+    client,
+    resource: str,
+    filename: str,
+    format: str = None,
+    params: dict = None,
+    limit: int = 100,
+    prefetch: int = 0,
+    chunk_pages: int = 10,
+    resume: bool = True
+) -> ExportStats:
+    """
+    Streams every record of a list endpoint into a JSONL, CSV or Parquet
+    export in constant memory.
+
+    Records are written in chunks of `chunk_pages` pages. After each chunk a
+    checkpoint (`<filename>.checkpoint`) records the last completed page, so
+    an interrupted export resumes from there instead of starting over.
+    Parquet exports are written as a directory of part files, one per chunk,
+    and need pyarrow. CSV and Parquet store nested values as JSON strings.
+
+    Columns are the union of the fields of every record: a field first seen in
+    a later record adds a column to what was written so far. A Parquet column
+    whose values change type is widened, e.g. from int64 to double, or to
+    strings holding the values' JSON, and the parts written so far are
+    rewritten so that every part keeps the same schema.
+
+    Args:
+        client: the `Client` to read from.
+        resource: one of licenses, products, links, raffles, waitlist_entries,
+            payments or coupons.
+        filename: the output file, or directory for Parquet.
+        format: jsonl, csv or parquet. Defaults to the one matching the filename extension.
+        params: extra list params, e.g. {"active": "false"} for raffles and coupons.
+        limit: page size of each request. Defaults to 100.
+        prefetch: number of pages fetched concurrently. Defaults to 0.
+        chunk_pages: number of pages written between checkpoints. Defaults to 10.
+        resume: whether or not to resume from an existing checkpoint. Defaults to True.
+
+    Returns:
+        The export counters.
+
+    Raises:
+        ValueError: when resuming from a checkpoint of an export with another resource,
+            format, `limit` or `params`, as its page numbers would not line up.
+    """
+
+    if resource not in _RESOURCES:
+
+        raise ValueError(f"Unknown resource {resource!r}, expected one of {', '.join(_RESOURCES)}")
+
+    format = format or _FORMATS.get(os.path.splitext(filename)[1].lower())
+
+    if format not in _WRITERS:
+
+        raise ValueError(f"Unknown export format {format!r}, expected jsonl, csv or parquet")
+
+    checkpoint_file = filename + ".checkpoint"
+
+    # What the page numbers of a checkpoint depend on, normalized as stored in JSON.
+    job = json.loads(json.dumps({"resource": resource, "format": format, "limit": limit, "params": params or {}}))
+
+    checkpoint = {"page": 0, "offset": 0, "rows": 0, "fields": None}
+
+    if resume and os.path.exists(checkpoint_file):
+
+        with open(checkpoint_file, "r", encoding="utf-8") as f:
+
+            checkpoint = json.load(f)
+
+        if checkpoint.get("job") != job:
+
+            raise ValueError(
+                f"{checkpoint_file} belongs to an export of {checkpoint.get('job')}, not {job}: "
+                "resume it with the same arguments, or pass resume=False to start over"
+            )
+
+    def save_checkpoint(page: int, offset: int, rows: int, fields: list) -> None:
+
+        with open(checkpoint_file + ".tmp", "w", encoding="utf-8") as f:
+
+            json.dump({"job": job, "page": page, "offset": offset, "rows": rows, "fields": fields}, f)
+
+        os.replace(checkpoint_file + ".tmp", checkpoint_file)
+
+    started = time.perf_counter()
+
+    writer = _WRITERS[format](filename, checkpoint["offset"], checkpoint["fields"])
+
+    fetch = getattr(client, f"_list_{resource}_request")
+
+    pages = 0
+
+    rows = checkpoint["rows"]
+
+    chunk = []
+
+    last_page = checkpoint["page"]
+
+    try:
+
+        for number, res in _iter_pages(fetch, params=params, page=checkpoint["page"] + 1, limit=limit, prefetch=prefetch):
+
+            items = _page_items(res)
+
+            chunk.extend(items)
+
+            pages += 1
+
+            rows += len(items)
+
+            last_page = number
+
+            if pages % chunk_pages == 0:
+
+                writer.write(chunk)
+
+                chunk = []
+
+                save_checkpoint(last_page, writer.commit(), rows, writer.fields)
+
+        writer.write(chunk)
+
+        writer.commit()
+
+    finally:
+
+        writer.close()
+
+    if os.path.exists(checkpoint_file):
+
+        os.unlink(checkpoint_file)
+
+    return ExportStats(pages, rows, checkpoint["page"], time.perf_counter() - started)
@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import NamedTuple
-from .utils.helpers import _clear_payload
+from .utils.schema import _encoder, _field, _isoformat, _schema
 
 
 class LicenseSubscription(NamedTuple):
@@ -9,6 +9,12 @@ class LicenseSubscription(NamedTuple):
     current_period_end: datetime = None
     pause_collection: bool = None
 
+    _build_payload = _schema(
+        _field("cancel_at_period_end"),
+        _field("current_period_end", convert=_isoformat),
+        _field("pause_collection"),
+    )
+
 
 class CreateLicenseParams(NamedTuple):
 
@@ -17,16 +23,14 @@ class CreateLicenseParams(NamedTuple):
     key: str = None
     metadata: dict = None
 
-    def _build_payload(self) -> dict:
-
-        payload = {
-            "plan": self.product_id,
-            "email": self.email,
-            "key": self.key,
-            "metadata": self.metadata
-        }
+    _build_payload = _schema(
+        _field("plan", "product_id"),
+        _field("email"),
+        _field("key"),
+        _field("metadata"),
+    )
 
-        return _clear_payload(payload=payload)
+    _encode_payload = _encoder(_build_payload)
 
 
 class UpdateLicenseParams(NamedTuple):
@@ -37,17 +41,12 @@ class UpdateLicenseParams(NamedTuple):
     metadata: dict = None
     subscription: LicenseSubscription = None
 
-    def _build_payload(self) -> dict:
-
-        payload = {
-            "email": self.email,
-            "key": self.key,
-            "unlocked": self.unlocked,
-            "subscription": {
-                "cancel_at_period_end": self.subscription.cancel_at_period_end,
-                "current_period_end": self.subscription.current_period_end.isoformat(),
-                "pause_collection": self.subscription.pause_collection
-            } if self.subscription else None
-        }
+    _build_payload = _schema(
+        _field("email"),
+        _field("key"),
+        _field("unlocked"),
+        _field("metadata"),
+        _field("subscription", convert=LicenseSubscription._build_payload),
+    )
 
-        return _clear_payload(payload=payload)
+    _encode_payload = _encoder(_build_payload)
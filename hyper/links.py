@@ -1,6 +1,6 @@
-from .utils.helpers import _clear_payload
 from datetime import datetime
 from typing import NamedTuple
+from .utils.schema import _encoder, _field, _schema, _timestamp
 
 class CreateLinkParams(NamedTuple):
 
@@ -13,31 +13,27 @@ class CreateLinkParams(NamedTuple):
     start_date: datetime = None
     initial_fee_amount: float = None
 
-    def _build_payload(self) -> dict:
+    _build_payload = _schema(
+        _field("plan", "product_id"),
+        _field("password"),
+        _field("trial_period_days"),
+        _field("group_buy_guild"),
+        _field("enable_bot_protection"),
+        _field("max_usages"),
+        _field("start_date", convert=_timestamp),
+        _field("initial_fee_amount"),
+    )
 
-        payload = {
-            "plan": self.product_id,
-            "password": self.password,
-            "trial_period_days": self.trial_period_days,
-            "group_buy_guild": self.group_buy_guild,
-            "enable_bot_protection": self.enable_bot_protection,
-            "max_usages": self.max_usages,
-            "start_date": int(self.start_date.timestamp()),
-            "initial_fee_amount": self.initial_fee_amount
-        }
-        
-        return _clear_payload(payload=payload)
+    _encode_payload = _encoder(_build_payload)
 
 class UpdateLinkParams(NamedTuple):
     
     active: bool
     remaining_stock: int = None
     
-    def _build_payload(self) -> dict:
-        
-        payload = {
-            "active": self.active,
-            "remaining_stock": self.remaining_stock
-        }
-        
-        return _clear_payload(payload=payload)
\ No newline at end of file
+    _build_payload = _schema(
+        _field("active"),
+        _field("remaining_stock"),
+    )
+
+    _encode_payload = _encoder(_build_payload)
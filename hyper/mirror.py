@@ -0,0 +1,284 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import NamedTuple
+from .utils.codec import _dumps, _loads
+from .utils.pagination import _iter_pages, _page_items
+
+
+class SyncStats(NamedTuple):
+
+    pages: int
+    seen: int
+    written: int
+    deleted: int
+    elapsed: float
+
+
+def _plan_id(plan) -> str:
+
+    return plan.get("id") if isinstance(plan, dict) else plan
+
+
+def _updated_at(license: dict):
+
+    return license.get("updated") or license.get("updated_at")
+
+
+class LicenseMirror:
+
+    def __init__(self, client, filename: str = ":memory:", metadata_indexes: tuple = ("hwid",)) -> None:
+        """
+        Local SQLite mirror of a business' licenses with indexed lookups.
+
+        `sync` walks the licenses endpoint and only rewrites the rows whose
+        content changed. Lookups by key, email, plan and indexed metadata
+        fields are then answered from the local database.
+
+        Args:
+            client: the `Client` used to fetch the licenses.
+            filename: the SQLite database file. Defaults to an in-memory database.
+            metadata_indexes: metadata fields to index, e.g. "hwid". Defaults to ("hwid",).
+        """
+
+        self._client = client
+
+        self._lock = threading.Lock()
+
+        self._db = sqlite3.connect(filename, check_same_thread=False, isolation_level=None)
+
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS licenses ("
+            "key TEXT PRIMARY KEY, id TEXT, email TEXT COLLATE NOCASE, plan TEXT, status TEXT, "
+            "updated TEXT, fingerprint BLOB NOT NULL, generation INTEGER NOT NULL, data TEXT NOT NULL)"
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS state (name TEXT PRIMARY KEY, value TEXT)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS licenses_email ON licenses (email)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS licenses_plan ON licenses (plan)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS licenses_id ON licenses (id)")
+
+        for field in metadata_indexes:
+
+            if not field.isidentifier():
+
+                raise ValueError(f"Invalid metadata field name: {field!r}")
+
+            self._db.execute(
+                f"CREATE INDEX IF NOT EXISTS licenses_metadata_{field} "
+                f"ON licenses (json_extract(data, '$.metadata.{field}'))"
+            )
+
+    def _state(self, name: str) -> str:
+
+        row = self._db.execute("SELECT value FROM state WHERE name = ?", (name,)).fetchone()
+
+        return row[0] if row else None
+
+    def _set_state(self, name: str, value) -> None:
+
+        self._db.execute("INSERT OR REPLACE INTO state (name, value) VALUES (?, ?)", (name, str(value)))
+
+    @property
+    def watermark(self) -> str:
+        """
+        The most recent `updated` timestamp seen by a sync, if the API reports one.
+        """
+
+        with self._lock:
+
+            return self._state("watermark")
+
+    def _row(self, license: dict, generation: int) -> tuple:
+
+        raw = _dumps(license)
+
+        return (
+            license["key"],
+            license.get("id"),
+            license.get("email"),
+            _plan_id(license.get("plan")),
+            license.get("status"),
+            None if _updated_at(license) is None else str(_updated_at(license)),
+            hashlib.blake2b(raw, digest_size=16).digest(),
+            generation,
+            raw.decode(),
+        )
+
+    def _upsert(self, rows: list) -> int:
+
+        # Rows whose fingerprint did not change only get their generation bumped.
+        before = self._db.total_changes
+
+        self._db.executemany(
+            "INSERT INTO licenses (key, id, email, plan, status, updated, fingerprint, generation, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET id = excluded.id, email = excluded.email, plan = excluded.plan, "
+            "status = excluded.status, updated = excluded.updated, fingerprint = excluded.fingerprint, "
+            "generation = excluded.generation, data = excluded.data "
+            "WHERE licenses.fingerprint != excluded.fingerprint",
+            rows
+        )
+
+        written = self._db.total_changes - before
+
+        self._db.executemany(
+            "UPDATE licenses SET generation = ? WHERE key = ? AND generation != ?",
+            [(row[7], row[0], row[7]) for row in rows]
+        )
+
+        return written
+
+    def sync(self, limit: int = 100, prefetch: int = 4, since_watermark: bool = False) -> SyncStats:
+        """
+        Synchronizes the mirror with the API.
+
+        A full sync walks every page, rewrites only the changed licenses and
+        deletes the ones that no longer exist. With `since_watermark`, the walk
+        stops at the first page whose licenses are all older than the stored
+        watermark. That needs the API to list the most recently updated licenses
+        first, and it does not detect deletions.
+
+        Args:
+            limit: page size of each request. Defaults to 100.
+            prefetch: number of pages fetched concurrently. Defaults to 4.
+            since_watermark: whether or not to stop at the stored watermark. Defaults to False.
+
+        Returns:
+            The sync counters.
+        """
+
+        started = time.perf_counter()
+
+        with self._lock:
+
+            generation = int(self._state("generation") or 0) + 1
+
+            watermark = self._state("watermark")
+
+        incremental = since_watermark and watermark is not None
+
+        newest = watermark
+
+        pages = seen = written = deleted = 0
+
+        for _, res in _iter_pages(self._client._list_licenses_request, limit=limit, prefetch=0 if incremental else prefetch):
+
+            items = _page_items(res)
+
+            rows = [self._row(license, generation) for license in items]
+
+            stamps = [row[5] for row in rows if row[5] is not None]
+
+            if stamps:
+
+                newest = max([newest] + stamps) if newest is not None else max(stamps)
+
+            with self._lock:
+
+                self._db.execute("BEGIN")
+
+                written += self._upsert(rows)
+
+                self._db.execute("COMMIT")
+
+            pages += 1
+
+            seen += len(rows)
+
+            if incremental and stamps and max(stamps) <= watermark:
+
+                break
+
+        with self._lock:
+
+            self._db.execute("BEGIN")
+
+            if not incremental:
+
+                deleted = self._db.execute("DELETE FROM licenses WHERE generation != ?", (generation,)).rowcount
+
+            self._set_state("generation", generation)
+
+            if newest is not None:
+
+                self._set_state("watermark", newest)
+
+            self._db.execute("COMMIT")
+
+        return SyncStats(pages, seen, written, deleted, time.perf_counter() - started)
+
+    def apply(self, license: dict) -> None:
+        """
+        Writes a single license into the mirror, e.g. after updating it through the client.
+        """
+
+        with self._lock:
+
+            generation = int(self._state("generation") or 0)
+
+            self._upsert([self._row(license, generation)])
+
+    def remove(self, license_key: str) -> None:
+        """
+        Removes a single license from the mirror.
+        """
+
+        with self._lock:
+
+            self._db.execute("DELETE FROM licenses WHERE key = ?", (license_key,))
+
+    def _select(self, where: str, args: tuple) -> list:
+
+        with self._lock:
+
+            rows = self._db.execute("SELECT data FROM licenses WHERE " + where, args).fetchall()
+
+        return [_loads(row[0]) for row in rows]
+
+    def by_key(self, license_key: str) -> dict:
+        """
+        Returns the license with the given key, or None.
+        """
+
+        rows = self._select("key = ?", (license_key,))
+
+        return rows[0] if rows else None
+
+    def by_email(self, email: str) -> list:
+        """
+        Returns the licenses of an email, case insensitively.
+        """
+
+        return self._select("email = ?", (email,))
+
+    def by_plan(self, plan_id: str) -> list:
+        """
+        Returns the licenses of a product plan.
+        """
+
+        return self._select("plan = ?", (plan_id,))
+
+    def by_metadata(self, field: str, value) -> list:
+        """
+        Returns the licenses whose metadata `field` equals `value`. Fields listed
+        in `metadata_indexes` are looked up through an index.
+        """
+
+        if not field.isidentifier():
+
+            raise ValueError(f"Invalid metadata field name: {field!r}")
+
+        return self._select(f"json_extract(data, '$.metadata.{field}') = ?", (value,))
+
+    def count(self) -> int:
+
+        with self._lock:
+
+            return self._db.execute("SELECT COUNT(*) FROM licenses").fetchone()[0]
+
+    def close(self) -> None:
+
+        self._db.close()
@@ -0,0 +1,251 @@
+from collections.abc import Mapping
+from datetime import datetime, timezone
+from typing import Iterable, Iterator
+
+
+def _parse_timestamp(value):
+
+    if value is None or isinstance(value, datetime):
+
+        return value
+
+    if isinstance(value, (int, float)):
+
+        # The API reports epoch timestamps in milliseconds.
+        return datetime.fromtimestamp(value / 1000 if value > 1e11 else value, tz=timezone.utc)
+
+    return datetime.fromisoformat(value)
+
+
+class _Timestamp:
+
+    """
+    Exposes the raw timestamp kept in the `_<name>` slot as a datetime, parsed on access.
+    """
+
+    def __set_name__(self, owner, name: str) -> None:
+
+        self.slot = "_" + name
+
+    def __get__(self, instance, owner):
+
+        if instance is None:
+
+            return self
+
+        return _parse_timestamp(getattr(instance, self.slot))
+
+
+class Model(Mapping):
+
+    """
+    Base class of the slotted response models.
+
+    Known fields live in slots instead of a per-object dict, so large result
+    sets cost a fraction of the memory of the raw JSON dicts. Timestamps are
+    only converted to datetimes when read. Models stay usable as read-only
+    mappings of the raw response (`license["metadata"]`, `license.get("key")`),
+    and unknown fields remain reachable that way.
+
+    A field absent from the response leaves its slot unset: it reads as None
+    as an attribute, but is not a key of the mapping.
+    """
+
+    __slots__ = ("_extra",)
+
+    _fields = ()
+
+    def __init_subclass__(cls, **kwargs) -> None:
+
+        super().__init_subclass__(**kwargs)
+
+        cls._fields = tuple(slot.lstrip("_") for slot in cls.__slots__)
+
+        cls._slots = dict(zip(cls._fields, cls.__slots__))
+
+        cls._unset = frozenset(cls.__slots__)
+
+    def __init__(self, data: dict) -> None:
+
+        slots = self._slots
+
+        for field, slot in slots.items():
+
+            if field in data:
+
+                setattr(self, slot, data[field])
+
+        self._extra = {key: value for key, value in data.items() if key not in slots} or None
+
+    @classmethod
+    def from_list(cls, items: Iterable[dict]) -> list:
+        """
+        Builds a list of models from raw items, e.g. a list page's "data".
+        """
+
+        return [cls(item) for item in items]
+
+    @classmethod
+    def stream(cls, items: Iterable[dict]) -> Iterator:
+        """
+        Lazily wraps raw items, e.g. from `Client.iter_licenses`, into models.
+        """
+
+        return map(cls, items)
+
+    def __getattr__(self, name: str):
+
+        # Only reached for slots left unset, i.e. fields absent from the response.
+        if name in self._unset:
+
+            return None
+
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def _present(self) -> Iterator[str]:
+
+        for field, slot in self._slots.items():
+
+            try:
+
+                object.__getattribute__(self, slot)
+
+            except AttributeError:
+
+                continue
+
+            yield field
+
+    def __getitem__(self, key: str):
+
+        slot = self._slots.get(key)
+
+        if slot is not None:
+
+            try:
+
+                return object.__getattribute__(self, slot)
+
+            except AttributeError:
+
+                raise KeyError(key) from None
+
+        if self._extra is not None and key in self._extra:
+
+            return self._extra[key]
+
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+
+        yield from self._present()
+
+        if self._extra is not None:
+
+            yield from self._extra
+
+    def __len__(self) -> int:
+
+        return sum(1 for _ in self._present()) + (len(self._extra) if self._extra is not None else 0)
+
+    def to_dict(self) -> dict:
+        """
+        Returns the raw response dict.
+        """
+
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+
+        return f"{type(self).__name__}(id={getattr(self, 'id', None)!r})"
+
+
+class License(Model):
+
+    __slots__ = ("id", "key", "email", "status", "unlocked", "plan", "user", "customer", "metadata", "subscription", "_created")
+
+    created = _Timestamp()
+
+
+class Product(Model):
+
+    __slots__ = ("id", "name", "description", "type", "amount", "currency", "image", "active", "recurring", "metadata", "_created")
+
+    created = _Timestamp()
+
+
+class Link(Model):
+
+    __slots__ = ("id", "plan", "active", "password", "max_usages", "remaining_stock", "trial_period_days", "_start_date", "_created")
+
+    start_date = _Timestamp()
+
+    created = _Timestamp()
+
+
+class Raffle(Model):
+
+    __slots__ = ("id", "plan", "active", "spots", "trial_period_days", "initial_fee_amount", "_pick_winners_at", "_created")
+
+    pick_winners_at = _Timestamp()
+
+    created = _Timestamp()
+
+
+class Payment(Model):
+
+    __slots__ = ("id", "amount", "currency", "status", "email", "customer", "plan", "license", "refunded", "_created")
+
+    created = _Timestamp()
+
+
+class Coupon(Model):
+
+    __slots__ = ("id", "name", "active", "amount_off", "percent_off", "currency", "duration", "max_redemptions", "times_redeemed", "_created")
+
+    created = _Timestamp()
+
+
+class WaitlistEntry(Model):
+
+    __slots__ = ("id", "email", "status", "user", "metadata", "_created")
+
+    created = _Timestamp()
+
+
+def columns(items: Iterable, fields: Iterable[str] = None) -> dict:
+    """
+    Converts models or raw dicts into a columnar mapping of field name to list
+    of values, e.g. to build a pandas DataFrame or a pyarrow Table.
+
+    Args:
+        items: models or raw dicts.
+        fields: the fields to keep. Defaults to the fields of the first item.
+
+    Returns:
+        A dict mapping each field to the list of its values, in item order.
+    """
+
+    items = iter(items)
+
+    first = next(items, None)
+
+    if first is None:
+
+        return {field: [] for field in fields or ()}
+
+    fields = tuple(fields or (first._fields if isinstance(first, Model) else first.keys()))
+
+    data = {field: [first.get(field)] for field in fields}
+
+    appenders = [(field, data[field].append) for field in fields]
+
+    for item in items:
+
+        get = item.get
+
+        for field, append in appenders:
+
+            append(get(field))
+
+    return data
@@ -1,7 +1,6 @@
 from enum import StrEnum
-import json
 from typing import NamedTuple
-from .utils.helpers import _clear_payload
+from .utils.schema import _encoder, _enum, _field, _schema
 
 
 class ProductType(StrEnum):
@@ -39,18 +38,33 @@ class ProductLink(NamedTuple):
     title: str
     href: str
 
+    _build_payload = _schema(
+        _field("title"),
+        _field("href"),
+    )
+
 
 class ProductRecurring(NamedTuple):
 
     interval: RecurringInterval
     interval_count: int
 
+    _build_payload = _schema(
+        _field("interval", convert=_enum),
+        _field("interval_count"),
+    )
+
 
 class ProductTransfers(NamedTuple):
 
     enabled: bool
     cooldown_days: int
 
+    _build_payload = _schema(
+        _field("enabled"),
+        _field("cooldown_days"),
+    )
+
 
 class IntegrationDiscord(NamedTuple):
 
@@ -58,18 +72,34 @@ class IntegrationDiscord(NamedTuple):
     roles: list[str]
     cancel_action: DiscordCancelAction
 
+    _build_payload = _schema(
+        _field("roles"),
+        _field("cancel_action", convert=_enum),
+        _field("guild"),
+    )
+
 
 class IntegrationTelegram(NamedTuple):
 
     chat: str
     cancel_action: TelegramCancelAction
 
+    _build_payload = _schema(
+        _field("cancel_action", convert=_enum),
+        _field("chat"),
+    )
+
 
 class ProductIntegrations(NamedTuple):
 
     discord: IntegrationDiscord = None
     telegram: IntegrationTelegram = None
 
+    _build_payload = _schema(
+        _field("discord", convert=IntegrationDiscord._build_payload),
+        _field("telegram", convert=IntegrationTelegram._build_payload),
+    )
+
 
 class CreateProductParams(NamedTuple):
 
@@ -85,39 +115,21 @@ class CreateProductParams(NamedTuple):
     transfers: ProductTransfers = None
     integrations: ProductIntegrations = None
 
-    def _build_payload(self) -> dict:
-
-        payload = {
-            "links": [{"title": l.title, "href": l.href} for l in self.links] if self.links else None,
-            "recurring": {
-                "interval": json.dumps(self.recurring.interval),
-                "interval_count": self.recurring.interval_count
-            } if self.recurring else None,
-            "transfers": {
-                "enabled": self.transfers.enabled,
-                "cooldown_days": self.transfers.cooldown_days
-            } if self.transfers else None,
-            "integrations": {
-                "discord": {
-                    "roles": self.integrations.discord.roles,
-                    "cancel_action": json.dumps(self.integrations.discord.cancel_action),
-                    "guild": self.integrations.discord.guild
-                } if self.integrations.discord else None,
-                "telegram": {
-                    "cancel_action": json.dumps(self.integrations.telegram.cancel_action),
-                    "chat": self.integrations.telegram.chat
-                } if self.integrations.telegram else None
-            } if self.integrations else None,
-            "name": self.name,
-            "type": json.dumps(self.type),
-            "amount": self.amount,
-            "currency": self.currency,
-            "image": self.image,
-            "description": self.description,
-            "rental_period_days": self.rental_period_days
-        }
-
-        return _clear_payload(payload=payload)
+    _build_payload = _schema(
+        _field("links", convert=ProductLink._build_payload, many=True),
+        _field("recurring", convert=ProductRecurring._build_payload),
+        _field("transfers", convert=ProductTransfers._build_payload),
+        _field("integrations", convert=ProductIntegrations._build_payload),
+        _field("name"),
+        _field("type", convert=_enum),
+        _field("amount"),
+        _field("currency"),
+        _field("image"),
+        _field("description"),
+        _field("rental_period_days"),
+    )
+
+    _encode_payload = _encoder(_build_payload)
 
 
 class UpdateProductParams(NamedTuple):
@@ -130,28 +142,14 @@ class UpdateProductParams(NamedTuple):
     transfers: ProductTransfers = None
     integrations: ProductIntegrations = None
 
-    def _build_payload(self) -> dict:
-
-        payload = {
-            "name": self.product_id,
-            "image": self.image,
-            "description": self.description,
-            "rental_period_days": self.rental_period_days,
-            "links": [{"title": l.title, "href": l.href} for l in self.links] if self.links else None,
-            "transfers": {
-                "enabled": self.transfers.enabled,
-                "cooldown_days": self.transfers.cooldown_days
-            } if self.transfers else None,
-            "integrations": {
-                "discord": {
-                    "roles": self.integrations.discord.roles,
-                    "cancel_action": json.dumps(self.integrations.discord.cancel_action),
-                    "guild": self.integrations.discord.guild
-                } if self.integrations.discord else None,
-                "telegram": {
-                    "cancel_action": json.dumps(self.integrations.telegram.cancel_action),
-                } if self.integrations.telegram else None
-            } if self.integrations else None,
-        }
-        
-        return _clear_payload(payload=payload)
+    _build_payload = _schema(
+        _field("name", "product_id"),
+        _field("image"),
+        _field("description"),
+        _field("rental_period_days"),
+        _field("links", convert=ProductLink._build_payload, many=True),
+        _field("transfers", convert=ProductTransfers._build_payload),
+        _field("integrations", convert=ProductIntegrations._build_payload),
+    )
+
+    _encode_payload = _encoder(_build_payload)
@@ -1,6 +1,6 @@
-from .utils.helpers import _clear_payload
 from datetime import datetime
 from typing import NamedTuple
+from .utils.schema import _encoder, _field, _isoformat, _schema
 
 class CreateRaffleParams(NamedTuple):
 
@@ -12,16 +12,14 @@ class CreateRaffleParams(NamedTuple):
     initial_fee_amount: int = None
     grouop_buy_guild: str = None
 
-    def _build_payload(self) -> dict:
+    _build_payload = _schema(
+        _field("active"),
+        _field("trial_period_days"),
+        _field("plan", "product_id"),
+        _field("spots"),
+        _field("initial_fee_amount"),
+        _field("pick_winners_at", convert=_isoformat),
+        _field("group_buy_guild", "grouop_buy_guild"),
+    )
 
-        payload = {
-            "active": self.active,
-            "trial_period_days": self.trial_period_days,
-            "plan": self.product_id,
-            "spots": self.spots,
-            "initial_fee_amount": self.initial_fee_amount,
-            "pick_winners_at": self.pick_winners_at.isoformat(),
-            "group_buy_guild": self.grouop_buy_guild
-        }
-        
-        return _clear_payload(payload=payload)
+    _encode_payload = _encoder(_build_payload)
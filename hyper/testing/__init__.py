@@ -0,0 +1 @@
+"""Hyper.co client testing utilities"""
@@ -0,0 +1,435 @@
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+_RESOURCES = ("licenses", "products", "links", "raffles", "waitlist/entries", "payments", "coupons")
+
+_CREATED = 1683577538000
+
+_SEEDS = {
+    "products": lambda id, i: {
+        "id": id,
+        "name": f"Product {i}",
+        "active": True,
+        "plans": [{"id": f"plan_{i}", "name": "Lifetime", "amount": 2500, "currency": "usd"}],
+        "created": _CREATED + i,
+    },
+    "links": lambda id, i: {
+        "id": id,
+        "active": True,
+        "stock": 100,
+        "plan": f"plan_{i}",
+        "created": _CREATED + i,
+    },
+    "raffles": lambda id, i: {
+        "id": id,
+        "active": True,
+        "name": f"Raffle {i}",
+        "stock": 50,
+        "created": _CREATED + i,
+    },
+    "waitlist/entries": lambda id, i: {
+        "id": id,
+        "email": f"waiting{i}@example.com",
+        "status": "pending",
+        "created": _CREATED + i,
+    },
+    "payments": lambda id, i: {
+        "id": id,
+        "amount": 2500,
+        "currency": "usd",
+        "status": "succeeded",
+        "email": f"user{i}@example.com",
+        "created": _CREATED + i,
+    },
+    "coupons": lambda id, i: {
+        "id": id,
+        "code": f"CODE{i:06d}",
+        "active": True,
+        "amount_off": 500,
+        "created": _CREATED + i,
+    },
+}
+
+
+def _etag(payload) -> str:
+
+    return '"%s"' % hashlib.blake2b(json.dumps(payload).encode(), digest_size=8).hexdigest()
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    disable_nagle_algorithm = True
+
+    server: "_StubHTTPServer"
+
+    def setup(self) -> None:
+
+        super().setup()
+
+        self.server.stub._on_connection()
+
+    def log_message(self, format: str, *args) -> None:
+
+        pass
+
+    def _send(self, status: int, body, headers: dict) -> None:
+
+        raw = body.encode() if isinstance(body, str) else json.dumps(body).encode()
+
+        self.send_response(status)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(raw)))
+
+        for name, value in headers.items():
+
+            self.send_header(name, value)
+
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def _handle(self, method: str) -> None:
+
+        url = urlsplit(self.path)
+
+        length = int(self.headers.get("content-length") or 0)
+
+        body = json.loads(self.rfile.read(length)) if length else None
+
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        status, payload, headers = self.server.stub._serve(method, url.path, query, body, self.headers)
+
+        if method == "get" and status == 200:
+
+            etag = _etag(payload)
+
+            headers = {**headers, "ETag": etag}
+
+            if self.headers.get("If-None-Match") == etag:
+
+                self._send(304, "", headers)
+
+                return
+
+        self._send(status, payload, headers)
+
+    def do_GET(self) -> None:
+
+        self._handle("get")
+
+    def do_POST(self) -> None:
+
+        self._handle("post")
+
+    def do_PATCH(self) -> None:
+
+        self._handle("patch")
+
+    def do_DELETE(self) -> None:
+
+        self._handle("delete")
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+
+    daemon_threads = True
+
+    # Benchmarks open many connections at once; the default backlog of 5 makes
+    # the kernel drop SYNs and the client wait a second to retransmit.
+    request_queue_size = 128
+
+    stub: "StubServer"
+
+    def handle_error(self, request, client_address) -> None:
+
+        # Clients hanging up mid-response, e.g. on a timeout, are expected.
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+
+            super().handle_error(request, client_address)
+
+
+class StubServer:
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        licenses: int = 100,
+        records: dict = None,
+        latency: float = 0.0,
+        rate_limit: int = None,
+        error_rate: float = 0.0,
+        page_size: int = 20,
+        max_page_size: int = 100,
+        seed: int = None
+    ) -> None:
+        """
+        Local stand-in for the Hyper v6 API, served over keep-alive HTTP/1.1.
+
+        Args:
+            host: the interface to bind. Defaults to localhost.
+            port: the port to bind. Defaults to a free port.
+            licenses: number of licenses to seed the store with. Defaults to 100.
+            records: number of records to seed each other resource with, e.g.
+                `{"products": 10, "payments": 500}`. Defaults to none.
+            latency: seconds to sleep before answering each request. Defaults to 0.
+            rate_limit: requests allowed per one second window, answering 429 with
+                rate limit headers beyond it. Defaults to unlimited.
+            error_rate: share of requests answered with a 503. Defaults to 0.
+            page_size: page size of list requests without a `limit`. Defaults to 20.
+            max_page_size: the largest `limit` honoured by list requests. Defaults to 100.
+            seed: seed of the error injection and seeded ids. Defaults to a random seed.
+        """
+
+        self.latency = latency
+
+        self.rate_limit = rate_limit
+
+        self.throttled = 0
+
+        self.error_rate = error_rate
+
+        self.errors = 0
+
+        self.page_size = page_size
+
+        self.max_page_size = max_page_size
+
+        self._random = random.Random(seed)
+
+        self._window = (0, 0)
+
+        self.connections = 0
+
+        self.requests = 0
+
+        self._lock = threading.Lock()
+
+        self._store = {resource: {} for resource in _RESOURCES}
+
+        for i in range(licenses):
+
+            key = f"KEY-{i:08d}"
+
+            self._store["licenses"][key] = {
+                "id": self._id("lic_"),
+                "key": key,
+                "email": f"user{i}@example.com",
+                "status": "active",
+                "unlocked": False,
+                "metadata": {},
+                "created": _CREATED + i,
+            }
+
+        for resource, count in (records or {}).items():
+
+            if resource not in _SEEDS:
+
+                raise ValueError(f"Unknown resource {resource!r}")
+
+            for i in range(count):
+
+                item = _SEEDS[resource](self._id(resource[:3] + "_"), i)
+
+                self._store[resource][item["id"]] = item
+
+        self._httpd = _StubHTTPServer((host, port), _StubHandler)
+        self._httpd.stub = self
+
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """
+        The base url to hand to `Core(base_url=...)`.
+        """
+
+        host, port = self._httpd.server_address[:2]
+
+        return f"http://{host}:{port}/v6"
+
+    def start(self) -> "StubServer":
+
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+        return self
+
+    def stop(self) -> None:
+
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "StubServer":
+
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+
+        self.stop()
+
+    def _id(self, prefix: str) -> str:
+
+        return prefix + "%016x" % self._random.getrandbits(64)
+
+    def _on_connection(self) -> None:
+
+        with self._lock:
+
+            self.connections += 1
+
+    def _throttle(self) -> dict:
+
+        now = time.time()
+
+        second = int(now)
+
+        with self._lock:
+
+            window, used = self._window
+
+            used = used + 1 if window == second else 1
+
+            self._window = (second, used)
+
+            if used > self.rate_limit:
+
+                self.throttled += 1
+
+        reset = second + 1
+
+        return {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(max(0, self.rate_limit - used)),
+            "X-RateLimit-Reset": str(reset),
+            **({"Retry-After": f"{reset - now:.3f}"} if used > self.rate_limit else {}),
+        }
+
+    def _serve(self, method: str, path: str, query: dict, body, headers) -> tuple:
+
+        with self._lock:
+
+            self.requests += 1
+
+        if self.latency:
+
+            time.sleep(self.latency)
+
+        extra = {}
+
+        if self.rate_limit is not None:
+
+            extra = self._throttle()
+
+            if "Retry-After" in extra:
+
+                return 429, {"error": {"message": "Too many requests"}}, extra
+
+        if self.error_rate:
+
+            with self._lock:
+
+                failed = self._random.random() < self.error_rate
+
+                self.errors += failed
+
+            if failed:
+
+                return 503, {"error": {"message": "Service unavailable"}}, extra
+
+        status, payload = self._dispatch(method, path, query, body, headers)
+
+        return status, payload, extra
+
+    def _dispatch(self, method: str, path: str, query: dict, body, headers) -> tuple:
+
+        parts = [part for part in path.split("/") if part][1:]
+
+        if parts[:2] == ["waitlist", "entries"]:
+
+            parts = ["waitlist/entries"] + parts[2:]
+
+        if not parts or parts[0] not in self._store:
+
+            return 404, {"error": {"message": "Not found"}}
+
+        items = self._store[parts[0]]
+
+        if len(parts) == 1:
+
+            if method == "get":
+
+                page = int(query.get("page", 1))
+                limit = min(int(query.get("limit", self.page_size)), self.max_page_size)
+
+                values = list(items.values())
+
+                return 200, {
+                    "data": values[(page - 1) * limit:page * limit],
+                    "page": page,
+                    "limit": limit,
+                    "total_count": len(values),
+                }
+
+            if method == "post":
+
+                item = dict(body or {})
+                item.setdefault("id", self._id(""))
+                item.setdefault("key", item["id"])
+
+                with self._lock:
+
+                    items[item["key"]] = item
+
+                return 200, item
+
+            return 404, {"error": {"message": "Not found"}}
+
+        item = items.get(parts[1])
+
+        if item is None:
+
+            return 404, {"error": {"message": "Not found"}}
+
+        if method == "get":
+
+            return 200, item
+
+        if method == "patch":
+
+            with self._lock:
+
+                if_match = headers.get("If-Match")
+
+                if if_match is not None and if_match != _etag(item):
+
+                    return 412, {"error": {"message": "Precondition failed"}}
+
+                if len(parts) > 2 and parts[2] == "metadata":
+
+                    item["metadata"] = dict(body or {})
+
+                else:
+
+                    item.update(body or {})
+
+            return 200, item
+
+        if method == "delete":
+
+            with self._lock:
+
+                items.pop(parts[1], None)
+
+            return 202, "Accepted"
+
+        return 404, {"error": {"message": "Not found"}}
@@ -0,0 +1,93 @@
+import time
+import uuid
+import requests
+from ..utils.codec import _dumps
+from ..webhooks import SIGNATURE_HEADER, WebhookReceiver, sign
+
+
+class FakeWebhookSender:
+
+    def __init__(self, target: str | WebhookReceiver, secret: str) -> None:
+        """
+        Delivers signed webhook events the way Hyper does, to test a receiver
+        locally.
+
+        Args:
+            target: the url of a running `WebhookServer` or ASGI app, or a
+                `WebhookReceiver` to hand deliveries to directly.
+            secret: the webhook signing secret.
+        """
+
+        self.target = target
+
+        self.secret = secret
+
+        self._session = requests.Session() if isinstance(target, str) else None
+
+    def event(self, type: str, data: dict, event_id: str = None) -> dict:
+        """
+        Builds an event payload.
+
+        Args:
+            type: the event type, e.g. "license.updated".
+            data: the event object.
+            event_id: the event id. Defaults to a random id.
+
+        Returns:
+            The event payload.
+        """
+
+        return {
+            "id": event_id or "evt_" + uuid.uuid4().hex[:16],
+            "type": type,
+            "created": int(time.time() * 1000),
+            "data": {"object": data},
+        }
+
+    def deliver(self, payload: dict | bytes, signature: str = None, timestamp: int = None) -> int:
+        """
+        Delivers a payload, signed unless a signature is given.
+
+        Args:
+            payload: the event payload or raw body.
+            signature: a signature header overriding the computed one, e.g. to
+                test rejections.
+            timestamp: the signing time. Defaults to now.
+
+        Returns:
+            The response status.
+        """
+
+        body = payload if isinstance(payload, bytes) else _dumps(payload)
+
+        headers = {
+            "content-type": "application/json",
+            SIGNATURE_HEADER: signature if signature is not None else sign(body, self.secret, timestamp),
+        }
+
+        if self._session is None:
+
+            return self.target.handle(body, headers)[0]
+
+        return self._session.post(self.target, data=body, headers=headers).status_code
+
+    def send(self, type: str, data: dict, event_id: str = None) -> int:
+        """
+        Builds and delivers an event.
+
+        Args:
+            type: the event type, e.g. "payment.succeeded".
+            data: the event object.
+            event_id: the event id. Defaults to a random id.
+
+        Returns:
+            The response status.
+        """
+
+        return self.deliver(self.event(type, data, event_id))
+
+    def close(self) -> None:
+
+        if self._session is not None:
+
+            self._session.close()
@@ -0,0 +1,62 @@
+from datetime import date, datetime
+from enum import Enum
+
+try:
+
+    import orjson
+
+except ImportError:
+
+    orjson = None
+
+
+def _default(value):
+
+    if isinstance(value, Enum):
+
+        return value.value
+
+    if isinstance(value, (datetime, date)):
+
+        return value.isoformat()
+
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+import json
+
+_encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=_default)
+
+
+def _stdlib_dumps(obj) -> bytes:
+
+    return _encoder.encode(obj).encode()
+
+
+if orjson is not None:
+
+    def _dumps(obj) -> bytes:
+
+        try:
+
+            return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+        except TypeError:
+
+            # orjson refuses what the stdlib encodes, e.g. integers beyond 64 bits,
+            # and both backends must accept the same payloads.
+            return _stdlib_dumps(obj)
+
+    _loads = orjson.loads
+
+else:
+
+    _dumps = _stdlib_dumps
+
+    _loads = json.loads
+
+
+def _encode(obj) -> bytes:
+
+    # Params payloads may arrive already encoded by their compiled schema.
+    return obj if obj is None or isinstance(obj, bytes) else _dumps(obj)
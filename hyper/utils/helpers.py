@@ -1,16 +1,11 @@
+import functools
 
-def _clear_payload(payload: dict):
-    
-    p = payload.copy()
-    
-    for key, value in payload.items():
-        
-        if value is None:
-        
-            del p[key]
-            
-        elif isinstance(value, dict):
-            
-            p[key] = _clear_payload(value)
-            
-    return p
\ No newline at end of file
+
+@functools.lru_cache(maxsize=None)
+def _hardware_id() -> str:
+
+    import uuid
+
+    node = "%012x" % uuid.getnode()
+
+    return ":".join(node[i:i + 2] for i in range(0, 12, 2))
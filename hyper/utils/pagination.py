@@ -0,0 +1,197 @@
+from collections import deque
+from typing import AsyncIterator, Callable, Iterator
+
+
+def _page_items(res: dict) -> list:
+
+    return res.get("data") or []
+
+
+def _page_limit(res: dict, limit: int) -> int:
+
+    # The API caps oversized pages and echoes the limit it applied.
+    return res.get("limit") or limit
+
+
+def _has_next_page(res: dict, page: int, limit: int) -> bool:
+
+    if "has_more" in res:
+
+        return bool(res["has_more"])
+
+    limit = _page_limit(res, limit)
+
+    total = res.get("total_count")
+
+    if total is not None:
+
+        return page * limit < total
+
+    return len(_page_items(res)) >= limit
+
+
+def _last_page(res: dict, limit: int) -> int:
+
+    total = res.get("total_count")
+
+    if total is None:
+
+        return None
+
+    return max(1, -(-total // _page_limit(res, limit)))
+
+
+def _iter_pages(fetch: Callable, params: dict = None, page: int = 1, limit: int = 100, prefetch: int = 0) -> Iterator[tuple]:
+
+    params = dict(params or {})
+
+    if prefetch > 0:
+
+        yield from _iter_pages_prefetch(fetch, params, page, limit, prefetch)
+
+        return
+
+    while True:
+
+        res = fetch(params={**params, "page": page, "limit": limit})
+
+        yield page, res
+
+        if not _page_items(res) or not _has_next_page(res, page, limit):
+
+            return
+
+        page += 1
+
+
+def _iter_pages_prefetch(fetch: Callable, params: dict, page: int, limit: int, workers: int) -> Iterator[tuple]:
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    # The first page tells how many pages there are; the rest are fetched by a
+    # bounded pool and yielded in order, with at most `2 * workers` pages held.
+    res = fetch(params={**params, "page": page, "limit": limit})
+
+    yield page, res
+
+    last = _last_page(res, limit)
+
+    if last is None:
+
+        if _page_items(res) and _has_next_page(res, page, limit):
+
+            yield from _iter_pages(fetch, params=params, page=page + 1, limit=limit)
+
+        return
+
+    pending = deque()
+
+    next_page = page + 1
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+
+        try:
+
+            while pending or next_page <= last:
+
+                while next_page <= last and len(pending) < 2 * workers:
+
+                    pending.append((next_page, executor.submit(fetch, params={**params, "page": next_page, "limit": limit})))
+
+                    next_page += 1
+
+                number, future = pending.popleft()
+
+                yield number, future.result()
+
+        finally:
+
+            for _, future in pending:
+
+                future.cancel()
+
+
+def _iter_items(fetch: Callable, params: dict = None, page: int = 1, limit: int = 100, prefetch: int = 0) -> Iterator[dict]:
+
+    for _, res in _iter_pages(fetch, params=params, page=page, limit=limit, prefetch=prefetch):
+
+        yield from _page_items(res)
+
+
+async def _aiter_pages(fetch: Callable, params: dict = None, page: int = 1, limit: int = 100, prefetch: int = 0) -> AsyncIterator[tuple]:
+
+    params = dict(params or {})
+
+    if prefetch > 0:
+
+        async for item in _aiter_pages_prefetch(fetch, params, page, limit, prefetch):
+
+            yield item
+
+        return
+
+    while True:
+
+        res = await fetch(params={**params, "page": page, "limit": limit})
+
+        yield page, res
+
+        if not _page_items(res) or not _has_next_page(res, page, limit):
+
+            return
+
+        page += 1
+
+
+async def _aiter_pages_prefetch(fetch: Callable, params: dict, page: int, limit: int, workers: int) -> AsyncIterator[tuple]:
+
+    import asyncio
+
+    res = await fetch(params={**params, "page": page, "limit": limit})
+
+    yield page, res
+
+    last = _last_page(res, limit)
+
+    if last is None:
+
+        if _page_items(res) and _has_next_page(res, page, limit):
+
+            async for item in _aiter_pages(fetch, params=params, page=page + 1, limit=limit):
+
+                yield item
+
+        return
+
+    pending = deque()
+
+    next_page = page + 1
+
+    try:
+
+        while pending or next_page <= last:
+
+            while next_page <= last and len(pending) < workers:
+
+                pending.append((next_page, asyncio.ensure_future(fetch(params={**params, "page": next_page, "limit": limit}))))
+
+                next_page += 1
+
+            number, task = pending.popleft()
+
+            yield number, await task
+
+    finally:
+
+        for _, task in pending:
+
+            task.cancel()
+
+
+async def _aiter_items(fetch: Callable, params: dict = None, page: int = 1, limit: int = 100, prefetch: int = 0) -> AsyncIterator[dict]:
+
+    async for _, res in _aiter_pages(fetch, params=params, page=page, limit=limit, prefetch=prefetch):
+
+        for item in _page_items(res):
+
+            yield item
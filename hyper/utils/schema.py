@@ -0,0 +1,101 @@
+from datetime import date, datetime
+from enum import Enum
+from typing import Callable, NamedTuple
+from .codec import _dumps
+
+
+class _Field(NamedTuple):
+
+    key: str
+    attr: str
+    convert: Callable = None
+    many: bool = False
+
+
+def _field(key: str, attr: str = None, convert: Callable = None, many: bool = False) -> _Field:
+    """
+    Declares one payload field of a params class.
+
+    Args:
+        key: the payload key.
+        attr: the params attribute holding the value. Defaults to `key`.
+        convert: callable applied to a set value, e.g. `_enum` or a nested
+            `_schema`. Defaults to passing the value through.
+        many: whether or not the value is a list whose items are converted.
+
+    Returns:
+        The field declaration.
+    """
+
+    return _Field(key=key, attr=attr or key, convert=convert, many=many)
+
+
+def _enum(value) -> str:
+
+    return value.value if isinstance(value, Enum) else value
+
+
+def _isoformat(value) -> str:
+
+    return value.isoformat() if isinstance(value, (datetime, date)) else value
+
+
+def _timestamp(value) -> int:
+
+    return int(value.timestamp()) if isinstance(value, datetime) else value
+
+
+def _schema(*fields: _Field) -> Callable:
+    """
+    Compiles a payload schema into a builder function, once at import time.
+
+    The generated function reads each attribute a single time and only emits
+    the fields that are set, so payloads never carry `None`s that need to be
+    stripped afterwards. It is usable both as a params method and as the
+    `convert` of a nested field.
+
+    Args:
+        fields: the `_field` declarations, in payload order.
+
+    Returns:
+        A function turning a params object into its payload dict.
+    """
+
+    lines = ["def build(self):", "    payload = {}"]
+
+    namespace = {}
+
+    for i, field in enumerate(fields):
+
+        lines.append(f"    value = self.{field.attr}")
+        lines.append("    if value is not None:")
+
+        if field.convert is None:
+
+            expr = "value"
+
+        else:
+
+            namespace[f"_convert{i}"] = field.convert
+
+            expr = f"[_convert{i}(item) for item in value]" if field.many else f"_convert{i}(value)"
+
+        lines.append(f"        payload[{field.key!r}] = {expr}")
+
+    lines.append("    return payload")
+
+    exec("\n".join(lines), namespace)
+
+    return namespace["build"]
+
+
+def _encoder(build: Callable) -> Callable:
+    """
+    Wraps a compiled schema into a method returning the encoded JSON body.
+    """
+
+    def encode(self) -> bytes:
+
+        return _dumps(build(self))
+
+    return encode
@@ -0,0 +1,735 @@
+import hashlib
+import hmac
+import queue
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Iterable, Mapping, NamedTuple
+from .exceptions import WebhookSignatureException
+from .models import Coupon, License, Link, Model, Payment, Product, Raffle, WaitlistEntry
+from .utils.codec import _dumps, _loads
+
+
+SIGNATURE_HEADER = "hyper-signature"
+
+_MODELS = {
+    "license": License,
+    "product": Product,
+    "link": Link,
+    "raffle": Raffle,
+    "payment": Payment,
+    "coupon": Coupon,
+    "waitlist_entry": WaitlistEntry,
+}
+
+# Objects served by the cached retrieve calls: retrieve path and id field.
+_CACHED = {
+    "license": ("/licenses/", "key"),
+    "product": ("/products/", "id"),
+    "link": ("/links/", "id"),
+    "coupon": ("/coupons/", "id"),
+}
+
+
+class WebhookEvent(NamedTuple):
+
+    """
+    A verified webhook event. `data` is the event object as a response model,
+    e.g. a `License` for `license.*` events, or the raw dict for unknown objects.
+    """
+
+    id: str
+    type: str
+    created: int
+    data: Model | dict
+    raw: dict
+
+    @property
+    def object(self) -> str:
+        """
+        The object type of the event, e.g. "license" for "license.updated".
+        """
+
+        return self.type.partition(".")[0]
+
+
+class WebhookStats(NamedTuple):
+
+    received: int
+    rejected: int
+    duplicates: int
+    dropped: int
+    handled: int
+    failed: int
+    queued: int
+
+
+def sign(payload: bytes, secret: str, timestamp: int = None) -> str:
+    """
+    Computes the signature header of a webhook payload: `t=<unix time>,v1=<hex>`,
+    where the hex is the HMAC-SHA256 of `"<unix time>.<payload>"` keyed by the
+    webhook secret.
+
+    Args:
+        payload: the raw request body.
+        secret: the webhook signing secret.
+        timestamp: the signing time. Defaults to now.
+
+    Returns:
+        The signature header value.
+    """
+
+    timestamp = int(time.time()) if timestamp is None else int(timestamp)
+
+    mac = hmac.new(secret.encode(), b"%d." % timestamp + payload, hashlib.sha256).hexdigest()
+
+    return f"t={timestamp},v1={mac}"
+
+
+def verify_signature(payload: bytes, header: str, secrets: str | Iterable[str], tolerance: float = 300) -> None:
+    """
+    Verifies the signature header of a webhook payload in constant time.
+
+    Args:
+        payload: the raw request body.
+        header: the signature header value.
+        secrets: the webhook secret, or several while rotating it.
+        tolerance: maximum age in seconds of the signature, rejecting replays.
+            None disables the check. Defaults to 5 minutes.
+
+    Raises:
+        WebhookSignatureException: when the header is missing, malformed, stale
+            or matches none of the secrets.
+    """
+
+    if not header:
+
+        raise WebhookSignatureException("Missing signature header")
+
+    timestamp = None
+
+    signatures = []
+
+    for part in header.split(","):
+
+        name, _, value = part.strip().partition("=")
+
+        if name == "t":
+
+            timestamp = value
+
+        elif name == "v1":
+
+            signatures.append(value.encode())
+
+    if timestamp is None or not timestamp.isdigit() or not signatures:
+
+        raise WebhookSignatureException("Malformed signature header")
+
+    if tolerance is not None and abs(time.time() - int(timestamp)) > tolerance:
+
+        raise WebhookSignatureException("Signature timestamp outside the tolerance")
+
+    signed = timestamp.encode() + b"." + payload
+
+    for secret in [secrets] if isinstance(secrets, str) else secrets:
+
+        expected = hmac.new(secret.encode(), signed, hashlib.sha256).hexdigest().encode()
+
+        # Every candidate is compared, so timing does not tell which one matched.
+        matched = False
+
+        for signature in signatures:
+
+            matched |= hmac.compare_digest(expected, signature)
+
+        if matched:
+
+            return
+
+    raise WebhookSignatureException("Signature mismatch")
+
+
+def _event_object(raw: dict) -> dict:
+
+    data = raw.get("data") or {}
+
+    return data["object"] if isinstance(data.get("object"), dict) else data
+
+
+def _updated(data: dict):
+
+    return data.get("updated") or data.get("updated_at")
+
+
+def _newer(data: dict, current: dict) -> bool:
+
+    # The object's own update time, when the API reports one, tells a stale
+    # delivery from a newer cached or mirrored copy.
+    new, old = _updated(data), _updated(current)
+
+    return new is None or old is None or type(new) is not type(old) or new >= old
+
+
+def _parse_event(raw: dict) -> WebhookEvent:
+
+    type = raw["type"]
+
+    data = _event_object(raw)
+
+    model = _MODELS.get(type.partition(".")[0])
+
+    return WebhookEvent(raw.get("id"), type, raw.get("created"), model(data) if model else data, raw)
+
+
+_STOP = object()
+
+
+class WebhookReceiver:
+
+    def __init__(
+        self,
+        secret: str | Iterable[str],
+        workers: int = 4,
+        queue_size: int = 1000,
+        tolerance: float = 300,
+        clients: Iterable = (),
+        mirror=None,
+        on_error: Callable = None
+    ) -> None:
+        """
+        Receives Hyper webhooks: verifies their signature, parses them into
+        `WebhookEvent`s and dispatches them to the registered handlers on a pool
+        of worker threads.
+
+        Accepted events are queued and acknowledged at once. When the queue is
+        full, deliveries are answered with a 503 and `Retry-After`, so the sender
+        retries later instead of the receiver buffering without bound. Replayed
+        deliveries of an already accepted event id are acknowledged and skipped.
+
+        Before being queued, license, product, link and coupon events refresh the
+        response cache of the given clients, so the following `retrieve_*` calls
+        are answered locally, and license events update the given mirror. An
+        event older than the last one applied to its object, or than the cached
+        or mirrored copy by their `updated` time, is still handled but refreshes
+        nothing, so a retried or reordered delivery cannot bring back stale data.
+
+        The receiver is itself an ASGI application. `WebhookServer` serves it
+        without any framework.
+
+        Args:
+            secret: the webhook signing secret, or several while rotating it.
+            workers: number of handler threads. Defaults to 4.
+            queue_size: events waiting for a worker before deliveries are refused.
+                Defaults to 1000.
+            tolerance: maximum age in seconds of a delivery's signature. Defaults to 5 minutes.
+            clients: `Client`s of the business sending the webhooks whose response
+                cache is kept up to date. They must all use one API key. Defaults to none.
+            mirror: `LicenseMirror` kept up to date. Defaults to none.
+            on_error: called with `(event, exception)` when a handler raises.
+                Defaults to ignoring handler errors beyond counting them.
+
+        Raises:
+            ValueError: when the clients use different API keys.
+        """
+
+        self._secrets = [secret] if isinstance(secret, str) else list(secret)
+
+        self.tolerance = tolerance
+
+        self._clients = list(clients)
+
+        # Events are signed by one business, and must not reach the cache entries
+        # of another, which the client caches keep apart by API key.
+        if len({client._cache_namespace for client in self._clients}) > 1:
+
+            raise ValueError("WebhookReceiver clients must all use the API key of the business sending the webhooks")
+
+        self._mirror = mirror
+
+        self._on_error = on_error
+
+        self._handlers = {}
+
+        self._queue = queue.Queue(maxsize=queue_size)
+
+        self._workers = workers
+
+        self._threads = []
+
+        self._seen = OrderedDict()
+
+        # Creation time of the newest event applied to each object, by resource path.
+        self._applied = OrderedDict()
+
+        self._lock = threading.Lock()
+
+        self._received = self._rejected = self._duplicates = self._dropped = self._handled = self._failed = 0
+
+    def on(self, event_type: str, handler: Callable = None) -> Callable:
+        """
+        Registers a handler of an event type, such as "payment.succeeded", of every
+        event of an object with "license.*", or of every event with "*". Handlers
+        receive the `WebhookEvent` on a worker thread.
+
+        Args:
+            event_type: the event type or pattern.
+            handler: the handler. Omit it to use this method as a decorator.
+
+        Returns:
+            The handler.
+        """
+
+        if handler is None:
+
+            return lambda handler: self.on(event_type, handler)
+
+        self._handlers.setdefault(event_type, []).append(handler)
+
+        return handler
+
+    @property
+    def stats(self) -> WebhookStats:
+        """
+        Counters of every delivery received so far.
+        """
+
+        with self._lock:
+
+            return WebhookStats(
+                self._received,
+                self._rejected,
+                self._duplicates,
+                self._dropped,
+                self._handled,
+                self._failed,
+                self._queue.qsize()
+            )
+
+    def start(self) -> "WebhookReceiver":
+        """
+        Starts the worker threads. Called on the first delivery otherwise.
+        """
+
+        with self._lock:
+
+            if not self._threads:
+
+                for _ in range(self._workers):
+
+                    thread = threading.Thread(target=self._work, daemon=True)
+                    thread.start()
+
+                    self._threads.append(thread)
+
+        return self
+
+    def stop(self, timeout: float = None) -> None:
+        """
+        Handles the queued events, then stops the worker threads.
+
+        Args:
+            timeout: seconds to wait for each worker. Defaults to waiting until done.
+        """
+
+        with self._lock:
+
+            threads, self._threads = self._threads, []
+
+        for _ in threads:
+
+            self._queue.put(_STOP)
+
+        for thread in threads:
+
+            thread.join(timeout)
+
+    def join(self) -> None:
+        """
+        Blocks until every queued event has been handled.
+        """
+
+        self._queue.join()
+
+    def _count(self, counter: str) -> None:
+
+        with self._lock:
+
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _first_delivery(self, event_id: str) -> bool:
+
+        if event_id is None:
+
+            return True
+
+        with self._lock:
+
+            if event_id in self._seen:
+
+                self._duplicates += 1
+
+                return False
+
+            self._seen[event_id] = None
+
+            if len(self._seen) > 10_000:
+
+                self._seen.popitem(last=False)
+
+            return True
+
+    def _forget(self, event_id: str) -> None:
+
+        with self._lock:
+
+            self._seen.pop(event_id, None)
+
+    def _in_order(self, path: str, created) -> bool:
+
+        if created is None:
+
+            return True
+
+        with self._lock:
+
+            latest = self._applied.get(path)
+
+            if latest is not None and created < latest:
+
+                return False
+
+            self._applied[path] = created
+
+            self._applied.move_to_end(path)
+
+            if len(self._applied) > 10_000:
+
+                self._applied.popitem(last=False)
+
+            return True
+
+    def _refresh(self, event: WebhookEvent) -> None:
+
+        cached = _CACHED.get(event.object)
+
+        data = _event_object(event.raw)
+
+        if cached is None or not data.get(cached[1]):
+
+            return
+
+        path = cached[0] + data[cached[1]]
+
+        if not self._in_order(path, event.created):
+
+            return
+
+        deleted = event.type.endswith(".deleted")
+
+        for client in self._clients:
+
+            if client._cache is None:
+
+                continue
+
+            key = client._cache_key(path)
+
+            current = client._cache.get_stale(key)
+
+            if not deleted and current is not None and not _newer(data, current):
+
+                continue
+
+            client._cache.invalidate(client._cache_path(path))
+
+            if not deleted:
+
+                client._cache_store(key, path, data)
+
+        if self._mirror is not None and event.object == "license":
+
+            if deleted:
+
+                self._mirror.remove(data["key"])
+
+                return
+
+            current = self._mirror.by_key(data["key"])
+
+            if current is None or _newer(data, current):
+
+                self._mirror.apply(data)
+
+    def handle(self, body: bytes, headers: Mapping) -> tuple:
+        """
+        Processes one delivery, e.g. from a web framework view.
+
+        Args:
+            body: the raw request body.
+            headers: the request headers.
+
+        Returns:
+            The `(status, headers, body)` of the response to send back.
+        """
+
+        self._count("_received")
+
+        try:
+
+            verify_signature(body, headers.get(SIGNATURE_HEADER), self._secrets, self.tolerance)
+
+        except WebhookSignatureException as e:
+
+            self._count("_rejected")
+
+            return 401, {}, _dumps({"error": {"message": str(e)}})
+
+        try:
+
+            event = _parse_event(_loads(body))
+
+        except (ValueError, KeyError, TypeError, AttributeError):
+
+            self._count("_rejected")
+
+            return 400, {}, _dumps({"error": {"message": "Malformed event"}})
+
+        if not self._first_delivery(event.id):
+
+            return 200, {}, b'{"received":true}'
+
+        if not self._threads:
+
+            self.start()
+
+        # Refreshed before queueing so no handler can read the stale cache. A refresh
+        # of a dropped event is harmless, as the sender delivers it again.
+        self._refresh(event)
+
+        try:
+
+            self._queue.put_nowait(event)
+
+        except queue.Full:
+
+            self._forget(event.id)
+
+            self._count("_dropped")
+
+            return 503, {"Retry-After": "1"}, _dumps({"error": {"message": "Receiver busy"}})
+
+        return 200, {}, b'{"received":true}'
+
+    def _dispatch(self, event: WebhookEvent) -> None:
+
+        handlers = (
+            self._handlers.get(event.type, [])
+            + self._handlers.get(event.object + ".*", [])
+            + self._handlers.get("*", [])
+        )
+
+        for handler in handlers:
+
+            try:
+
+                handler(event)
+
+            except Exception as e:
+
+                self._count("_failed")
+
+                if self._on_error is not None:
+
+                    self._on_error(event, e)
+
+    def _work(self) -> None:
+
+        while True:
+
+            event = self._queue.get()
+
+            try:
+
+                if event is _STOP:
+
+                    return
+
+                self._dispatch(event)
+
+                self._count("_handled")
+
+            finally:
+
+                self._queue.task_done()
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+
+        if scope["type"] == "lifespan":
+
+            while True:
+
+                message = await receive()
+
+                if message["type"] == "lifespan.startup":
+
+                    self.start()
+
+                    await send({"type": "lifespan.startup.complete"})
+
+                elif message["type"] == "lifespan.shutdown":
+
+                    self.stop()
+
+                    await send({"type": "lifespan.shutdown.complete"})
+
+                    return
+
+        if scope["type"] != "http":
+
+            return
+
+        if scope["method"] != "POST":
+
+            status, headers, body = 405, {"Allow": "POST"}, b""
+
+        else:
+
+            chunks = []
+
+            more = True
+
+            while more:
+
+                message = await receive()
+
+                chunks.append(message.get("body", b""))
+
+                more = message.get("more_body", False)
+
+            request_headers = {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope["headers"]}
+
+            status, headers, body = self.handle(b"".join(chunks), request_headers)
+
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                *((name.lower().encode(), value.encode()) for name, value in headers.items()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+class _WebhookHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    server: "_WebhookHTTPServer"
+
+    def log_message(self, format: str, *args) -> None:
+
+        pass
+
+    def _reply(self, status: int, headers: dict, body: bytes) -> None:
+
+        self.send_response(status)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+
+        for name, value in headers.items():
+
+            self.send_header(name, value)
+
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:
+
+        body = self.rfile.read(int(self.headers.get("content-length") or 0))
+
+        if self.server.path is not None and self.path.split("?")[0] != self.server.path:
+
+            self._reply(404, {}, b'{"error":{"message":"Not found"}}')
+
+            return
+
+        self._reply(*self.server.receiver.handle(body, self.headers))
+
+
+class _WebhookHTTPServer(ThreadingHTTPServer):
+
+    daemon_threads = True
+
+    receiver: WebhookReceiver
+
+    path: str
+
+
+class WebhookServer:
+
+    def __init__(self, receiver: WebhookReceiver, host: str = "127.0.0.1", port: int = 8080, path: str = "/webhooks") -> None:
+        """
+        Standalone HTTP server of a `WebhookReceiver`, for deployments without an
+        ASGI server.
+
+        Args:
+            receiver: the receiver handling deliveries.
+            host: the interface to bind. Defaults to localhost.
+            port: the port to bind, 0 for a free one. Defaults to 8080.
+            path: the url path accepting deliveries, None for any. Defaults to "/webhooks".
+        """
+
+        self.receiver = receiver
+
+        self._httpd = _WebhookHTTPServer((host, port), _WebhookHandler)
+        self._httpd.receiver = receiver
+        self._httpd.path = path
+
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """
+        The url deliveries are accepted on.
+        """
+
+        host, port = self._httpd.server_address[:2]
+
+        return f"http://{host}:{port}{self._httpd.path or ''}"
+
+    def serve_forever(self) -> None:
+        """
+        Serves deliveries on the calling thread until `stop` is called.
+        """
+
+        self.receiver.start()
+
+        self._httpd.serve_forever()
+
+    def start(self) -> "WebhookServer":
+        """
+        Serves deliveries on a background thread.
+        """
+
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+
+        return self
+
+    def stop(self) -> None:
+
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+        self.receiver.stop()
+
+    def __enter__(self) -> "WebhookServer":
+
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+
+        self.stop()
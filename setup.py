@@ -15,8 +15,9 @@ setup(
     author=about["__author__"],
     description=about["__description__"],
     license=about["__license__"],
-    packages=find_packages(exclude=["test"]),
+    packages=find_packages(exclude=["test", "tests", "tests.*", "benchmarks", "benchmarks.*"]),
     install_requires=["requests"],
+    extras_require={"async": ["aiohttp"], "fast": ["orjson"]},
     long_description=readme,
     long_description_content_type="text/markdown",
     keywords=["python", "client"],
@@ -0,0 +1,23 @@
+import json
+
+import pytest
+
+from hyper.utils import codec
+
+
+@pytest.mark.parametrize("obj", [
+    {1: "a", "b": 2},
+    {"big": 2 ** 70, "small": -(2 ** 65)},
+    {"nested": [{True: None}]},
+    {"text": "é"},
+])
+def test_backends_encode_alike(obj):
+
+    assert json.loads(codec._dumps(obj)) == json.loads(codec._stdlib_dumps(obj))
+
+
+def test_unserializable_still_raises():
+
+    with pytest.raises(TypeError):
+
+        codec._dumps({"value": object()})
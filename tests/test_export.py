@@ -0,0 +1,61 @@
+import csv
+
+import pytest
+
+from hyper.export import export
+
+
+class _Pages:
+
+    """
+    Stands in for a client, serving `pages` as the pages of every list endpoint.
+    """
+
+    def __init__(self, pages: list) -> None:
+
+        self.pages = pages
+
+    def _list_coupons_request(self, params: dict) -> dict:
+
+        page = params["page"]
+
+        return {"data": self.pages[page - 1], "has_more": page < len(self.pages)}
+
+
+_PAGES = [
+    [{"id": "c1", "max_redemptions": None, "active": True}],
+    [{"id": "c2", "max_redemptions": 5, "active": False, "subscription": {"id": "s1"}}],
+    [{"id": "c3", "max_redemptions": 2.5, "active": "soon"}],
+]
+
+
+def test_csv_keeps_fields_of_later_records(tmp_path):
+
+    filename = str(tmp_path / "coupons.csv")
+
+    export(_Pages(_PAGES), "coupons", filename, chunk_pages=1)
+
+    with open(filename, newline="", encoding="utf-8") as f:
+
+        rows = list(csv.DictReader(f))
+
+    assert [row["id"] for row in rows] == ["c1", "c2", "c3"]
+
+    assert [row["subscription"] for row in rows] == ["", '{"id":"s1"}', ""]
+
+
+def test_parquet_widens_columns_across_chunks(tmp_path):
+
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    directory = str(tmp_path / "coupons.parquet")
+
+    export(_Pages(_PAGES), "coupons", directory, chunk_pages=1)
+
+    table = pq.read_table(directory)
+
+    assert table.column("max_redemptions").to_pylist() == [None, 5.0, 2.5]
+
+    assert table.column("active").to_pylist() == ["true", "false", "soon"]
+
+    assert table.column("subscription").to_pylist() == [None, '{"id":"s1"}', None]
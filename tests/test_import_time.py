@@ -0,0 +1,38 @@
+"""
+Import time budget of `from hyper.client import Client`, measured as in
+benchmarks/bench_import.py.
+"""
+
+import os
+import statistics
+
+from benchmarks.bench_import import _STATEMENT, _run
+
+_BUDGET_MS = 50
+
+_RUNS = 5
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _probe(monkeypatch) -> list:
+
+    # The probe imports hyper from the working directory, as `python -c` does.
+    monkeypatch.chdir(_ROOT)
+
+    return [_run(_STATEMENT) for _ in range(_RUNS)]
+
+
+def test_import_time_budget(monkeypatch):
+
+    median = statistics.median(elapsed * 1e3 for elapsed, _ in _probe(monkeypatch))
+
+    assert median <= _BUDGET_MS, f"median import time {median:.1f}ms exceeds the {_BUDGET_MS}ms budget"
+
+
+def test_deferred_modules_not_loaded(monkeypatch):
+
+    loaded = sorted({name for _, modules in _probe(monkeypatch) for name in modules})
+
+    assert not loaded, "loaded on import instead of first use: " + ", ".join(loaded)
+
@@ -0,0 +1,39 @@
+from hyper.models import License, columns
+
+
+def test_absent_fields_are_not_keys():
+
+    license = License({"key": "K", "created": 1700000000000, "custom": 1})
+
+    assert "subscription" not in license
+
+    assert len(license) == 3
+
+    assert license.to_dict() == {"key": "K", "created": 1700000000000, "custom": 1}
+
+    assert license.get("subscription") is None
+
+
+def test_absent_fields_read_as_none():
+
+    license = License({"key": "K"})
+
+    assert license.subscription is None
+
+    assert license.created is None
+
+
+def test_present_none_is_kept():
+
+    license = License({"key": "K", "subscription": None})
+
+    assert "subscription" in license
+
+    assert license.to_dict() == {"key": "K", "subscription": None}
+
+
+def test_columns_fill_absent_fields():
+
+    data = columns([License({"key": "A", "email": "a@x"}), License({"key": "B"})], fields=("key", "email"))
+
+    assert data == {"key": ["A", "B"], "email": ["a@x", None]}
@@ -0,0 +1,37 @@
+from hyper.client import Client, Hooks
+from hyper.testing.stub import StubServer
+
+
+def _client(server: StubServer, sent: list) -> Client:
+
+    hooks = Hooks()
+
+    hooks.on("before_request", lambda info: sent.append(info.params))
+
+    return Client("sk_test", base_url=server.url, instruments=[hooks])
+
+
+def test_list_sends_paging_only_when_given():
+
+    sent = []
+
+    with StubServer() as server:
+
+        client = _client(server, sent)
+
+        client.list_products()
+        client.list_raffles()
+        client.list_payments(limit=5)
+
+    assert sent == [{}, {"active": "true"}, {"limit": 5}]
+
+
+def test_iter_walks_every_page():
+
+    with StubServer(records={"products": 5}) as server:
+
+        client = _client(server, [])
+
+        assert len(client.list_products(limit=2)["data"]) == 2
+
+        assert len({product["id"] for product in client.iter_products(limit=2)}) == 5
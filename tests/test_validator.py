@@ -0,0 +1,72 @@
+import threading
+
+import pytest
+
+from hyper.client import Client, LicenseValidator
+from hyper.exceptions import LicenseBindException
+from hyper.testing.stub import StubServer
+
+
+def test_concurrent_first_launches_bind_once():
+
+    with StubServer(licenses=1) as server:
+
+        # One validator per process, racing to bind the same unbound license.
+        validators = [LicenseValidator(Client("sk_test", base_url=server.url), max_delay=0) for _ in range(4)]
+
+        barrier = threading.Barrier(len(validators))
+
+        verdicts = [None] * len(validators)
+
+        def launch(i: int) -> None:
+
+            barrier.wait()
+
+            verdicts[i] = validators[i].authorize("KEY-00000000", f"hw-{i}", timeout=10)
+
+        threads = [threading.Thread(target=launch, args=(i,)) for i in range(len(validators))]
+
+        for thread in threads:
+
+            thread.start()
+
+        for thread in threads:
+
+            thread.join()
+
+        for validator in validators:
+
+            validator.close()
+
+        bound = Client("sk_test", base_url=server.url).retrieve_license("KEY-00000000")["metadata"]["hwid"]
+
+    assert verdicts.count(True) == 1
+
+    assert verdicts[int(bound[3:])] is True
+
+
+def test_bind_without_etag_fails_closed():
+
+    with StubServer(licenses=1) as server:
+
+        client = Client("sk_test", base_url=server.url)
+
+        call = client._call
+
+        def without_etag(*args, **kwargs):
+
+            res = call(*args, **kwargs)
+
+            res.headers.pop("ETag", None)
+
+            return res
+
+        client._call = without_etag
+
+        with LicenseValidator(client, max_delay=0) as validator:
+
+            with pytest.raises(LicenseBindException):
+
+                validator.authorize("KEY-00000000", "hw", timeout=10)
+
+        assert not client.retrieve_license("KEY-00000000")["metadata"]
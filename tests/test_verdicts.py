@@ -0,0 +1,59 @@
+import time
+
+from hyper.client import Client, VerdictCache
+from hyper.client.verdicts import Verdict
+from hyper.utils.helpers import _hardware_id
+
+_SECRET = b"test"
+
+
+def test_concurrent_caches_keep_each_others_verdicts(tmp_path):
+
+    filename = str(tmp_path / "verdicts")
+
+    first, second = VerdictCache(filename, _SECRET), VerdictCache(filename, _SECRET)
+
+    first.put("K1", "hw", 60)
+    second.put("K2", "hw", 60)
+
+    first.discard("K1")
+    second.put("K3", "hw", 60)
+
+    fresh = VerdictCache(filename, _SECRET)
+
+    assert [fresh.get(key, "hw") is not None for key in ("K1", "K2", "K3")] == [False, True, True]
+
+    assert first.get("K3", "hw") is not None
+
+
+def test_unwritable_file_keeps_verdicts_in_memory(tmp_path, monkeypatch):
+
+    cache = VerdictCache(str(tmp_path / "verdicts"), _SECRET)
+
+    cache.put("K", "hw", 60)
+
+    def refuse(*args, **kwargs):
+
+        raise PermissionError("read-only")
+
+    monkeypatch.setattr("tempfile.mkstemp", refuse)
+
+    cache.discard("K")
+
+    assert cache.get("K", "hw") is None
+
+
+def test_verdict_older_than_grace_is_not_trusted(tmp_path):
+
+    cache = VerdictCache(str(tmp_path / "verdicts"), _SECRET)
+
+    client = Client("sk_test", verdict_cache=cache, verdict_grace=60)
+
+    # A verdict whose file expiry is far away, but last verified long ago.
+    cache._update(cache._slot("K"), Verdict(_hardware_id(), time.time() - 3600, time.time() + 10 ** 9))
+
+    assert not client._cached_verdict("K")
+
+    cache.put("K", _hardware_id(), 60)
+
+    assert client._cached_verdict("K")
@@ -0,0 +1,129 @@
+import threading
+import time
+
+import pytest
+
+from hyper.client import Client, MemoryCache
+from hyper.testing.webhooks import FakeWebhookSender
+from hyper.webhooks import WebhookReceiver
+
+_SECRET = "whsec_test"
+
+
+def _receiver(**options) -> WebhookReceiver:
+
+    return WebhookReceiver(_SECRET, workers=1, **options)
+
+
+def test_signature_accepted_and_rejected():
+
+    receiver = _receiver()
+
+    assert FakeWebhookSender(receiver, _SECRET).send("payment.succeeded", {"id": "pay_1"}) == 200
+
+    assert FakeWebhookSender(receiver, "whsec_other").send("payment.succeeded", {"id": "pay_2"}) == 401
+
+    sender = FakeWebhookSender(receiver, _SECRET)
+
+    assert sender.deliver(sender.event("payment.succeeded", {"id": "pay_3"}), signature="t=1,v1=00") == 401
+
+    receiver.stop()
+
+    assert receiver.stats.rejected == 2
+
+
+def test_signature_tolerance():
+
+    receiver = _receiver(tolerance=60)
+
+    sender = FakeWebhookSender(receiver, _SECRET)
+
+    event = sender.event("payment.succeeded", {"id": "pay_1"})
+
+    assert sender.deliver(event, timestamp=time.time() - 120) == 401
+
+    assert sender.deliver(event, timestamp=time.time() - 30) == 200
+
+    receiver.stop()
+
+
+def test_duplicate_deliveries_are_handled_once():
+
+    receiver = _receiver()
+
+    handled = []
+
+    receiver.on("payment.*", handled.append)
+
+    sender = FakeWebhookSender(receiver, _SECRET)
+
+    event = sender.event("payment.succeeded", {"id": "pay_1"})
+
+    assert [sender.deliver(event) for _ in range(3)] == [200, 200, 200]
+
+    receiver.join()
+    receiver.stop()
+
+    assert len(handled) == 1
+
+    assert receiver.stats.duplicates == 2
+
+
+def test_full_queue_answers_503():
+
+    receiver = _receiver(queue_size=1)
+
+    release = threading.Event()
+
+    started = threading.Event()
+
+    receiver.on("*", lambda event: (started.set(), release.wait(5)))
+
+    sender = FakeWebhookSender(receiver, _SECRET)
+
+    assert sender.send("payment.succeeded", {"id": "pay_1"}) == 200
+
+    started.wait(5)
+
+    # The worker is busy with the first event and the queue holds the second.
+    assert [sender.send("payment.succeeded", {"id": f"pay_{i}"}) for i in (2, 3)] == [200, 503]
+
+    release.set()
+
+    receiver.stop()
+
+    assert receiver.stats.dropped == 1
+
+
+def test_refresh_updates_cache_in_event_order():
+
+    # The cache answers every retrieve below, so no API is reached.
+    client = Client("sk_test", base_url="http://127.0.0.1:9", cache=MemoryCache(), cache_ttl=60)
+
+    receiver = _receiver(clients=[client])
+
+    sender = FakeWebhookSender(receiver, _SECRET)
+
+    newer = sender.event("license.updated", {"key": "KEY-1", "email": "new@example.com"})
+
+    older = sender.event("license.updated", {"key": "KEY-1", "email": "old@example.com"})
+
+    older["created"] = newer["created"] - 1000
+
+    assert sender.deliver(newer) == 200
+
+    assert client.retrieve_license("KEY-1")["email"] == "new@example.com"
+
+    # A retried or reordered older delivery is handled but leaves the cache alone.
+    assert sender.deliver(older) == 200
+
+    assert client.retrieve_license("KEY-1")["email"] == "new@example.com"
+
+    receiver.stop()
+
+
+def test_clients_of_other_businesses_are_refused():
+
+    with pytest.raises(ValueError):
+
+        _receiver(clients=[Client("sk_acme"), Client("sk_globex")])